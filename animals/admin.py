@@ -3,26 +3,33 @@ from django.contrib import admin
 from django.utils.html import format_html
 from .models import (
     BookAnimal, Shelter, Veterinarian, Donation,
-    AnimalImage, Review, AdoptionRequest
+    AnimalImage, Review, AdoptionRequest, SiteStats, VeterinarianService, Job, MediaBlob
 )
 
 @admin.register(BookAnimal)
 class BookAnimalAdmin(admin.ModelAdmin):
-    list_display = ['name', 'animal_type', 'breed', 'user', 'status', 'created_at']
-    list_filter = ['animal_type', 'status', 'is_for_sale', 'created_at']
+    list_display = ['name', 'animal_type', 'breed', 'user', 'shelter', 'status', 'created_at']
+    list_filter = ['animal_type', 'status', 'is_for_sale', 'shelter', 'created_at']
+    raw_id_fields = ['shelter']
     search_fields = ['name', 'breed', 'description', 'user__username']
 
 @admin.register(Shelter)
 class ShelterAdmin(admin.ModelAdmin):
-    list_display = ['name', 'shelter_type', 'capacity', 'current_animals', 'rating', 'is_active']
+    list_display = ['name', 'shelter_type', 'capacity', 'current_animals',
+                    'donations_count', 'donations_total', 'rating', 'review_count', 'is_active']
     list_filter = ['shelter_type', 'is_active']
     search_fields = ['name', 'address', 'director']
+    # Signal'lar yuritadi (animals/stats.py); tuzatish - reconcile_* buyruqlari
+    readonly_fields = ['current_animals', 'donations_count', 'donations_total',
+                       'rating', 'review_count', 'rating_sum']
 
 @admin.register(Veterinarian)
 class VeterinarianAdmin(admin.ModelAdmin):
-    list_display = ['name', 'clinic_type', 'phone_number', 'rating', 'is_emergency']
-    list_filter = ['clinic_type', 'is_emergency']
+    list_display = ['name', 'clinic_type', 'phone_number', 'rating', 'review_count', 'is_emergency']
+    list_filter = ['clinic_type', 'is_emergency', 'service_links__service']
     search_fields = ['name', 'address', 'services']
+    # Sharhlardan signal'lar yuritadi; tuzatish - `manage.py reconcile_ratings`
+    readonly_fields = ['rating', 'review_count', 'rating_sum']
 
 @admin.register(Donation)
 class DonationAdmin(admin.ModelAdmin):
@@ -34,4 +41,23 @@ class DonationAdmin(admin.ModelAdmin):
 
 admin.site.register(AnimalImage)
 admin.site.register(Review)
-admin.site.register(AdoptionRequest)
\ No newline at end of file
+admin.site.register(AdoptionRequest)
+
+@admin.register(SiteStats)
+class SiteStatsAdmin(admin.ModelAdmin):
+    list_display = ['available_animals', 'active_shelters', 'veterinarians_count',
+                    'confirmed_donations', 'donations_amount', 'updated_at']
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'status', 'attempts', 'run_after', 'created_at', 'finished_at']
+    list_filter = ['status', 'kind']
+    readonly_fields = ['last_error']
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'ref_count', 'created_at']
+    search_fields = ['name']
+    readonly_fields = ['name', 'size', 'ref_count', 'created_at']
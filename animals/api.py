@@ -0,0 +1,244 @@
+# animals/api.py
+"""
+Hamkorlar uchun faqat o'qish JSON API (HTML sahifalarni scrape qilish o'rniga).
+
+    GET /api/animals/?fields=name,animal_type&animal_type=dog&limit=50
+    GET /api/animals/?cursor=<next dagi kursor>
+    GET /api/shelters/42/?fields=name,address
+    GET /api/veterinarians/export.ndjson?fields=name,phone_number
+
+fields - sparse fieldset: bazadan faqat shu ustunlar o'qiladi (.only()) va
+javobda ham faqat shular bo'ladi. Ro'yxat kursor bo'yicha sahifalanadi
+(animals/pagination.py - COUNT va OFFSET yo'q). Eksport har bir yozuvni
+alohida JSON satr qilib oqim bilan beradi (.iterator(chunk_size=...)):
+millionlab yozuv ham o'zgarmas xotirada ketadi.
+"""
+import json
+from collections import namedtuple
+from functools import wraps
+
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+
+from .models import BookAnimal, Shelter, Veterinarian
+from .pagination import FIRST, MAX_ID, CursorPaginator, pagination_query
+from .query_budget import query_budget
+from .routers import read_replica
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+# Eksportda bazadan bir martada o'qiladigan va bitta bo'lak bo'lib yuboriladigan qatorlar
+EXPORT_CHUNK_SIZE = 2000
+
+# queryset - ochiq yozuvlar, fields - ruxsat etilgan maydonlar,
+# default_fields - ?fields= berilmaganda, filters - GET parametri sifatida
+Resource = namedtuple('Resource', ['queryset', 'fields', 'default_fields', 'filters'])
+
+RESOURCES = {
+    'animals': Resource(
+        queryset=lambda: BookAnimal.objects.filter(status='available'),
+        fields=(
+            'id', 'name', 'animal_type', 'breed', 'age', 'gender', 'description', 'location',
+            'shelter', 'is_for_sale', 'price', 'image', 'vaccinated', 'sterilized',
+            'phone_number', 'created_at', 'updated_at',
+        ),
+        default_fields=(
+            'id', 'name', 'animal_type', 'breed', 'age', 'gender', 'location', 'shelter',
+            'is_for_sale', 'price', 'image', 'created_at',
+        ),
+        filters=('animal_type', 'gender', 'shelter', 'is_for_sale', 'vaccinated', 'sterilized'),
+    ),
+    'shelters': Resource(
+        queryset=lambda: Shelter.objects.filter(is_active=True),
+        fields=(
+            'id', 'name', 'shelter_type', 'description', 'address', 'phone_number', 'email',
+            'website', 'capacity', 'current_animals', 'director', 'founded_date', 'image',
+            'latitude', 'longitude', 'rating', 'review_count', 'created_at', 'updated_at',
+        ),
+        default_fields=(
+            'id', 'name', 'shelter_type', 'address', 'phone_number', 'capacity',
+            'current_animals', 'latitude', 'longitude', 'rating',
+        ),
+        filters=('shelter_type',),
+    ),
+    'veterinarians': Resource(
+        queryset=lambda: Veterinarian.objects.all(),
+        fields=(
+            'id', 'name', 'clinic_type', 'description', 'address', 'phone_number', 'email',
+            'website', 'working_hours', 'director', 'doctors_count', 'image', 'latitude',
+            'longitude', 'is_emergency', 'rating', 'review_count', 'created_at', 'updated_at',
+        ),
+        default_fields=(
+            'id', 'name', 'clinic_type', 'address', 'phone_number', 'working_hours',
+            'is_emergency', 'latitude', 'longitude', 'rating',
+        ),
+        filters=('clinic_type', 'is_emergency'),
+    ),
+}
+
+BOOLEAN_VALUES = {'1': True, 'true': True, '0': False, 'false': False}
+
+
+class ApiError(Exception):
+    """Noto'g'ri so'rov parametri (400)"""
+
+
+def error_response(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def parse_fields(resource, request):
+    """?fields=a,b -> ('id', 'a', 'b'); id har doim qaytariladi"""
+    raw = request.GET.get('fields')
+    if not raw:
+        return resource.default_fields
+    fields = ['id']
+    for name in raw.split(','):
+        name = name.strip()
+        if name not in resource.fields:
+            raise ApiError(f"Noma'lum maydon: {name}")
+        if name not in fields:
+            fields.append(name)
+    return tuple(fields)
+
+
+def parse_limit(request):
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError("limit butun son bo'lishi kerak")
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def apply_filters(resource, queryset, request):
+    model = queryset.model
+    lookups = {}
+    for name in resource.filters:
+        value = request.GET.get(name)
+        if value is None:
+            continue
+        field = model._meta.get_field(name)
+        if isinstance(field, models.BooleanField):
+            if value.lower() not in BOOLEAN_VALUES:
+                raise ApiError(f"{name}: 1/0 yoki true/false bo'lishi kerak")
+            value = BOOLEAN_VALUES[value.lower()]
+        elif field.is_relation:
+            # isdigit() '²' kabi belgilarni ham qabul qiladi; juda katta son SQLite'da OverflowError
+            if not (value.isascii() and value.isdigit()) or int(value) > MAX_ID:
+                raise ApiError(f"{name}: id bo'lishi kerak")
+            name, value = field.attname, int(value)
+        lookups[name] = value
+    return queryset.filter(**lookups)
+
+
+def serialize(obj, fields, request):
+    """Obyekt -> dict (faqat so'ralgan maydonlar). FK - id, rasm - to'liq URL"""
+    row = {}
+    for name in fields:
+        field = obj._meta.get_field(name)
+        if field.is_relation:
+            value = getattr(obj, field.attname)
+        elif isinstance(field, models.FileField):
+            file = getattr(obj, name)
+            value = request.build_absolute_uri(file.url) if file else None
+        else:
+            value = getattr(obj, name)
+        row[name] = value
+    return row
+
+
+def dumps(data):
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def page_link(request, cursor):
+    if cursor is None:
+        return None
+    query = pagination_query(request)
+    if cursor == FIRST:
+        return request.build_absolute_uri(f"{request.path}?{query}" if query else request.path)
+    return request.build_absolute_uri(f"{request.path}?{query + '&' if query else ''}cursor={cursor}")
+
+
+def api_view(budget):
+    """Umumiy: faqat GET/HEAD, so'rovlar byudjeti, replikadan o'qish, ApiError -> 400"""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, resource, *args, **kwargs):
+            if resource not in RESOURCES:
+                return error_response(f"Noma'lum resurs: {resource}", status=404)
+            try:
+                return view_func(request, RESOURCES[resource], resource, *args, **kwargs)
+            except ApiError as error:
+                return error_response(str(error))
+        return require_safe(query_budget(budget)(read_replica(wrapper)))
+    return decorator
+
+
+@api_view(1)
+def list_view(request, resource, name):
+    """Kursor bo'yicha sahifalangan ro'yxat"""
+    fields = parse_fields(resource, request)
+    queryset = apply_filters(resource, resource.queryset(), request)
+    # created_at - kursor kaliti, javobga kirmasa ham o'qiladi
+    queryset = queryset.only(*fields, 'created_at')
+    page = CursorPaginator(queryset, parse_limit(request)).get_page(request.GET.get('cursor'))
+    return JsonResponse({
+        'results': [serialize(obj, fields, request) for obj in page],
+        'next': page_link(request, page.next_cursor),
+        'previous': page_link(request, page.previous_cursor),
+    }, json_dumps_params={'ensure_ascii': False})
+
+
+@api_view(1)
+def detail_view(request, resource, name, pk):
+    """Bitta yozuv"""
+    fields = parse_fields(resource, request)
+    obj = resource.queryset().only(*fields).filter(pk=pk).first() if pk <= MAX_ID else None
+    if obj is None:
+        return error_response("Topilmadi", status=404)
+    return JsonResponse(serialize(obj, fields, request), json_dumps_params={'ensure_ascii': False})
+
+
+def export_lines(queryset, fields, request):
+    lines = []
+    for obj in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        lines.append(dumps(serialize(obj, fields, request)))
+        if len(lines) >= EXPORT_CHUNK_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+async def aexport_lines(queryset, fields, request):
+    # ASGI da sync iterator avval to'liq ro'yxatga o'qiladi - shuning uchun async variant
+    lines = []
+    async for obj in queryset.aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+        lines.append(dumps(serialize(obj, fields, request)))
+        if len(lines) >= EXPORT_CHUNK_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+# Qatorlar view qaytgandan keyin, oqim paytida o'qiladi - byudjetga kirmaydi
+@api_view(0)
+def export_view(request, resource, name):
+    """Barcha yozuvlar NDJSON (har satrda bitta JSON obyekt) oqim sifatida"""
+    fields = parse_fields(resource, request)
+    queryset = apply_filters(resource, resource.queryset(), request)
+    queryset = queryset.only(*fields).order_by('pk')
+    # Baza (replika/asosiy) hozir tanlanadi: oqim read_replica blokidan keyin o'qiladi
+    queryset = queryset.using(queryset.db)
+    if isinstance(request, ASGIRequest):
+        lines = aexport_lines(queryset, fields, request)
+    else:
+        lines = export_lines(queryset, fields, request)
+    response = StreamingHttpResponse(lines, content_type='application/x-ndjson; charset=utf-8')
+    response.headers['Content-Disposition'] = f'attachment; filename="{name}.ndjson"'
+    return response
@@ -2,4 +2,9 @@ from django.apps import AppConfig
 
 
 class AnimalsConfig(AppConfig):
-    name = 'animals'
\ No newline at end of file
+    name = 'animals'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        # Fon vazifalari (animals/jobs.py) ro'yxatdan o'tishi uchun
+        from . import uploads  # noqa: F401
@@ -0,0 +1,137 @@
+# animals/async_views.py
+"""
+O'qish sahifalarining async versiyalari (ASGI uchun, config/asgi.py).
+
+Filtrlar, kesh va kontekst views.py dagi sync view'lar bilan umumiy; bu
+yerda faqat bir-biriga bog'liq bo'lmagan so'rovlar asyncio.gather bilan
+birga yuboriladi va shablon thread'da render qilinadi (shablon ichidagi
+lazy bog'lanishlar va request.user sinxron ORM ishlatadi).
+
+Django async ORM hozircha so'rovlarni bitta so'rov (request) thread'ida
+navbat bilan bajaradi - asosiy yutuq shundaki, sekin so'rov kutilayotganda
+worker boshqa so'rovlarga xizmat qiladi. Async drayverli backend
+paydo bo'lsa, gather() qilingan so'rovlar haqiqatan parallel ketadi.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404, render
+
+from . import caching
+from .conditional import conditional_page
+from .facets import count_facets, EXTRA_FACET_FIELDS
+from .models import AdoptionRequest, AnimalImage, BookAnimal, SiteStats
+from .query_budget import query_budget
+from .routers import read_replica
+from . import views
+
+arender = sync_to_async(render)
+
+
+async def alist(queryset):
+    return [obj async for obj in queryset]
+
+
+async def load_user(request):
+    """request.user ni ORM thread'ida yuklash - keyin shablon keshlangan obyektni oladi"""
+    await sync_to_async(lambda: request.user.is_authenticated)()
+    return request.user
+
+
+@query_budget(7)
+@read_replica
+async def home_view(request):
+    """Asosiy sahifa"""
+    animals, *filters = views.filter_home_animals(request)
+    names = list(views.HOME_CACHED_LISTS)
+
+    animals, stats, *cached = await asyncio.gather(
+        # Faqat birinchi 12 ta hayvonni ko'rsat
+        alist(animals[:12]),
+        # Statistikalar (bitta qatordan)
+        sync_to_async(SiteStats.load)(),
+        *(
+            caching.acached_queryset(name, tags, queryset())
+            for name, (tags, queryset) in views.HOME_CACHED_LISTS.items()
+        ),
+    )
+
+    context = views.home_context(filters, animals, stats, dict(zip(names, cached)))
+    return await arender(request, 'main_app/home.html', context)
+
+
+@query_budget(4)
+@read_replica
+async def animals_list_view(request):
+    """Barcha hayvonlar ro'yxati"""
+    animals, *filters = views.filter_animals(request)
+
+    # Barcha hisoblagichlar bitta so'rovda
+    facets = sync_to_async(count_facets)(animals, extra_fields=EXTRA_FACET_FIELDS)
+    if views.uses_page_numbers(request):
+        # Raqamli sahifalar facetlardagi umumiy sonni kutadi
+        facets = await facets
+        page_obj = await sync_to_async(views.animals_page)(request, animals, facets.total)
+    else:
+        facets, page_obj = await asyncio.gather(
+            facets, sync_to_async(views.animals_page)(request, animals),
+        )
+
+    context = views.animals_list_context(request, filters, facets, page_obj)
+    return await arender(request, 'main_app/animals/list.html', context)
+
+
+@query_budget(7)
+@read_replica
+@conditional_page(views.animal_page_state)
+async def animal_detail_view(request, pk):
+    """Hayvon tafsilotlari"""
+    animal = await aget_object_or_404(BookAnimal.objects.select_related('user'), pk=pk)
+    user = await load_user(request)
+
+    additional_images, similar, pending_targets = await asyncio.gather(
+        alist(AnimalImage.objects.filter(animal=animal)),
+        alist(views.similar_animals(animal)),
+        # Hali qayta ishlanayotgan rasmlar (o'rniga placeholder ko'rsatiladi)
+        alist(animal.pending_uploads.values_list('target', flat=True)),
+    )
+    # Asrab olish so'rovlari (faqat hayvon egasi ko'rishi mumkin) - sync view dagidek
+    # lazy: shablon ishlatsagina bajariladi
+    adoption_requests = None
+    if user == animal.user:
+        adoption_requests = AdoptionRequest.objects.filter(animal=animal).order_by('-created_at')
+
+    context = views.animal_detail_context(
+        animal, additional_images, similar, pending_targets, adoption_requests,
+    )
+    return await arender(request, 'main_app/animals/detail.html', context)
+
+
+@query_budget(4)
+@read_replica
+async def shelters_list_view(request):
+    """Barcha boshpanalar ro'yxati"""
+    shelters, shelter_type, search_query, near = views.filter_shelters(request)
+
+    if near:
+        shelters = await sync_to_async(views.nearby_shelters)(shelters, near)
+        totals = views.shelter_totals(shelters)
+    else:
+        # Ro'yxat va statistika bir-biriga bog'liq emas
+        shelters, totals = await asyncio.gather(
+            alist(shelters), sync_to_async(views.shelter_totals)(shelters),
+        )
+
+    context = views.shelters_list_context(shelters, shelter_type, search_query, near, totals)
+    return await arender(request, 'main_app/shelters/list.html', context)
+
+
+@query_budget(4)
+@read_replica
+async def veterinarians_list_view(request):
+    """Barcha veterinariyalar ro'yxati"""
+    vets, filters = views.filter_veterinarians(request)
+    vets = await sync_to_async(views.cached_veterinarians)(vets, filters)
+
+    context = views.veterinarians_list_context(vets, filters)
+    return await arender(request, 'main_app/veterinarians/list.html', context)
@@ -0,0 +1,193 @@
+# animals/blobs.py
+"""
+Kontent bo'yicha saqlangan rasmlarga havolalarni hisoblash.
+
+Bitta blob (animals/storage.py) bir nechta BookAnimal.image, AnimalImage.image,
+Shelter.image yoki Veterinarian.image da ishlatilishi mumkin. MediaBlob.ref_count
+SiteStats hisoblagichlari kabi yuritiladi: saqlashdan oldin bazadagi eski
+nomlar eslab qolinadi, keyin farq F() bilan qo'shiladi, o'chirishda ayiriladi.
+Hisob nolga tushsa qator o'chiriladi va commit'dan keyin fayl (nusxalari bilan)
+diskdan o'chiriladi. `manage.py reconcile_media_blobs` hisobni noldan tiklaydi.
+"""
+import posixpath
+from collections import Counter
+from functools import lru_cache
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from . import renditions, snapshots
+from .models import MediaBlob, content_storage
+from .storage import BLOB_PREFIX, is_blob
+
+
+@lru_cache(maxsize=None)
+def blob_fields(model=None):
+    """Kontent storage ishlatadigan maydonlar: ((model, field_name), ...)"""
+    models = [model] if model else apps.get_app_config('animals').get_models()
+    return tuple(
+        (m, field.name)
+        for m in models
+        for field in m._meta.concrete_fields
+        if getattr(field, 'storage', None) is content_storage
+    )
+
+
+def references(instance):
+    """Obyekt havola qilayotgan blob nomlari"""
+    names = (getattr(instance, field).name for _model, field in blob_fields(type(instance)))
+    return Counter(name for name in names if is_blob(name))
+
+
+def stored_references(instance, using=None):
+    """Bazada saqlangan (o'zgarishdan oldingi) holat bo'yicha havolalar.
+
+    Ustunlar snapshots ga animals/signals.py da ro'yxatdan o'tkaziladi.
+    """
+    stored = snapshots.stored(instance, using=using)
+    return references(stored) if stored else Counter()
+
+
+def delete_files(name, storage=content_storage):
+    """Blob va uning kichraytirilgan nusxalarini diskdan o'chirish.
+
+    "Nusxalar bor" natijasi umumiy keshdan ham o'chiriladi: xuddi shu kontent
+    qayta yuklansa (nom o'sha), hech bir worker yo'q fayllarga srcset bermasin.
+    """
+    for path in (name, *renditions.rendition_names(name)):
+        storage.delete(path)
+    renditions.forget(name)
+
+
+def _delete_if_unreferenced(names, using=None):
+    # Shu orada yana yuklangan bo'lsa (yangi qator paydo bo'lgan) fayl qoladi
+    alive = set(MediaBlob.objects.using(using).filter(name__in=names).values_list('name', flat=True))
+    for name in set(names) - alive:
+        delete_files(name)
+
+
+def _increment(name, count, using=None):
+    updated = MediaBlob.objects.using(using).filter(name=name).update(ref_count=F('ref_count') + count)
+    if updated:
+        return
+    size = content_storage.size(name) if content_storage.exists(name) else 0
+    try:
+        with transaction.atomic(using=using):
+            MediaBlob.objects.using(using).create(name=name, size=size, ref_count=count)
+    except IntegrityError:
+        # Parallel so'rov qatorni bizdan oldin yaratdi
+        MediaBlob.objects.using(using).filter(name=name).update(ref_count=F('ref_count') + count)
+
+
+def apply_blob_delta(old, new, using=None):
+    """Havolalar farqini MediaBlob.ref_count ga qo'shish; o'chirilgan blob nomlari qaytadi"""
+    released = []
+    for name in set(old) | set(new):
+        change = new.get(name, 0) - old.get(name, 0)
+        if change > 0:
+            _increment(name, change, using=using)
+        elif change < 0:
+            MediaBlob.objects.using(using).filter(name=name, ref_count__gte=-change).update(
+                ref_count=F('ref_count') + change
+            )
+            released.append(name)
+    if not released:
+        return []
+    unused = MediaBlob.objects.using(using).filter(name__in=released, ref_count=0)
+    names = list(unused.values_list('name', flat=True))
+    if names:
+        unused.delete()
+        transaction.on_commit(lambda: _delete_if_unreferenced(names, using=using), using=using,
+                              robust=True)
+    return names
+
+
+def count_references(using=None):
+    """Barcha modellardagi blob havolalarini bazadan sanash"""
+    counts = Counter()
+    for model, field in blob_fields():
+        names = (
+            model._default_manager.using(using)
+            .filter(**{f'{field}__startswith': BLOB_PREFIX + '/'})
+            .values_list(field, flat=True)
+            .iterator()
+        )
+        counts.update(name for name in names if is_blob(name))
+    return counts
+
+
+def stored_blob_files(storage=content_storage):
+    """Diskdagi barcha blob fayllari (nusxalarsiz)"""
+    if not storage.exists(BLOB_PREFIX):
+        return
+    for first in storage.listdir(BLOB_PREFIX)[0]:
+        for second in storage.listdir(posixpath.join(BLOB_PREFIX, first))[0]:
+            directory = posixpath.join(BLOB_PREFIX, first, second)
+            for filename in storage.listdir(directory)[1]:
+                name = posixpath.join(directory, filename)
+                if is_blob(name):
+                    yield name
+
+
+def reconcile_blobs(using=None, delete_orphan_files=False):
+    """MediaBlob qatorlarini haqiqiy havolalardan qayta hisoblash.
+
+    (yangilangan, o'chirilgan qatorlar, o'chirilgan fayllar) soni qaytadi.
+    """
+    counts = count_references(using=using)
+    blobs = MediaBlob.objects.using(using)
+    updated = 0
+    with transaction.atomic(using=using):
+        stale = list(blobs.exclude(name__in=list(counts)).values_list('name', flat=True))
+        deleted, _ = blobs.filter(name__in=stale).delete()
+        existing = dict(blobs.values_list('name', 'ref_count'))
+        for name, count in counts.items():
+            if name not in existing:
+                _increment(name, count, using=using)
+                updated += 1
+            elif existing[name] != count:
+                blobs.filter(name=name).update(ref_count=count)
+                updated += 1
+
+    removed = 0
+    if delete_orphan_files:
+        for name in stored_blob_files():
+            if name not in counts:
+                delete_files(name)
+                removed += 1
+    elif stale:
+        _delete_if_unreferenced(stale, using=using)
+        removed = len(stale)
+    return updated, deleted, removed
+
+
+def migrate_legacy_files(using=None):
+    """Eski (upload_to katalogidagi) rasmlarni blob'larga ko'chirish.
+
+    Bir xil rasmlar bitta faylga birlashadi. Ko'chirilgan fayllar soni qaytadi;
+    keyin reconcile_blobs() chaqirilishi kerak.
+    """
+    moved = {}
+    for model, field in blob_fields():
+        rows = (
+            model._default_manager.using(using)
+            .exclude(**{field: ''})
+            .exclude(**{f'{field}__isnull': True})
+            .exclude(**{f'{field}__startswith': BLOB_PREFIX + '/'})
+            .values_list('pk', field)
+        )
+        model_field = model._meta.get_field(field)
+        for pk, name in list(rows):
+            if name not in moved:
+                if not content_storage.exists(name):
+                    continue
+                with content_storage.open(name, 'rb') as source:
+                    moved[name] = content_storage.save(name, source)
+                renditions.generate(model_field.attr_class(None, model_field, moved[name]))
+            # update() signal yubormaydi - hisob reconcile_blobs() da tiklanadi
+            model._default_manager.using(using).filter(pk=pk).update(**{field: moved[name]})
+
+    for name in moved:
+        delete_files(name)
+    return len(moved)
@@ -0,0 +1,125 @@
+# animals/caching.py
+"""
+Teglar (tag) bo'yicha bekor qilinadigan kesh.
+
+Har bir yozuv bir nechta teg bilan saqlanadi ("shelter:*", "animal:42").
+Har bir tegning keshda versiyasi bor; yozuv saqlangan paytdagi versiyalar
+joriy versiyalar bilan mos kelmasa - yozuv eskirgan hisoblanadi.
+Tegni bekor qilish = unga yangi versiya berish, shuning uchun kalitlarni
+qidirib o'chirish shart emas va har qanday Django kesh backend'i
+(LocMemCache, Redis, Memcached) bilan ishlaydi.
+"""
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from . import routers
+
+TAG_PREFIX = 'tag:'
+ENTRY_PREFIX = 'tagged:'
+
+# Model -> teg prefiksi ("shelter:*", "shelter:<pk>")
+MODEL_TAGS = {
+    'bookanimal': 'animal',
+    'shelter': 'shelter',
+    'veterinarian': 'veterinarian',
+    'donation': 'donation',
+}
+
+
+def get_cache():
+    return caches[getattr(settings, 'TAGGED_CACHE_ALIAS', 'default')]
+
+
+def default_timeout():
+    return getattr(settings, 'TAGGED_CACHE_TIMEOUT', 300)
+
+
+def make_key(name, *vary_on):
+    """Fragment/so'rov nomi va o'zgaruvchilardan kesh kalitini yasash"""
+    digest = hashlib.md5(':'.join(str(v) for v in vary_on).encode()).hexdigest()
+    return f'{ENTRY_PREFIX}{name}:{digest}'
+
+
+def model_tags(instance):
+    """Obyekt uchun teglar: umumiy ("shelter:*") va aniq ("shelter:42")"""
+    prefix = MODEL_TAGS.get(instance._meta.model_name)
+    if prefix is None:
+        return []
+    return [f'{prefix}:*', f'{prefix}:{instance.pk}']
+
+
+def _tag_versions(cache, tags):
+    keys = [TAG_PREFIX + tag for tag in tags]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        # Versiya keshdan chiqib ketgan bo'lsa, yangisini beramiz
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return {key[len(TAG_PREFIX):]: versions[key] for key in keys}
+
+
+def tag_version(tag):
+    """Tegning joriy versiyasi (o'zgarganini aniqlash uchun)"""
+    return _tag_versions(get_cache(), [tag])[tag]
+
+
+def tag_versions(*tags):
+    """Bir nechta tegning joriy versiyalari (bitta get_many bilan)"""
+    return _tag_versions(get_cache(), tags)
+
+
+def get_or_set(key, tags, builder, timeout=None):
+    """Keshdan olish yoki builder() bilan hisoblab saqlash.
+
+    Teg versiyalari builder() dan oldin o'qiladi: hisoblash paytida teg
+    bekor qilinsa, yozuv darhol eskirgan bo'lib qoladi. Replikadan o'qilgan
+    natija teg bekor qilinganidan keyin REPLICA_PIN_SECONDS o'tmaguncha saqlanmaydi.
+    """
+    cache = get_cache()
+    versions = _tag_versions(cache, tags)
+    entry = cache.get(key)
+    if entry is not None and entry['tags'] == versions:
+        return entry['value']
+    value = builder()
+    if routers.reading_from_replica() and \
+            time.time_ns() - max(versions.values(), default=0) < routers.pin_seconds() * 10**9:
+        # Teg yaqinda bekor qilingan, replika hali yetib kelmagan bo'lishi mumkin -
+        # eski ma'lumot yangi versiya bilan keshga tushmasin
+        return value
+    cache.set(key, {'tags': versions, 'value': value},
+              default_timeout() if timeout is None else timeout)
+    return value
+
+
+def cached_queryset(name, tags, queryset, *vary_on, timeout=None):
+    """Queryset natijasini (list) teglar bilan keshlash"""
+    return get_or_set(make_key(name, *vary_on), tags, lambda: list(queryset), timeout)
+
+
+async def acached_queryset(name, tags, queryset, *vary_on, timeout=None):
+    """cached_queryset ning async varianti (kesh va so'rov ORM thread'ida)"""
+    return await sync_to_async(cached_queryset)(name, tags, queryset, *vary_on, timeout=timeout)
+
+
+def invalidate_tags(*tags, using=None):
+    """Teglarni bekor qilish.
+
+    Darhol va tranzaksiya commit bo'lgandan keyin yana bir bor bekor qilinadi:
+    commit'dan oldin boshqa so'rov eski ma'lumotni keshga yozib qo'ysa ham
+    u saqlanib qolmaydi.
+    """
+    if not tags:
+        return
+
+    def bump():
+        version = time.time_ns()
+        get_cache().set_many({TAG_PREFIX + tag: version for tag in tags}, timeout=None)
+
+    bump()
+    transaction.on_commit(bump, using=using)
@@ -0,0 +1,92 @@
+# animals/conditional.py
+"""
+Detail sahifalar uchun shartli GET (ETag).
+
+    @conditional_page(animal_page_state)
+    def animal_detail_view(request, pk):
+        ...
+
+State funksiyasi bitta yengil so'rov bilan sahifa nimaga bog'liqligini
+qaytaradi - PageState(parts, tags) yoki None (obyekt yo'q,
+ruxsat yo'q - view odatdagidek ishlaydi). Teglar (animals/caching.py)
+update() bilan o'zgargan hisoblagichlarni va boshqa obyektlar ro'yxatlarini
+("o'xshash hayvonlar") qamrab oladi. ETag ga foydalanuvchi va CSRF cookie ham
+kiradi, chunki sarlavha va formalar shularga bog'liq.
+
+Brauzer If-None-Match yuborsa va hech narsa o'zgarmagan bo'lsa, shablon render
+qilinmasdan 304 qaytadi. Last-Modified berilmaydi: sahifa o'chirilgan bog'liq
+qatorlarga, sonlarga, foydalanuvchiga va vaqtga ("hozir ochiq") ham bog'liq -
+bularning hammasi ETag ga kiradi, lekin o'zgarish vaqti sifatida ifodalanmaydi,
+If-Modified-Since esa eskirgan 304 berar edi. Javob `max-age=0,
+must-revalidate` bilan belgilanadi: reverse proxy uni saqlab, har safar ETag
+bilan tekshiradi (anonim - public, kirgan foydalanuvchi - private).
+"""
+import hashlib
+from collections import namedtuple
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib import messages
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from . import caching
+
+PageState = namedtuple('PageState', ['parts', 'tags'])
+
+_STATE_ATTR = '_conditional_page_state'
+
+
+def page_etag(request, state):
+    """PageState -> ETag yoki None"""
+    if state is None or len(messages.get_messages(request)):
+        # Bir martalik xabarlar sahifada chiqishi kerak - 304 berib bo'lmaydi
+        return None
+    versions = caching.tag_versions(*state.tags) if state.tags else {}
+    parts = [
+        *state.parts,
+        *sorted(versions.items()),
+        request.user.pk,
+        request.META.get('CSRF_COOKIE', ''),
+    ]
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def conditional_page(state_func):
+    """View ga ETag va 304 javoblarini qo'shish"""
+
+    def etag(request, *args, **kwargs):
+        if not hasattr(request, _STATE_ATTR):
+            state = state_func(request, *args, **kwargs)
+            setattr(request, _STATE_ATTR, page_etag(request, state))
+        return getattr(request, _STATE_ATTR)
+
+    def patch_response(request, response, *args, **kwargs):
+        if request.method in ('GET', 'HEAD') and response.status_code in (200, 304) \
+                and etag(request, *args, **kwargs):
+            if request.user.is_authenticated:
+                patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+            else:
+                patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+            patch_vary_headers(response, ('Cookie',))
+        return response
+
+    def decorator(view_func):
+        conditioned = condition(etag_func=etag)(view_func)
+
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                # State so'rovi (va sessiya/foydalanuvchi) thread'da bajariladi;
+                # condition() keyin natijani request'dagi memo'dan oladi
+                await sync_to_async(etag)(request, *args, **kwargs)
+                response = await conditioned(request, *args, **kwargs)
+                return patch_response(request, response, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = conditioned(request, *args, **kwargs)
+            return patch_response(request, response, *args, **kwargs)
+        return wrapper
+    return decorator
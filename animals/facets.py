@@ -0,0 +1,92 @@
+# animals/facets.py
+"""
+Hayvonlar ro'yxati uchun facet (hisoblagich) lar.
+
+Barcha hisoblagichlar bitta so'rovda shartli COUNT lar orqali hisoblanadi:
+    SELECT COUNT(id), COUNT(id) FILTER (WHERE animal_type = 'dog'), ... FROM ...
+"""
+from dataclasses import dataclass, field
+
+from django.db import models
+from django.db.models import Count, Q
+
+from .models import BookAnimal
+
+# Qo'shimcha facet sifatida hisoblash mumkin bo'lgan maydonlar
+EXTRA_FACET_FIELDS = ('gender', 'vaccinated', 'sterilized')
+
+
+@dataclass(frozen=True)
+class AnimalFacets:
+    """Filtrlangan queryset uchun hisoblagichlar natijasi"""
+    total: int = 0
+    free: int = 0
+    paid: int = 0
+    by_type: dict = field(default_factory=dict)
+    # {'gender': {'male': 3, ...}, 'vaccinated': {True: 5, False: 2}}
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def dogs(self):
+        return self.by_type.get('dog', 0)
+
+    @property
+    def cats(self):
+        return self.by_type.get('cat', 0)
+
+    @property
+    def not_dogs_or_cats(self):
+        """Kuchuk va mushukdan boshqa barcha hayvonlar"""
+        return self.total - self.dogs - self.cats
+
+
+def _facet_key(name, value):
+    return f'{name}__{value}'
+
+
+def _extra_facet_values(field_name):
+    model_field = BookAnimal._meta.get_field(field_name)
+    if isinstance(model_field, models.BooleanField):
+        return [True, False]
+    return [value for value, _label in model_field.choices]
+
+
+def count_facets(queryset, extra_fields=()):
+    """Querysetdagi barcha facetlarni bitta so'rov bilan hisoblash.
+
+    extra_fields - EXTRA_FACET_FIELDS dan qo'shimcha maydonlar
+    (masalan ('gender', 'vaccinated')).
+    """
+    aggregates = {
+        'total': Count('id'),
+        'free': Count('id', filter=Q(is_for_sale=False)),
+        'paid': Count('id', filter=Q(is_for_sale=True)),
+    }
+    for code, _label in BookAnimal.ANIMAL_TYPES:
+        aggregates[_facet_key('type', code)] = Count('id', filter=Q(animal_type=code))
+
+    for field_name in extra_fields:
+        if field_name not in EXTRA_FACET_FIELDS:
+            raise ValueError(f"Noma'lum facet maydoni: {field_name}")
+        for value in _extra_facet_values(field_name):
+            aggregates[_facet_key(field_name, value)] = Count('id', filter=Q(**{field_name: value}))
+
+    # Saralash facetlarga ta'sir qilmaydi, faqat so'rovni og'irlashtiradi
+    result = queryset.order_by().aggregate(**aggregates)
+
+    return AnimalFacets(
+        total=result['total'],
+        free=result['free'],
+        paid=result['paid'],
+        by_type={
+            code: result[_facet_key('type', code)]
+            for code, _label in BookAnimal.ANIMAL_TYPES
+        },
+        extra={
+            field_name: {
+                value: result[_facet_key(field_name, value)]
+                for value in _extra_facet_values(field_name)
+            }
+            for field_name in extra_fields
+        },
+    )
@@ -5,9 +5,11 @@ from .models import Shelter
 class ShelterForm(forms.ModelForm):
     class Meta:
         model = Shelter
-        # Faqat modelda mavjud fieldlarni qo'ying
-        fields = '__all__'  # yoki
-        # fields = ['name', 'phone_number', 'email', 'description', 'image', 'website'] - modelda bor fieldlar
+        # Hisoblagichlar (current_animals, reyting, xayriyalar) signal'lar orqali yuritiladi
+        fields = [
+            'name', 'shelter_type', 'description', 'address', 'phone_number', 'email', 'website',
+            'capacity', 'director', 'founded_date', 'image', 'latitude', 'longitude', 'is_active',
+        ]
         
         widgets = {
             'name': forms.TextInput(attrs={
@@ -0,0 +1,247 @@
+# animals/geo.py
+"""
+Geografik qidiruv: haversine masofa, indekslangan "bounding box" filtri va
+xotiradagi katakli (grid) indeks.
+
+within_radius avval (latitude, longitude) indeksi bo'yicha to'rtburchak ichidagi
+nomzodlarni oladi, keyin aniq haversine masofani Python'da hisoblaydi.
+
+GridIndex nuqtalarni cell_deg x cell_deg gradusli kataklarga ajratadi va eng
+yaqin qo'shnilarni markaziy katakdan boshlab halqama-halqa qidiradi. Indeks
+har bir worker jarayonida bir marta quriladi va model tegi (animals.caching)
+o'zgarganda qayta quriladi. Teg versiyasi umumiy keshda (Redis) bo'lgani uchun
+boshqa worker'dagi o'zgarish ham ko'rinadi; signal'siz yozuvlar (update(),
+bulk_create) uchun indeks baribir GEO_INDEX_MAX_AGE soniyadan eskirmaydi.
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Q
+
+from . import caching
+from .models import Veterinarian
+
+# ModelGridIndex teg o'zgarmasa ham shuncha soniyadan keyin qayta quriladi
+DEFAULT_INDEX_MAX_AGE = 60
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+MAX_RADIUS_KM = 500
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Ikki nuqta orasidagi masofa (km)"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (float(lat1), float(lon1), float(lat2), float(lon2)))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lon, radius_km):
+    """Radius doirasini o'z ichiga olgan (min_lat, max_lat, min_lon, max_lon).
+
+    Uzunlik 180-meridiandan o'tsa min_lon > max_lon bo'ladi.
+    """
+    lat, lon = float(lat), float(lon)
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        # Qutb doira ichida - barcha uzunliklar
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    # Doiraning eng keng joyi qutbga yaqin chetida
+    widest_lat = max(abs(min_lat), abs(max_lat))
+    dlon = radius_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(widest_lat)))
+    if dlon >= 180:
+        return min_lat, max_lat, -180.0, 180.0
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def bounding_box_q(lat, lon, radius_km, lat_field='latitude', lon_field='longitude'):
+    """bounding_box uchun indeksga mos Q filtri"""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    q = Q(**{f'{lat_field}__range': (min_lat, max_lat)})
+    if min_lon <= max_lon:
+        q &= Q(**{f'{lon_field}__range': (min_lon, max_lon)})
+    else:
+        q &= Q(**{f'{lon_field}__gte': min_lon}) | Q(**{f'{lon_field}__lte': max_lon})
+    return q
+
+
+def within_radius(queryset, lat, lon, radius_km, lat_field='latitude', lon_field='longitude'):
+    """Radius ichidagi obyektlar ro'yxati, masofa bo'yicha saralangan.
+
+    Har bir obyektga `distance_km` atributi qo'shiladi.
+    """
+    candidates = (
+        queryset
+        .filter(bounding_box_q(lat, lon, radius_km, lat_field, lon_field))
+        .order_by()
+    )
+    results = []
+    for obj in candidates:
+        distance = haversine_km(lat, lon, getattr(obj, lat_field), getattr(obj, lon_field))
+        if distance <= radius_km:
+            obj.distance_km = round(distance, 2)
+            results.append(obj)
+    results.sort(key=lambda obj: obj.distance_km)
+    return results
+
+
+class GridIndex:
+    """(pk, lat, lon) nuqtalari uchun katakli indeks.
+
+    Eslatma: 180-meridian orqali "o'rab o'tish" hisobga olinmaydi.
+    """
+
+    def __init__(self, points, cell_deg=0.1):
+        self.cell_deg = cell_deg
+        self.cells = {}
+        for pk, lat, lon in points:
+            lat, lon = float(lat), float(lon)
+            self.cells.setdefault(self._cell(lat, lon), []).append((pk, lat, lon))
+        if self.cells:
+            rows = [i for i, _j in self.cells]
+            cols = [j for _i, j in self.cells]
+            self.bounds = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self.bounds = None
+
+    def __len__(self):
+        return sum(len(points) for points in self.cells.values())
+
+    def _cell(self, lat, lon):
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def _ring(self, ci, cj, r):
+        """Markazdan r katak uzoqlikdagi halqa kataklari"""
+        if r == 0:
+            yield ci, cj
+            return
+        for j in range(cj - r, cj + r + 1):
+            yield ci - r, j
+            yield ci + r, j
+        for i in range(ci - r + 1, ci + r):
+            yield i, cj - r
+            yield i, cj + r
+
+    def _min_distance_outside(self, lat, lon, r):
+        """0..r halqalardan tashqaridagi har qanday nuqtagacha masofaning quyi chegarasi.
+
+        Ko'rilgan kataklar kenglik/uzunlik to'rtburchagini tashkil qiladi; undan
+        chiqadigan har qanday yo'l kenglik chetini yoki chetki meridianni kesib o'tadi.
+        """
+        ci, cj = self._cell(lat, lon)
+        south, north = (ci - r) * self.cell_deg, (ci + r + 1) * self.cell_deg
+        west, east = (cj - r) * self.cell_deg, (cj + r + 1) * self.cell_deg
+        # Kenglik cheti: katta doira masofasi kenglik farqidan kam emas
+        to_parallel = math.radians(max(min(lat - south, north - lat), 0.0))
+        # Meridian cheti: sin(d) = cos(lat) * sin(dlon); dlon >= 90 bo'lsa eng yaqin joy - qutb
+        dlon = max(min(lon - west, east - lon), 0.0)
+        if dlon >= 90:
+            to_meridian = math.radians(90 - abs(lat))
+        else:
+            to_meridian = math.asin(min(1.0, math.cos(math.radians(lat)) * math.sin(math.radians(dlon))))
+        return EARTH_RADIUS_KM * min(to_parallel, to_meridian)
+
+    def nearest(self, lat, lon, k, exclude=()):
+        """Eng yaqin k ta nuqta: [(masofa_km, pk), ...]"""
+        if not self.bounds or k <= 0:
+            return []
+        lat, lon = float(lat), float(lon)
+        ci, cj = self._cell(lat, lon)
+        min_i, max_i, min_j, max_j = self.bounds
+        max_r = max(abs(ci - min_i), abs(ci - max_i), abs(cj - min_j), abs(cj - max_j))
+
+        found = []
+        r = 0
+        while r <= max_r:
+            if 8 * r > len(self.cells):
+                # Siyrak ma'lumot: halqada band kataklardan ko'ra ko'proq katak bor -
+                # qolgan band kataklarni to'g'ridan-to'g'ri ko'rib chiqamiz
+                for (i, j), points in self.cells.items():
+                    if max(abs(i - ci), abs(j - cj)) < r:
+                        continue
+                    for pk, p_lat, p_lon in points:
+                        if pk not in exclude:
+                            found.append((haversine_km(lat, lon, p_lat, p_lon), pk))
+                break
+            for cell in self._ring(ci, cj, r):
+                for pk, p_lat, p_lon in self.cells.get(cell, ()):
+                    if pk not in exclude:
+                        found.append((haversine_km(lat, lon, p_lat, p_lon), pk))
+            if len(found) >= k:
+                found.sort()
+                found = found[:k]
+                if found[-1][0] <= self._min_distance_outside(lat, lon, r):
+                    break
+            r += 1
+        found.sort()
+        return found[:k]
+
+
+class ModelGridIndex:
+    """Model uchun jarayon ichidagi GridIndex: teg o'zgarganda yoki max_age o'tganda qayta quriladi"""
+
+    def __init__(self, queryset_factory, tag, cell_deg=0.1,
+                 lat_field='latitude', lon_field='longitude'):
+        self.queryset_factory = queryset_factory
+        self.tag = tag
+        self.cell_deg = cell_deg
+        self.lat_field = lat_field
+        self.lon_field = lon_field
+        self._index = None
+        self._version = None
+        self._built_at = None
+        self._lock = threading.Lock()
+
+    def max_age(self):
+        return getattr(settings, 'GEO_INDEX_MAX_AGE', DEFAULT_INDEX_MAX_AGE)
+
+    def _is_stale(self, version):
+        return (
+            self._index is None
+            or self._version != version
+            or time.monotonic() - self._built_at >= self.max_age()
+        )
+
+    def get(self):
+        version = caching.tag_version(self.tag)
+        if self._is_stale(version):
+            with self._lock:
+                if self._is_stale(version):
+                    points = (
+                        self.queryset_factory()
+                        .filter(**{f'{self.lat_field}__isnull': False,
+                                   f'{self.lon_field}__isnull': False})
+                        .order_by()
+                        .values_list('pk', self.lat_field, self.lon_field)
+                    )
+                    self._index = GridIndex(points, self.cell_deg)
+                    self._version = version
+                    self._built_at = time.monotonic()
+        return self._index
+
+    def nearest(self, lat, lon, k, exclude=()):
+        """Eng yaqin k ta obyekt (bitta pk bo'yicha so'rov), `distance_km` bilan"""
+        scored = self.get().nearest(lat, lon, k, exclude=exclude)
+        objects = self.queryset_factory().in_bulk([pk for _distance, pk in scored])
+        results = []
+        for distance, pk in scored:
+            obj = objects.get(pk)
+            if obj is not None:
+                obj.distance_km = round(distance, 2)
+                results.append(obj)
+        return results
+
+
+# Veterinariyalar indeksi ("veterinarian:*" tegi o'zgarganda qayta quriladi)
+veterinarians_index = ModelGridIndex(Veterinarian.objects.all, 'veterinarian:*')
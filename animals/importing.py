@@ -0,0 +1,380 @@
+# animals/importing.py
+"""
+Reyestrlardan ommaviy import (boshpanalar, veterinariyalar, hayvonlar).
+
+    python manage.py import_directory shelters regions/shelters.csv --workers 4
+    python manage.py import_directory animals animals.jsonl --owner registry
+
+Fayl (CSV yoki JSONL) qator-qator o'qiladi va --batch-size lik bo'laklarga
+bo'linadi. Har bir qator model cheklovlari bo'yicha tekshiriladi (full_clean,
+bazasiz - shuning uchun process pool da bajarilishi mumkin), so'ng bo'lak
+bitta tranzaksiyada bulk_create(update_conflicts=True) bilan external_id
+bo'yicha yoziladi: yangi yozuv qo'shiladi, mavjudi yangilanadi.
+
+Yangi external_id uchun fayldagi bo'lmagan majburiy ustunlar ham asosiy
+jarayonda tekshiriladi (mavjud yozuvda yo'q ustun shunchaki o'zgarmaydi).
+Bazaga yozishdagi xato butun buyruqni to'xtatmaydi - o'sha bo'lak xato
+sifatida hisoblanadi.
+
+bulk_create signal'larni chaqirmaydi, shuning uchun hosila ma'lumotlar
+(veterinariya xizmatlari/ish vaqti jadvallari har bir bo'lakda; hisoblagichlar,
+qidiruv indeksi va kesh teglari import oxirida) shu yerda yangilanadi.
+"""
+import csv
+import json
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, islice
+from multiprocessing import get_context
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+
+from . import caching, search
+from .models import BookAnimal, OpeningInterval, Shelter, Veterinarian, VeterinarianService
+from .schedule import parse_working_hours
+from .stats import reconcile_shelter_animals, reconcile_site_stats
+
+KEY = 'external_id'
+
+# columns - fayldagi ustunlar (external_id dan tashqari); references - boshqa
+# reyestr yozuviga havola (qiymati o'sha yozuvning external_id si)
+ImportSpec = namedtuple('ImportSpec', ['model', 'columns', 'references'])
+
+SPECS = {
+    'shelters': ImportSpec(
+        model=Shelter,
+        columns=(
+            'name', 'shelter_type', 'description', 'address', 'phone_number', 'email', 'website',
+            'capacity', 'director', 'founded_date', 'latitude', 'longitude', 'is_active',
+        ),
+        references={},
+    ),
+    'veterinarians': ImportSpec(
+        model=Veterinarian,
+        columns=(
+            'name', 'clinic_type', 'description', 'address', 'phone_number', 'email', 'website',
+            'services', 'working_hours', 'director', 'doctors_count', 'latitude', 'longitude',
+            'is_emergency',
+        ),
+        references={},
+    ),
+    'animals': ImportSpec(
+        model=BookAnimal,
+        columns=(
+            'name', 'animal_type', 'breed', 'age', 'gender', 'description', 'location', 'shelter',
+            'is_for_sale', 'price', 'status', 'vaccinated', 'sterilized', 'phone_number',
+        ),
+        references={'shelter': Shelter},
+    ),
+}
+
+# Qator: (fayldagi satr raqami, {ustun: qiymat})
+Row = namedtuple('Row', ['line', 'values'])
+RowError = namedtuple('RowError', ['line', 'message'])
+
+
+# ==================== O'QISH ====================
+
+def read_csv(path):
+    # utf-8-sig: Excel saqlagan fayllardagi BOM
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        reader = csv.DictReader(file)
+        for values in reader:
+            yield Row(reader.line_num, values)
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as file:
+        for line, text in enumerate(file, 1):
+            if not text.strip():
+                continue
+            try:
+                values = json.loads(text)
+            except ValueError as error:
+                values = error
+            yield Row(line, values)
+
+
+READERS = {
+    '.csv': read_csv,
+    '.jsonl': read_jsonl,
+    '.ndjson': read_jsonl,
+}
+
+
+def batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+# ==================== TEKSHIRISH (bazasiz, process pool da) ====================
+
+def format_error(error):
+    messages = []
+    for field, field_messages in error.message_dict.items():
+        prefix = '' if field == NON_FIELD_ERRORS else f'{field}: '
+        messages.extend(prefix + message for message in field_messages)
+    return '; '.join(messages)
+
+
+def clean_row(spec, values):
+    """Qatorni model maydonlari bo'yicha tekshirish -> tozalangan qiymatlar dict'i.
+
+    Faqat faylda bor ustunlar qaytariladi (qolganlari yangilanmaydi).
+    Havolalar (shelter) tekshirilmaydi - ular bazadan asosiy jarayonda topiladi.
+    """
+    if not isinstance(values, dict):
+        raise ValidationError(f"JSON obyekt emas: {values}")
+    external_id = str(values.get(KEY) or '').strip()
+    if not external_id:
+        raise ValidationError({KEY: ["Bo'sh bo'lishi mumkin emas."]})
+    unknown = set(values) - {KEY, *spec.columns}
+    if unknown:
+        raise ValidationError(f"Noma'lum ustunlar: {', '.join(sorted(unknown))}")
+
+    model = spec.model
+    present = [name for name in spec.columns if name in values]
+    kwargs = {}
+    for name in present:
+        if name in spec.references:
+            continue
+        value = values[name]
+        if value == '' and model._meta.get_field(name).null:
+            value = None
+        kwargs[name] = value
+    instance = model(external_id=external_id, **kwargs)
+    exclude = [
+        field.name for field in model._meta.concrete_fields
+        if field.name not in kwargs and field.name != KEY
+    ]
+    instance.full_clean(exclude=exclude, validate_unique=False, validate_constraints=False)
+
+    cleaned = {KEY: external_id}
+    for name in present:
+        if name in spec.references:
+            reference = values[name]
+            cleaned[name] = str(reference).strip() if reference not in ('', None) else None
+        else:
+            cleaned[name] = getattr(instance, name)
+    return cleaned
+
+
+def validate_batch(kind, rows):
+    """(to'g'ri qatorlar, xatolar) - process pool ga yuboriladi"""
+    spec = SPECS[kind]
+    valid, errors = [], []
+    for row in rows:
+        if isinstance(row.values, ValueError):
+            errors.append(RowError(row.line, f"JSON xato: {row.values}"))
+            continue
+        try:
+            valid.append(Row(row.line, clean_row(spec, row.values)))
+        except ValidationError as error:
+            errors.append(RowError(row.line, format_error(error)))
+    return valid, errors
+
+
+def validated_batches(kind, rows, batch_size, workers=0):
+    """Tekshirilgan bo'laklar fayldagi tartibda. workers > 0 - process pool.
+
+    Pool ga bir vaqtda ko'pi bilan workers * 2 bo'lak yuboriladi: fayl
+    oldindan to'liq o'qilmaydi, xotira bo'lak hajmiga bog'liq qoladi.
+    """
+    if not workers:
+        for batch in batches(rows, batch_size):
+            yield validate_batch(kind, batch)
+        return
+
+    # Fork qilinadigan jarayonlar ota jarayonning ulanishlarini ishlatmasligi kerak
+    connections.close_all()
+    with ProcessPoolExecutor(workers, mp_context=get_context('fork')) as pool:
+        pending = deque()
+        for batch in batches(rows, batch_size):
+            pending.append(pool.submit(validate_batch, kind, batch))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# ==================== YOZISH ====================
+
+def resolve_references(spec, rows, using):
+    """Havola qiymatlarini (external_id) pk ga almashtirish. Topilmaganlar - xato"""
+    if not spec.references:
+        return rows, []
+    resolved, errors = [], []
+    lookups = {}
+    for name, model in spec.references.items():
+        keys = {row.values[name] for row in rows if row.values.get(name)}
+        lookups[name] = dict(
+            model.objects.using(using).filter(**{f'{KEY}__in': keys}).values_list(KEY, 'pk')
+        )
+    for row in rows:
+        values = dict(row.values)
+        missing = []
+        for name in spec.references:
+            if name not in values:
+                continue
+            reference = values.pop(name)
+            if reference is None:
+                values[f'{name}_id'] = None
+            elif reference in lookups[name]:
+                values[f'{name}_id'] = lookups[name][reference]
+            else:
+                missing.append(f"{name}: '{reference}' reyestrda topilmadi")
+        if missing:
+            errors.append(RowError(row.line, '; '.join(missing)))
+        else:
+            resolved.append(Row(row.line, values))
+    return resolved, errors
+
+
+def existing_keys(model, rows, using):
+    """Bazada bor yozuvlar: {external_id: pk}"""
+    keys = {row.values[KEY] for row in rows}
+    return dict(model.objects.using(using).filter(**{f'{KEY}__in': keys}).values_list(KEY, 'pk'))
+
+
+def check_new_rows(spec, rows, existing, defaults=None):
+    """Yangi yozuvlar fayldagi bo'lmagan majburiy ustunlarsiz qo'shilmasin -> (to'g'ri, xatolar)
+
+    Fayldagi ustunlar clean_row da tekshirilgan; bu yerda faqat qolganlari.
+    """
+    model = spec.model
+    valid, errors = [], []
+    for row in rows:
+        if row.values[KEY] in existing:
+            valid.append(row)
+            continue
+        values = {**(defaults or {}), **row.values}
+        exclude = [
+            field.name for field in model._meta.concrete_fields
+            if field.name not in spec.columns or field.is_relation
+            or field.name in values or field.attname in values
+        ]
+        try:
+            model(**values).full_clean(exclude=exclude, validate_unique=False, validate_constraints=False)
+        except ValidationError as error:
+            errors.append(RowError(row.line, format_error(error)))
+        else:
+            valid.append(row)
+    return valid, errors
+
+
+def sync_veterinarian_links(veterinarians, using):
+    """VeterinarianService va OpeningInterval jadvallarini (save() dagidek) yangilash"""
+    pks = [vet.pk for vet in veterinarians]
+    VeterinarianService.objects.using(using).filter(veterinarian__in=pks).delete()
+    OpeningInterval.objects.using(using).filter(veterinarian__in=pks).delete()
+    VeterinarianService.objects.using(using).bulk_create([
+        VeterinarianService(veterinarian_id=vet.pk, service=code)
+        for vet in veterinarians
+        for code in vet.get_service_codes()
+    ])
+    OpeningInterval.objects.using(using).bulk_create([
+        OpeningInterval(veterinarian_id=vet.pk, start_minute=start, end_minute=end)
+        for vet in veterinarians
+        for start, end in sorted(set(parse_working_hours(vet.working_hours)))
+    ])
+
+
+def upsert_batch(kind, rows, using, existing, defaults=None):
+    """Bo'lakni bitta tranzaksiyada yozish -> (yangi, yangilangan). existing - existing_keys()
+
+    Mavjud yozuvlar bulk_update bilan (faqat fayldagi ustunlar): INSERT ... ON CONFLICT
+    da SQLite NOT NULL ni konfliktdan oldin tekshiradi, qisman qator o'tmas edi.
+    """
+    spec = SPECS[kind]
+    model = spec.model
+    # Bir bo'lakda bitta yozuv ikki marta kelsa - oxirgisi (bitta INSERT ikki marta yangilay olmaydi)
+    rows = list({row.values[KEY]: row for row in rows}.values())
+    now = timezone.now()
+    created = updated = 0
+    with transaction.atomic(using=using):
+        saved = []
+        # Har xil ustunli qatorlar (JSONL) alohida: yo'q ustun mavjud qiymatni o'chirmasin
+        by_columns = sorted(rows, key=lambda row: sorted(row.values))
+        for columns, group in groupby(by_columns, key=lambda row: sorted(row.values)):
+            update_fields = [
+                model._meta.get_field(name).name for name in columns if name != KEY
+            ] + ['updated_at']
+            new, old = [], []
+            for row in group:
+                obj = model(**{**(defaults or {}), **row.values})
+                if row.values[KEY] in existing:
+                    # bulk_update auto_now ni o'rnatmaydi
+                    obj.pk, obj.updated_at = existing[row.values[KEY]], now
+                    old.append(obj)
+                else:
+                    new.append(obj)
+            # Boshqa import shu orada qo'shgan bo'lsa ham - yangilanadi
+            saved.extend(model.objects.using(using).bulk_create(
+                new, update_conflicts=True, unique_fields=[KEY], update_fields=update_fields,
+            ))
+            model.objects.using(using).bulk_update(old, update_fields)
+            saved.extend(old)
+            created += len(new)
+            updated += len(old)
+        if model is Veterinarian:
+            sync_veterinarian_links(saved, using)
+    return created, updated
+
+
+def finish_import(kind, using):
+    """Signal'lar bajaradigan ishni butun jadval bo'yicha bir marta qilish"""
+    if kind == 'animals':
+        reconcile_shelter_animals(using=using)
+        search.rebuild_index(using=using)
+        tags = ['animal:*', 'shelter:*']
+    else:
+        tags = [f"{caching.MODEL_TAGS[SPECS[kind].model._meta.model_name]}:*"]
+    reconcile_site_stats(using=using)
+    caching.invalidate_tags(*tags, using=using)
+
+
+# ==================== IMPORT ====================
+
+# elapsed - umumiy vaqt, write_time - shundan bazaga yozish (qolgani o'qish va tekshirish)
+ImportResult = namedtuple('ImportResult', ['rows', 'created', 'updated', 'errors', 'elapsed', 'write_time'])
+
+
+def import_file(kind, path, reader, using, batch_size=1000, workers=0, defaults=None,
+                dry_run=False, on_error=None):
+    """Faylni import qilish. on_error(RowError) - har bir xato qator uchun"""
+    started = time.perf_counter()
+    rows = created = updated = errors = 0
+    write_time = 0.0
+    for valid, invalid in validated_batches(kind, reader(path), batch_size, workers):
+        rows += len(valid) + len(invalid)
+        if not dry_run and valid:
+            write_started = time.perf_counter()
+            spec = SPECS[kind]
+            valid, missing = resolve_references(spec, valid, using)
+            existing = existing_keys(spec.model, valid, using)
+            valid, incomplete = check_new_rows(spec, valid, existing, defaults)
+            invalid = sorted(invalid + missing + incomplete)
+            if valid:
+                try:
+                    batch_created, batch_updated = upsert_batch(kind, valid, using, existing, defaults)
+                except DatabaseError as error:
+                    # Tranzaksiya qaytarildi - bo'lakdagi hamma qator xato, keyingi bo'laklar davom etadi
+                    message = f"bo'lak bazaga yozilmadi: {error}"
+                    invalid = sorted(invalid + [RowError(row.line, message) for row in valid])
+                else:
+                    created += batch_created
+                    updated += batch_updated
+            write_time += time.perf_counter() - write_started
+        errors += len(invalid)
+        for error in invalid:
+            if on_error:
+                on_error(error)
+    if not dry_run and created + updated:
+        write_started = time.perf_counter()
+        finish_import(kind, using)
+        write_time += time.perf_counter() - write_started
+    return ImportResult(rows, created, updated, errors, time.perf_counter() - started, write_time)
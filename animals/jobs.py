@@ -0,0 +1,151 @@
+# animals/jobs.py
+"""
+Baza asosidagi fon vazifalari navbati.
+
+    @jobs.register('process_animal_uploads')
+    def process_animal_uploads(upload_ids):
+        ...
+
+    jobs.enqueue('process_animal_uploads', upload_ids=[1, 2])
+
+Vazifalar Job jadvalida saqlanadi va `manage.py run_jobs` worker'i tomonidan
+thread pool'da bajariladi. Vazifa shartli UPDATE (status='pending' -> 'running')
+bilan band qilinadi, shuning uchun bir nechta worker bir vazifani ikki marta
+olmaydi. Xato bo'lsa vazifa kechiktirilib qayta uriniladi (max_attempts gacha).
+
+Worker band qilgan vazifalarning locked_at ini heartbeat() bilan yangilab turadi
+(navbatda kutayotganlari ham), shuning uchun release_stale() faqat to'xtab
+qolgan worker'ning vazifalarini qaytaradi - uzoq bajarilayotganini emas.
+"""
+import logging
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def register(kind):
+    """Vazifa turini bajaruvchi funksiyani ro'yxatdan o'tkazish"""
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, using=None, delay=0, max_attempts=3, **payload):
+    """Vazifani navbatga qo'yish (tranzaksiya ichida bo'lsa commit'dan keyin ko'rinadi)"""
+    return Job.objects.using(using).create(
+        kind=kind,
+        payload=payload,
+        max_attempts=max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def retry_delay(attempts):
+    """Qayta urinishgacha kutish: 10s, 40s, 90s, ..."""
+    return timedelta(seconds=10 * attempts ** 2)
+
+
+def release_stale(stale_after, using=None):
+    """Uzoq vaqt 'running' holatida qolgan (worker to'xtagan) vazifalarni qaytarish"""
+    stale = Job.objects.using(using).filter(
+        status='running', locked_at__lt=timezone.now() - stale_after
+    )
+    released = stale.filter(attempts__lt=F('max_attempts')).update(status='pending', locked_at=None)
+    stale.update(status='failed', locked_at=None, last_error="Worker vazifani yakunlamadi")
+    return released
+
+
+def touch(job_ids, using=None):
+    """Vazifalar hali bajarilmoqda - locked_at ni hozirgi vaqtga surish"""
+    return Job.objects.using(using).filter(pk__in=job_ids, status='running').update(
+        locked_at=timezone.now()
+    )
+
+
+@contextmanager
+def heartbeat(job_ids, interval, using=None):
+    """Blok davomida har `interval` soniyada touch(job_ids) - alohida thread'da.
+
+    Tugagan vazifalar status='running' emas, ular yangilanmaydi.
+    """
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                touch(job_ids, using=using)
+        except Exception:
+            logger.exception("Heartbeat yozilmadi")
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, name='job-heartbeat', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def claim(limit, using=None):
+    """Bajarish vaqti kelgan vazifalardan `limit` tasini band qilish; pk ro'yxati qaytadi"""
+    now = timezone.now()
+    candidates = list(
+        Job.objects.using(using)
+        .filter(status='pending', run_after__lte=now)
+        .order_by('id')
+        .values_list('id', flat=True)[:limit]
+    )
+    claimed = []
+    for pk in candidates:
+        updated = Job.objects.using(using).filter(pk=pk, status='pending').update(
+            status='running', locked_at=now, attempts=F('attempts') + 1
+        )
+        if updated:
+            claimed.append(pk)
+    return claimed
+
+
+def run(job_id, using=None):
+    """Band qilingan vazifani bajarish. Muvaffaqiyatli bo'lsa True."""
+    job = Job.objects.using(using).get(pk=job_id)
+    rows = Job.objects.using(using).filter(pk=job_id)
+    # Navbatda kutgan vaqt hisobga olinmasin
+    touch([job_id], using=using)
+    try:
+        handler = HANDLERS.get(job.kind)
+        if handler is None:
+            raise LookupError(f"Noma'lum vazifa turi: {job.kind}")
+        handler(**job.payload)
+    except Exception:
+        logger.exception("Vazifa bajarilmadi: %s", job)
+        if job.attempts < job.max_attempts:
+            rows.update(status='pending', locked_at=None, last_error=traceback.format_exc(),
+                        run_after=timezone.now() + retry_delay(job.attempts))
+        else:
+            rows.update(status='failed', locked_at=None, last_error=traceback.format_exc(),
+                        finished_at=timezone.now())
+        return False
+    rows.update(status='done', locked_at=None, last_error='', finished_at=timezone.now())
+    return True
+
+
+def purge_finished(older_than, using=None):
+    """Bajarilgan eski vazifalarni o'chirish"""
+    deleted, _ = Job.objects.using(using).filter(
+        status='done', finished_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
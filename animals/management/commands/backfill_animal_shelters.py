@@ -0,0 +1,65 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from animals import caching
+from animals.models import BookAnimal, Shelter
+from animals.stats import reconcile_shelter_animals
+
+
+class Command(BaseCommand):
+    help = (
+        "BookAnimal.shelter ni eski usul bo'yicha to'ldirish (manzilda boshpana nomi bor "
+        "hayvonlar) va Shelter.current_animals ni qayta hisoblash"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help="Ma'lumotlar yangilanadigan baza (standart: default)",
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Hech narsa yozmasdan natijani ko'rsatish",
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        unassigned = BookAnimal.objects.using(using).filter(shelter__isnull=True)
+
+        # Hayvon -> manzili mos keladigan boshpanalar
+        matches = defaultdict(set)
+        for shelter_id, name in Shelter.objects.using(using).values_list('id', 'name'):
+            if not name.strip():
+                continue
+            for animal_id in unassigned.filter(location__icontains=name).values_list('id', flat=True):
+                matches[animal_id].add(shelter_id)
+
+        by_shelter = defaultdict(list)
+        ambiguous = 0
+        for animal_id, shelter_ids in matches.items():
+            if len(shelter_ids) == 1:
+                by_shelter[shelter_ids.pop()].append(animal_id)
+            else:
+                ambiguous += 1
+        assigned = sum(len(ids) for ids in by_shelter.values())
+
+        if options['dry_run']:
+            self.stdout.write(
+                f"{assigned} ta hayvon {len(by_shelter)} ta boshpanaga biriktiriladi, "
+                f"{ambiguous} ta hayvon bir nechta boshpanaga mos keladi (o'tkazib yuboriladi)"
+            )
+            return
+
+        with transaction.atomic(using=using):
+            for shelter_id, animal_ids in by_shelter.items():
+                # update() signal yubormaydi - hisoblagichlar quyida bir yo'la qayta hisoblanadi
+                BookAnimal.objects.using(using).filter(pk__in=animal_ids).update(shelter_id=shelter_id)
+            shelters = reconcile_shelter_animals(using=using)
+            caching.invalidate_tags('animal:*', 'shelter:*', using=using)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{assigned} ta hayvon boshpanaga biriktirildi, {shelters} ta boshpana hisoblagichi "
+            f"yangilandi ({ambiguous} ta noaniq hayvon o'tkazib yuborildi)"
+        ))
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from django.db.backends.signals import connection_created
+
+from animals.models import BookAnimal
+
+MODES = ('wsgi', 'asgi')
+
+
+def add_latency(seconds):
+    """Har bir SQL so'rovga tarmoq kechikishini qo'shish (tashqi baza serverini taqlid qilish)"""
+    def delay(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        connection.execute_wrappers.append(delay)
+
+    connection_created.connect(install, weak=False)
+
+
+def wsgi_environ(path):
+    return {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'localhost', 'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.input': BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+        'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+        'wsgi.version': (1, 0),
+    }
+
+
+def asgi_scope(path):
+    return {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': b'', 'root_path': '', 'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+    }
+
+
+class Command(BaseCommand):
+    help = ("O'qish sahifalari: WSGI (gthread kabi N thread) va ASGI (async view'lar) "
+            "o'tkazuvchanligini yuqori parallellikda solishtirish")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32, 128],
+                            help="Bir vaqtdagi mijozlar soni (bir nechta berish mumkin)")
+        parser.add_argument('--requests', type=int, default=400,
+                            help="Har bir o'lchovdagi so'rovlar soni")
+        parser.add_argument('--threads', type=int, default=8,
+                            help="WSGI worker thread'lari (gunicorn --threads)")
+        parser.add_argument('--latency', type=float, default=2.0,
+                            help="Har bir SQL so'rovga qo'shiladigan kechikish, ms (0 - lokal SQLite)")
+        parser.add_argument('--mode', choices=MODES, help="Faqat bitta rejimni o'lchash (ichki)")
+
+    def handle(self, *args, **options):
+        if options['mode']:
+            return self.run_mode(options)
+
+        # Har bir rejim alohida jarayonda: URLconf ASYNC_VIEWS ga qarab yuklanadi
+        for mode in MODES:
+            env = {**os.environ, 'DJANGO_ASYNC_VIEWS': '1' if mode == 'asgi' else '0'}
+            command = [sys.executable, sys.argv[0], 'bench_asgi', '--mode', mode,
+                       '--requests', str(options['requests']), '--threads', str(options['threads']),
+                       '--latency', str(options['latency']),
+                       '--concurrency', *map(str, options['concurrency'])]
+            subprocess.run(command, env=env, check=True)
+
+    def run_mode(self, options):
+        if options['latency']:
+            add_latency(options['latency'] / 1000)
+        pk = BookAnimal.objects.values_list('pk', flat=True).first()
+        paths = ['/', '/animals/', '/shelters/', '/veterinarians/']
+        if pk:
+            paths.append(f'/animals/{pk}/')
+        runner = self.run_wsgi if options['mode'] == 'wsgi' else self.run_asgi
+
+        # Isitish: kesh va shablonlar yuklanadi
+        runner(paths, 1, len(paths), options['threads'])
+        for concurrency in options['concurrency']:
+            elapsed, latencies = runner(paths, concurrency, options['requests'], options['threads'])
+            latencies.sort()
+            self.stdout.write(
+                f"{options['mode']} | {concurrency:4d} mijoz | {len(latencies) / elapsed:7.1f} req/s | "
+                f"median {statistics.median(latencies):7.1f} ms | "
+                f"p95 {latencies[int(len(latencies) * 0.95) - 1]:7.1f} ms"
+            )
+
+    def run_wsgi(self, paths, concurrency, total, threads):
+        from django.core.wsgi import get_wsgi_application
+        application = get_wsgi_application()
+        # Server faqat `threads` ta so'rovni bir vaqtda bajaradi, qolganlari navbatda
+        slots = threading.BoundedSemaphore(threads)
+        latencies = []
+
+        def request(i):
+            begin = time.perf_counter()
+            with slots:
+                result = application(wsgi_environ(paths[i % len(paths)]), lambda status, headers: None)
+                try:
+                    b''.join(result)
+                finally:
+                    result.close()
+            latencies.append((time.perf_counter() - begin) * 1000)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(request, range(total)))
+        return time.perf_counter() - started, latencies
+
+    def run_asgi(self, paths, concurrency, total, threads):
+        from django.core.asgi import get_asgi_application
+        application = get_asgi_application()
+        latencies = []
+
+        async def request(i):
+            begin = time.perf_counter()
+            disconnected = asyncio.Event()
+            messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.body' and not message.get('more_body'):
+                    disconnected.set()
+
+            await application(asgi_scope(paths[i % len(paths)]), receive, send)
+            latencies.append((time.perf_counter() - begin) * 1000)
+
+        async def client(queue):
+            while queue:
+                await request(queue.pop())
+
+        async def main():
+            queue = list(range(total))
+            await asyncio.gather(*(client(queue) for _ in range(concurrency)))
+
+        started = time.perf_counter()
+        asyncio.run(main())
+        return time.perf_counter() - started, latencies
@@ -0,0 +1,78 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from animals import geo
+from animals.models import Shelter
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("\"Yaqin atrofdagi boshpanalar\" qidiruvining tezligini o'lchash "
+            "(vaqtinchalik ma'lumotlar bilan, oxirida bekor qilinadi)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shelters', type=int, default=100_000, help="Boshpanalar soni")
+        parser.add_argument('--queries', type=int, default=200, help="So'rovlar soni")
+        parser.add_argument('--radius-km', type=float, default=10.0, help="Qidiruv radiusi")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        try:
+            with transaction.atomic():
+                self._seed(rng, options['shelters'])
+                self._run(rng, options['queries'], options['radius_km'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _seed(self, rng, count):
+        # O'zbekiston hududi atrofida tasodifiy nuqtalar
+        started = time.perf_counter()
+        Shelter.objects.bulk_create(
+            (
+                Shelter(
+                    name=f'Bench boshpana {i}', shelter_type='private', description='-',
+                    address='-', phone_number='-', capacity=50, director='-',
+                    latitude=round(rng.uniform(37.0, 45.6), 6),
+                    longitude=round(rng.uniform(56.0, 73.2), 6),
+                )
+                for i in range(count)
+            ),
+            batch_size=2000,
+        )
+        self.stdout.write(f"{count} ta boshpana yaratildi: {time.perf_counter() - started:.1f} s")
+
+    def _run(self, rng, queries, radius_km):
+        shelters = Shelter.objects.filter(is_active=True)
+        points = [(rng.uniform(38.0, 44.0), rng.uniform(58.0, 72.0)) for _ in range(queries)]
+
+        sql, params = shelters.filter(
+            geo.bounding_box_q(*points[0], radius_km)
+        ).order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' | '.join(row[-1] for row in cursor.fetchall()) if connection.vendor == 'sqlite' else '-'
+        self.stdout.write(f"So'rov rejasi: {plan}")
+
+        timings = []
+        found = 0
+        for lat, lon in points:
+            started = time.perf_counter()
+            found += len(geo.within_radius(shelters, lat, lon, radius_km))
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        self.stdout.write(self.style.SUCCESS(
+            f"{queries} ta so'rov, radius {radius_km} km, o'rtacha {found / queries:.1f} ta natija: "
+            f"median {statistics.median(timings):.2f} ms, "
+            f"p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms, "
+            f"max {timings[-1]:.2f} ms"
+        ))
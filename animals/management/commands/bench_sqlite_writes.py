@@ -0,0 +1,109 @@
+import multiprocessing
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from copy import deepcopy
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from animals.models import Donation, Shelter
+from users.models import CustomUser
+
+# Django standart sqlite3 sozlamalari (rollback journal, DEFERRED tranzaksiya)
+BASELINE = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'OPTIONS': {'timeout': 5},
+}
+
+
+def _worker(alias, transactions, shelter_id, donor_id):
+    """Bitta worker jarayoni: xayriya yaratish (signal'lar hisoblagichlarni yangilaydi)"""
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for _ in range(transactions):
+        begin = time.perf_counter()
+        try:
+            with transaction.atomic(using=alias):
+                # View'lardagidek: avval o'qish (DEFERRED da SHARED qulf), keyin yozish
+                shelter = Shelter.objects.using(alias).get(pk=shelter_id)
+                Donation.objects.using(alias).create(
+                    donor_id=donor_id, shelter=shelter, donation_type='money',
+                    amount=1000, status='confirmed',
+                )
+        except OperationalError:
+            errors += 1
+            continue
+        latencies.append((time.perf_counter() - begin) * 1000)
+    finished = time.perf_counter()
+    connections.close_all()
+    return started, finished, latencies, errors
+
+
+class Command(BaseCommand):
+    help = ("SQLite ga parallel yozish tezligini o'lchash: Django standart sozlamalari va "
+            "loyiha profili (WAL, IMMEDIATE, qayta urinish) - vaqtinchalik bazada")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                            help="Parallel jarayonlar soni (bir nechta berish mumkin)")
+        parser.add_argument('--transactions', type=int, default=200,
+                            help="Har bir jarayondagi yozish tranzaksiyalari soni")
+
+    def handle(self, *args, **options):
+        directory = tempfile.mkdtemp(prefix='bench-sqlite-')
+        try:
+            profiles = {
+                'standart': BASELINE,
+                'loyiha': {key: settings.DATABASES['default'][key] for key in ('ENGINE', 'OPTIONS')},
+            }
+            for label, profile in profiles.items():
+                alias = self._configure(label, profile, directory)
+                shelter_id, donor_id = self._seed(alias)
+                for workers in options['workers']:
+                    self._run(label, alias, workers, options['transactions'], shelter_id, donor_id)
+        finally:
+            connections.close_all()
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _configure(self, label, profile, directory):
+        alias = f'bench_{label}'
+        config = deepcopy(connections['default'].settings_dict)
+        config.update(deepcopy(profile), NAME=os.path.join(directory, f'{label}.sqlite3'),
+                      CONN_MAX_AGE=None, TEST={**config.get('TEST', {})})
+        connections.settings[alias] = config
+        call_command('migrate', database=alias, verbosity=0)
+        return alias
+
+    def _seed(self, alias):
+        donor = CustomUser.objects.db_manager(alias).create_user(username='bench', password='bench')
+        shelter = Shelter.objects.using(alias).create(
+            name='Bench boshpana', shelter_type='private', description='-', address='-',
+            phone_number='-', capacity=50, director='-',
+        )
+        return shelter.pk, donor.pk
+
+    def _run(self, label, alias, workers, transactions, shelter_id, donor_id):
+        # Fork'dan oldin ulanishlar yopiladi - har bir jarayon o'zinikini ochadi
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        with context.Pool(workers) as pool:
+            results = pool.starmap(
+                _worker, [(alias, transactions, shelter_id, donor_id)] * workers
+            )
+
+        started = min(result[0] for result in results)
+        finished = max(result[1] for result in results)
+        latencies = sorted(latency for result in results for latency in result[2])
+        errors = sum(result[3] for result in results)
+        elapsed = finished - started
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+        self.stdout.write(
+            f"{label:>8} | {workers:2d} worker | {len(latencies) / elapsed:7.1f} tx/s | "
+            f"median {statistics.median(latencies) if latencies else 0:6.1f} ms | "
+            f"p95 {p95:6.1f} ms | 'database is locked': {errors}"
+        )
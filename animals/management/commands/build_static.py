@@ -0,0 +1,39 @@
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from animals.staticfiles import MINIFY_PREFIXES, MinifiedManifestStaticFilesStorage
+
+
+class Command(BaseCommand):
+    help = ("Static fayllarni yig'ish: CSS/JS minify, kontent xeshli nomlar va "
+            ".gz/.br nusxalar (deploy paytida, DJANGO_DEBUG=0 bilan)")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear', action='store_true',
+            help="STATIC_ROOT dagi eski fayllarni avval o'chirish",
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(staticfiles_storage, MinifiedManifestStaticFilesStorage):
+            raise CommandError(
+                "Static storage MinifiedManifestStaticFilesStorage emas - DJANGO_DEBUG=0 bilan ishga tushiring"
+            )
+        call_command('collectstatic', interactive=False, clear=options['clear'],
+                     verbosity=options['verbosity'])
+
+        files = minified = gzipped = brotlied = 0
+        for name in sorted(set(staticfiles_storage.hashed_files.values())):
+            if not name.startswith(MINIFY_PREFIXES):
+                continue
+            files += 1
+            minified += staticfiles_storage.size(name)
+            if staticfiles_storage.exists(name + '.gz'):
+                gzipped += staticfiles_storage.size(name + '.gz')
+            if staticfiles_storage.exists(name + '.br'):
+                brotlied += staticfiles_storage.size(name + '.br')
+        summary = f"{files} ta CSS/JS fayl: {minified / 1024:.1f} KB, gzip {gzipped / 1024:.1f} KB"
+        if brotlied:
+            summary += f", brotli {brotlied / 1024:.1f} KB"
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,51 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from animals import caching, renditions
+
+
+class Command(BaseCommand):
+    help = "Mavjud rasmlar uchun kichraytirilgan JPEG/WebP nusxalarni yaratish"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help="Rasmlar o'qiladigan baza (standart: default)",
+        )
+        parser.add_argument(
+            '--model', action='append', choices=sorted(renditions.IMAGE_FIELDS),
+            help="Faqat shu model(lar) uchun (bir necha marta berish mumkin)",
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help="Mavjud nusxalarni ham qayta yaratish",
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        images = files = 0
+        for model_name in options['model'] or renditions.IMAGE_FIELDS:
+            model = apps.get_model('animals', model_name)
+            for field in renditions.IMAGE_FIELDS[model_name]:
+                names = (
+                    model.objects.using(using)
+                    .exclude(**{field: ''})
+                    .exclude(**{f'{field}__isnull': True})
+                    .values_list(field, flat=True)
+                    .iterator()
+                )
+                model_field = model._meta.get_field(field)
+                for name in names:
+                    fieldfile = model_field.attr_class(None, model_field, name)
+                    if not model_field.storage.exists(name):
+                        self.stderr.write(f"Topilmadi: {name}")
+                        continue
+                    created = renditions.generate(fieldfile, force=options['force'])
+                    if created:
+                        images += 1
+                        files += created
+        caching.invalidate_tags(*(f'{prefix}:*' for prefix in caching.MODEL_TAGS.values()), using=using)
+        self.stdout.write(self.style.SUCCESS(
+            f"{images} ta rasm uchun {files} ta nusxa yaratildi"
+        ))
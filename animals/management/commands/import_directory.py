@@ -0,0 +1,66 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from animals.importing import READERS, SPECS, import_file
+
+
+class Command(BaseCommand):
+    help = ("Boshpanalar, veterinariyalar yoki hayvonlar reyestrini CSV/JSONL fayldan "
+            "import qilish (external_id bo'yicha qo'shish yoki yangilash)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(SPECS), help="Qaysi reyestr")
+        parser.add_argument('path', help="CSV yoki JSONL (.jsonl, .ndjson) fayl")
+        parser.add_argument('--format', choices=sorted({ext.lstrip('.') for ext in READERS}),
+                            help="Fayl formati (standart: kengaytmadan)")
+        parser.add_argument('--owner',
+                            help="Yangi hayvonlar egasi - foydalanuvchi nomi (animals uchun majburiy)")
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Bitta tranzaksiyada yoziladigan qatorlar soni")
+        parser.add_argument('--workers', type=int, default=0,
+                            help="Qatorlarni tekshiradigan jarayonlar soni (0 - shu jarayonda)")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Faqat tekshirish, bazaga yozmaslik")
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help="Import qilinadigan baza (standart: default)",
+        )
+
+    def handle(self, *args, **options):
+        kind, path, using = options['kind'], options['path'], options['database']
+        extension = f".{options['format']}" if options['format'] else os.path.splitext(path)[1].lower()
+        if extension not in READERS:
+            raise CommandError(f"Noma'lum fayl formati: {path} (--format bilan ko'rsating)")
+        if not os.path.exists(path):
+            raise CommandError(f"Fayl topilmadi: {path}")
+
+        defaults = None
+        if kind == 'animals' and not options['dry_run']:
+            if not options['owner']:
+                raise CommandError("animals uchun --owner majburiy")
+            owner = get_user_model().objects.using(using).filter(username=options['owner']).first()
+            if owner is None:
+                raise CommandError(f"Foydalanuvchi topilmadi: {options['owner']}")
+            defaults = {'user_id': owner.pk}
+
+        def report(error):
+            self.stderr.write(f"{path}:{error.line}: {error.message}")
+
+        result = import_file(
+            kind, path, READERS[extension], using,
+            batch_size=options['batch_size'], workers=options['workers'],
+            defaults=defaults, dry_run=options['dry_run'], on_error=report,
+        )
+        rate = result.rows / result.elapsed if result.elapsed else 0
+        summary = (
+            f"{result.rows} qator: {result.created} ta yangi, {result.updated} ta yangilandi, "
+            f"{result.errors} ta xato | {result.elapsed:.2f} s, {rate:,.0f} qator/s "
+            f"(yozish {result.write_time:.2f} s)"
+        )
+        if options['dry_run']:
+            summary = f"(dry-run, bazaga yozilmadi) {summary}"
+        style = self.style.WARNING if result.errors else self.style.SUCCESS
+        self.stdout.write(style(summary))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from animals import search
+
+
+class Command(BaseCommand):
+    help = "BookAnimal uchun to'liq matnli qidiruv indeksini qayta qurish"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help="Indeks qayta quriladigan baza (standart: default)",
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if not search.is_enabled(using):
+            self.stdout.write(self.style.WARNING(
+                "Bu bazada FTS indeksi qo'llab-quvvatlanmaydi, icontains qidiruvi ishlatiladi."
+            ))
+            return
+        count = search.rebuild_index(using=using)
+        self.stdout.write(self.style.SUCCESS(f"Qidiruv indeksi qayta qurildi: {count} ta hayvon"))
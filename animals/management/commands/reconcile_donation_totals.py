@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from animals import caching
+from animals.stats import reconcile_shelter_donations, reconcile_site_stats
+
+
+class Command(BaseCommand):
+    help = "Boshpanalar va sayt bo'yicha xayriya yig'indilarini bazadan qayta hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help="Yig'indilar qayta hisoblanadigan baza (standart: default)",
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        with transaction.atomic(using=using):
+            shelters = reconcile_shelter_donations(using=using)
+            stats = reconcile_site_stats(using=using)
+            caching.invalidate_tags('shelter:*', using=using)
+        self.stdout.write(self.style.SUCCESS(
+            f"{shelters} ta boshpana yangilandi; jami {stats.confirmed_donations} ta "
+            f"tasdiqlangan xayriya ({stats.donations_amount} so'm)"
+        ))
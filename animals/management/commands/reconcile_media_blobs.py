@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from animals import caching
+from animals.blobs import migrate_legacy_files, reconcile_blobs
+
+
+class Command(BaseCommand):
+    help = "Media fayllar havolalarini (MediaBlob.ref_count) bazadan qayta hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help="Havolalar sanaladigan baza (standart: default)",
+        )
+        parser.add_argument(
+            '--migrate-legacy', action='store_true',
+            help="Eski katalogdagi rasmlarni (animal_images/ va h.k.) blob'larga ko'chirish",
+        )
+        parser.add_argument(
+            '--delete-orphan-files', action='store_true',
+            help="Hech bir obyekt ishlatmayotgan blob fayllarini diskdan o'chirish",
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if options['migrate_legacy']:
+            moved = migrate_legacy_files(using=using)
+            caching.invalidate_tags(*(f'{prefix}:*' for prefix in caching.MODEL_TAGS.values()), using=using)
+            self.stdout.write(f"Blob'larga ko'chirildi: {moved} ta fayl")
+        updated, deleted, removed = reconcile_blobs(
+            using=using, delete_orphan_files=options['delete_orphan_files']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Yangilandi: {updated}, o'chirilgan qatorlar: {deleted}, o'chirilgan fayllar: {removed}"
+        ))
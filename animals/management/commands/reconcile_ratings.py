@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from animals import caching
+from animals.stats import reconcile_ratings
+
+
+class Command(BaseCommand):
+    help = "Boshpana va veterinariyalar reytingini (review_count, rating_sum) sharhlardan qayta hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help="Reytinglar qayta hisoblanadigan baza (standart: default)",
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        updated = reconcile_ratings(using=using)
+        caching.invalidate_tags('shelter:*', 'veterinarian:*', using=using)
+        self.stdout.write(self.style.SUCCESS(f"Reytinglar qayta hisoblandi: {updated} ta obyekt"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from animals.stats import reconcile_site_stats
+
+
+class Command(BaseCommand):
+    help = "SiteStats hisoblagichlarini bazadan noldan qayta hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help="Statistika qayta hisoblanadigan baza (standart: default)",
+        )
+
+    def handle(self, *args, **options):
+        stats = reconcile_site_stats(using=options['database'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Statistika yangilandi: {stats.available_animals} ta hayvon, "
+            f"{stats.active_shelters} ta boshpana, {stats.veterinarians_count} ta veterinariya, "
+            f"{stats.confirmed_donations} ta xayriya ({stats.donations_amount} so'm)"
+        ))
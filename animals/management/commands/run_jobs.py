@@ -0,0 +1,78 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from animals import jobs
+
+
+class Command(BaseCommand):
+    help = "Fon vazifalari worker'i (rasmlarni qayta ishlash va h.k.)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help="Navbat jadvali joylashgan baza (standart: default)",
+        )
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help="Parallel bajariladigan vazifalar soni (standart: 4)",
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help="Navbat bo'sh bo'lganda kutish, soniya (standart: 2)",
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help="Shuncha soniya heartbeat bo'lmasa 'running' vazifa qayta navbatga qaytariladi "
+                 "(standart: 600; heartbeat har chorakda)",
+        )
+        parser.add_argument(
+            '--keep-done-days', type=int, default=7,
+            help="Bajarilgan vazifalar shuncha kun saqlanadi (standart: 7)",
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Navbatni bo'shatib chiqib ketish (cron va testlar uchun)",
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        workers = max(1, options['workers'])
+        stale_after = timedelta(seconds=options['stale_after'])
+        # To'rtta heartbeat o'tkazib yuborilsagina vazifa boshqa worker'ga o'tadi
+        beat_interval = max(1, stale_after.total_seconds() / 4)
+        keep_done = timedelta(days=options['keep_done_days'])
+        done = failed = 0
+
+        self.stdout.write(f"Worker ishga tushdi: {workers} ta thread")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job') as pool:
+            try:
+                while True:
+                    jobs.release_stale(stale_after, using=using)
+                    claimed = jobs.claim(workers * 2, using=using)
+                    if not claimed:
+                        jobs.purge_finished(keep_done, using=using)
+                        if options['once']:
+                            break
+                        time.sleep(options['poll_interval'])
+                        continue
+                    with jobs.heartbeat(claimed, beat_interval, using=using):
+                        for ok in pool.map(lambda pk: self.run_job(pk, using), claimed):
+                            if ok:
+                                done += 1
+                            else:
+                                failed += 1
+            except KeyboardInterrupt:
+                self.stdout.write("To'xtatilmoqda...")
+
+        self.stdout.write(self.style.SUCCESS(f"Bajarildi: {done}, xato: {failed}"))
+
+    def run_job(self, pk, using):
+        try:
+            return jobs.run(pk, using=using)
+        finally:
+            # Har bir thread o'z ulanishini ochadi - ochiq qoldirmaymiz
+            connections.close_all()
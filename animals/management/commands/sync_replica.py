@@ -0,0 +1,46 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from animals.routers import REPLICA_ALIAS, replica_available
+
+
+class Command(BaseCommand):
+    help = ("Lokal SQLite replikani asosiy bazadan nusxalash (sqlite3 backup API). "
+            "--interval bilan fonda davriy ishlaydi")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help="Nusxalash oralig'i, soniya (0 - bir marta). REPLICA_PIN_SECONDS dan kichik bo'lsin",
+        )
+
+    def handle(self, *args, **options):
+        if not replica_available():
+            raise CommandError(f"settings.DATABASES da '{REPLICA_ALIAS}' bazasi yo'q (DB_REPLICA_NAME)")
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[REPLICA_ALIAS]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError("Faqat SQLite replika uchun; boshqa bazalar o'z replikatsiyasidan foydalanadi")
+
+        while True:
+            started = time.perf_counter()
+            self.sync(primary, replica.settings_dict['NAME'])
+            if options['verbosity'] > 1 or not options['interval']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Replika yangilandi: {(time.perf_counter() - started) * 1000:.0f} ms"
+                ))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def sync(self, primary, target):
+        primary.ensure_connection()
+        # Nusxa joyida yoziladi: replikaning ochiq ulanishlari faylni yo'qotmaydi,
+        # o'quvchilar esa nusxalash tugaguncha eski holatni ko'radi
+        destination = sqlite3.connect(target, timeout=30)
+        try:
+            primary.connection.backup(destination)
+        finally:
+            destination.close()
@@ -0,0 +1,206 @@
+# animals/media.py
+"""
+Productionda MEDIA_URL ostidagi fayllarni berish.
+
+Front proxy sozlangan bo'lsa fayl yuborishni unga topshiramiz:
+
+    MEDIA_X_ACCEL_REDIRECT = '/protected-media/'   # nginx: internal location
+    MEDIA_X_SENDFILE = True                        # Apache mod_xsendfile, lighttpd
+
+Aks holda FileResponse bilan oqim sifatida beriladi - gunicorn uni
+wsgi.file_wrapper orqali os.sendfile() bilan yuboradi (fayl Python xotirasiga
+o'qilmaydi). Bitta `Range: bytes=...` oralig'i (video, katta rasm, uzilgan
+yuklab olish), If-None-Match / If-Modified-Since va If-Range qo'llab-quvvatlanadi.
+
+Kontent xeshli fayllar (blobs/..., animals/storage.py) hech qachon
+o'zgarmaydi va bir yil `immutable` bilan keshlanadi; qolganlari qisqa muddat
+keshlanib, ETag bilan tekshiriladi.
+
+Hamma fayl ham ochiq emas: xayriya cheklari (donation_receipts/) faqat
+xayriyachi va xodimlarga `private` bilan beriladi; qayta ishlanmagan
+yuklamalar (uploads/ - EXIF/GPS hali olib tashlanmagan) umuman berilmaydi.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+from .models import Donation
+from .storage import BLOB_PREFIX
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+DEFAULT_MAX_AGE = 60 * 60
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeFile:
+    """Faylning [start, start + length) qismini o'qiydigan obyekt.
+
+    fileno() va joriy pozitsiya saqlanadi, shuning uchun gunicorn
+    Content-Length bo'yicha os.sendfile() ishlatadi.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def is_immutable(name):
+    return name.startswith(BLOB_PREFIX + '/')
+
+
+def can_view_receipt(request, name):
+    """Chek faqat xayriyachi va xodimlarga (donation_detail_view dagidek)"""
+    user = request.user
+    if not user.is_authenticated:
+        return False
+    if user.is_staff or user.is_superuser:
+        return True
+    return Donation.objects.filter(receipt_image=name, donor=user).exists()
+
+
+# Prefiks -> ruxsat tekshiruvi (request, name) -> bool; None - hech kimga berilmaydi
+PRIVATE_PREFIXES = {
+    'donation_receipts/': can_view_receipt,
+    'uploads/': None,
+}
+
+
+def is_private(name):
+    return any(name.startswith(prefix) for prefix in PRIVATE_PREFIXES)
+
+
+def can_serve(request, name):
+    """Ochiq fayl - hammaga; yopiq prefiks - faqat tekshiruvdan o'tsa"""
+    for prefix, check in PRIVATE_PREFIXES.items():
+        if name.startswith(prefix):
+            return check is not None and check(request, name)
+    return True
+
+
+def parse_range(header, size):
+    """'bytes=0-499' -> (0, 499); noto'g'ri yoki ko'p oraliq bo'lsa None, bajarib bo'lmasa False"""
+    match = RANGE_RE.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # bytes=-500: oxirgi 500 bayt
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _cache_headers(response, name, etag, last_modified, private=False):
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(last_modified)
+    response.headers['Accept-Ranges'] = 'bytes'
+    if private:
+        # Umumiy keshlar (CDN, proxy) saqlamasin
+        patch_cache_control(response, private=True, no_cache=True)
+    elif is_immutable(name):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=DEFAULT_MAX_AGE)
+    return response
+
+
+def _proxy_response(name, full_path, content_type):
+    """Faylni yuborishni front proxy ga topshirish (Range ni ham u bajaradi)"""
+    response = HttpResponse(content_type=content_type)
+    accel_prefix = getattr(settings, 'MEDIA_X_ACCEL_REDIRECT', None)
+    if accel_prefix:
+        response.headers['X-Accel-Redirect'] = quote(posixpath.join(accel_prefix, name))
+    else:
+        response.headers['X-Sendfile'] = full_path
+    return response
+
+
+def uses_front_proxy():
+    return bool(getattr(settings, 'MEDIA_X_ACCEL_REDIRECT', None)
+                or getattr(settings, 'MEDIA_X_SENDFILE', False))
+
+
+@require_safe
+def serve_media(request, path):
+    """MEDIA_ROOT ichidagi faylni berish"""
+    name = posixpath.normpath(path).lstrip('/')
+    if not can_serve(request, name):
+        # Mavjudligini ham oshkor qilmaymiz
+        raise Http404("Fayl topilmadi")
+    private = is_private(name)
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, name)
+        stat_result = os.stat(full_path)
+    except (OSError, SuspiciousFileOperation):
+        # SuspiciousFileOperation: MEDIA_ROOT dan tashqariga chiqishga urinish (../)
+        raise Http404("Fayl topilmadi")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise Http404("Fayl topilmadi")
+
+    size = stat_result.st_size
+    etag = quote_etag(f'{stat_result.st_mtime_ns:x}-{size:x}')
+    last_modified = stat_result.st_mtime
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+    if not_modified is not None:
+        return _cache_headers(not_modified, name, etag, last_modified, private)
+
+    if uses_front_proxy():
+        return _cache_headers(_proxy_response(name, full_path, content_type), name, etag, last_modified, private)
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and request.headers.get('If-Range', etag) in (etag, http_date(last_modified)):
+        byte_range = parse_range(range_header, size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response.headers['Content-Range'] = f'bytes */{size}'
+        return _cache_headers(response, name, etag, last_modified, private)
+
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(RangeFile(file, start, end - start + 1), content_type=content_type,
+                                status=206)
+        response.headers['Content-Length'] = end - start + 1
+        response.headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return _cache_headers(response, name, etag, last_modified, private)
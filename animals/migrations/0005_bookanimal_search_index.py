@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+CREATE_FTS_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS animals_bookanimal_fts "
+    "USING fts5(name, breed, location, description, tokenize='unicode61 remove_diacritics 2')"
+)
+
+FILL_FTS_TABLE = (
+    "INSERT INTO animals_bookanimal_fts (rowid, name, breed, location, description) "
+    "SELECT id, COALESCE(name, ''), COALESCE(breed, ''), COALESCE(location, ''), "
+    "COALESCE(description, '') FROM animals_bookanimal"
+)
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_FTS_TABLE)
+    schema_editor.execute(FILL_FTS_TABLE)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS animals_bookanimal_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0004_shelter_veterinarian_bookanimal_phone_number_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0 on 2026-10-18 12:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0005_bookanimal_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='bookanimal',
+            index=models.Index(fields=['status', '-created_at'], name='animal_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookanimal',
+            index=models.Index(fields=['status', 'animal_type', '-created_at'], name='animal_status_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookanimal',
+            index=models.Index(fields=['status', 'is_for_sale', '-created_at'], name='animal_status_sale_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookanimal',
+            index=models.Index(fields=['user', '-created_at'], name='animal_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0006_bookanimal_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('available_animals', models.IntegerField(default=0, verbose_name='Mavjud hayvonlar')),
+                ('free_animals', models.IntegerField(default=0, verbose_name='Bepul hayvonlar')),
+                ('paid_animals', models.IntegerField(default=0, verbose_name='Pulli hayvonlar')),
+                ('dogs_count', models.IntegerField(default=0, verbose_name='Kuchuklar')),
+                ('cats_count', models.IntegerField(default=0, verbose_name='Mushuklar')),
+                ('other_animals', models.IntegerField(default=0, verbose_name='Boshqa hayvonlar')),
+                ('active_shelters', models.IntegerField(default=0, verbose_name='Faol boshpanalar')),
+                ('veterinarians_count', models.IntegerField(default=0, verbose_name='Veterinariyalar')),
+                ('confirmed_donations', models.IntegerField(default=0, verbose_name='Tasdiqlangan xayriyalar')),
+                ('donations_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Xayriyalar summasi')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Yangilangan vaqt')),
+            ],
+            options={
+                'verbose_name': 'Sayt statistikasi',
+                'verbose_name_plural': 'Sayt statistikasi',
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-18 13:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SERVICE_CODES = {
+    'general', 'surgery', 'dental', 'dermatology', 'ophthalmology', 'emergency',
+    'vaccination', 'grooming', 'radiology', 'laboratory', 'boarding', 'training',
+}
+
+
+def split_services(apps, schema_editor):
+    Veterinarian = apps.get_model('animals', 'Veterinarian')
+    VeterinarianService = apps.get_model('animals', 'VeterinarianService')
+    db_alias = schema_editor.connection.alias
+    links = []
+    for vet in Veterinarian.objects.using(db_alias).exclude(services='').only('id', 'services').iterator():
+        codes = {code.strip() for code in (vet.services or '').split(',')}
+        links.extend(
+            VeterinarianService(veterinarian_id=vet.id, service=code)
+            for code in sorted(codes & SERVICE_CODES)
+        )
+    VeterinarianService.objects.using(db_alias).bulk_create(links, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0007_sitestats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VeterinarianService',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service', models.CharField(choices=[('general', 'Umumiy veterinariya'), ('surgery', 'Jarrohlik'), ('dental', 'Stomatologiya'), ('dermatology', 'Dermatologiya'), ('ophthalmology', 'Oftalmologiya'), ('emergency', 'Shoshilinch yordam'), ('vaccination', 'Emlash'), ('grooming', 'Grooming'), ('radiology', 'Rentgenologiya'), ('laboratory', 'Laboratoriya tekshiruvlari'), ('boarding', 'Qarovxona'), ('training', 'Mashq qilish')], max_length=30, verbose_name='Xizmat')),
+                ('veterinarian', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='service_links', to='animals.veterinarian', verbose_name='Veterinariya')),
+            ],
+            options={
+                'verbose_name': 'Veterinariya xizmati',
+                'verbose_name_plural': 'Veterinariya xizmatlari',
+                'indexes': [models.Index(fields=['service', 'veterinarian'], name='vet_service_lookup_idx')],
+                'constraints': [models.UniqueConstraint(fields=('veterinarian', 'service'), name='unique_veterinarian_service')],
+            },
+        ),
+        migrations.RunPython(split_services, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0008_veterinarianservice'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='shelter',
+            index=models.Index(fields=['latitude', 'longitude'], name='shelter_location_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-18 15:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def parse_existing_hours(apps, schema_editor):
+    from animals.schedule import parse_working_hours
+
+    Veterinarian = apps.get_model('animals', 'Veterinarian')
+    OpeningInterval = apps.get_model('animals', 'OpeningInterval')
+    db_alias = schema_editor.connection.alias
+    intervals = []
+    for vet in Veterinarian.objects.using(db_alias).only('id', 'working_hours').iterator():
+        intervals.extend(
+            OpeningInterval(veterinarian_id=vet.id, start_minute=start, end_minute=end)
+            for start, end in parse_working_hours(vet.working_hours)
+        )
+    OpeningInterval.objects.using(db_alias).bulk_create(intervals, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0009_shelter_location_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpeningInterval',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_minute', models.PositiveIntegerField(verbose_name='Boshlanish (hafta daqiqasi)')),
+                ('end_minute', models.PositiveIntegerField(verbose_name='Tugash (hafta daqiqasi)')),
+                ('veterinarian', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='opening_intervals', to='animals.veterinarian', verbose_name='Veterinariya')),
+            ],
+            options={
+                'verbose_name': "Ish vaqti oralig'i",
+                'verbose_name_plural': 'Ish vaqti oraliqlari',
+                'ordering': ['veterinarian', 'start_minute'],
+                'indexes': [models.Index(fields=['start_minute', 'end_minute', 'veterinarian'], name='opening_interval_idx')],
+            },
+        ),
+        migrations.RunPython(parse_existing_hours, migrations.RunPython.noop),
+    ]
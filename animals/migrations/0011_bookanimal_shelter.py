@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-18 15:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0010_openinginterval'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookanimal',
+            name='shelter',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='animals', to='animals.shelter', verbose_name='Boshpana'),
+        ),
+        migrations.AddIndex(
+            model_name='bookanimal',
+            index=models.Index(fields=['shelter', 'status', '-created_at'], name='animal_shelter_status_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0 on 2026-10-18 16:25
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_donation_totals(apps, schema_editor):
+    Shelter = apps.get_model('animals', 'Shelter')
+    Donation = apps.get_model('animals', 'Donation')
+    db_alias = schema_editor.connection.alias
+    totals = (
+        Donation.objects.using(db_alias).filter(status__in=['confirmed', 'delivered'])
+        .order_by()
+        .values('shelter')
+        .annotate(count=Count('id'), total=Sum('amount'))
+    )
+    for row in totals:
+        Shelter.objects.using(db_alias).filter(pk=row['shelter']).update(
+            donations_count=row['count'], donations_total=row['total'] or 0
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0011_bookanimal_shelter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shelter',
+            name='donations_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Tasdiqlangan xayriyalar'),
+        ),
+        migrations.AddField(
+            model_name='shelter',
+            name='donations_total',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14, verbose_name='Xayriyalar summasi'),
+        ),
+        migrations.RunPython(fill_donation_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0 on 2026-10-18 17:50
+
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_rating_totals(apps, schema_editor):
+    Review = apps.get_model('animals', 'Review')
+    db_alias = schema_editor.connection.alias
+    for field, model_name in (('veterinarian', 'Veterinarian'), ('shelter', 'Shelter')):
+        model = apps.get_model('animals', model_name)
+        totals = (
+            Review.objects.using(db_alias).filter(**{f'{field}__isnull': False})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('id'), total=Sum('rating'))
+        )
+        for row in totals:
+            rating = (Decimal(row['total']) / row['count']).quantize(Decimal('0.1'), ROUND_HALF_UP)
+            model.objects.using(db_alias).filter(pk=row[field]).update(
+                review_count=row['count'], rating_sum=row['total'], rating=rating
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0012_shelter_donation_totals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shelter',
+            name='rating_sum',
+            field=models.IntegerField(default=0, editable=False, verbose_name="Baholar yig'indisi"),
+        ),
+        migrations.AddField(
+            model_name='shelter',
+            name='review_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Sharhlar soni'),
+        ),
+        migrations.AddField(
+            model_name='veterinarian',
+            name='rating_sum',
+            field=models.IntegerField(default=0, editable=False, verbose_name="Baholar yig'indisi"),
+        ),
+        migrations.AddField(
+            model_name='veterinarian',
+            name='review_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Sharhlar soni'),
+        ),
+        migrations.RunPython(fill_rating_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0 on 2026-10-18 19:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0013_review_rating_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50, verbose_name='Turi')),
+                ('payload', models.JSONField(default=dict, verbose_name="Ma'lumotlar")),
+                ('status', models.CharField(choices=[('pending', 'Kutilmoqda'), ('running', 'Bajarilmoqda'), ('done', 'Bajarildi'), ('failed', 'Xato')], default='pending', max_length=10, verbose_name='Holati')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Urinishlar')),
+                ('max_attempts', models.PositiveIntegerField(default=3, verbose_name='Maksimal urinishlar')),
+                ('run_after', models.DateTimeField(verbose_name='Bajarish vaqti')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='Olingan vaqt')),
+                ('last_error', models.TextField(blank=True, verbose_name='Oxirgi xato')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqt')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Tugagan vaqt')),
+            ],
+            options={
+                'verbose_name': 'Fon vazifasi',
+                'verbose_name_plural': 'Fon vazifalari',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'run_after', 'id'], name='job_queue_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PendingUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target', models.CharField(choices=[('main', 'Asosiy rasm'), ('gallery', "Qo'shimcha rasm")], max_length=10, verbose_name='Maqsad')),
+                ('file', models.FileField(upload_to='uploads/pending/', verbose_name='Fayl')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqt')),
+                ('animal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_uploads', to='animals.bookanimal', verbose_name='Hayvon')),
+            ],
+            options={
+                'verbose_name': 'Qayta ishlanayotgan rasm',
+                'verbose_name_plural': 'Qayta ishlanayotgan rasmlar',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-18 20:10
+
+import animals.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0014_job_pendingupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Fayl nomi')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='Hajmi (bayt)')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='Havolalar soni')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqt')),
+            ],
+            options={
+                'verbose_name': 'Media fayl',
+                'verbose_name_plural': 'Media fayllar',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='animalimage',
+            name='image',
+            field=models.ImageField(storage=animals.storage.ContentAddressedStorage(), upload_to='animal_gallery/', verbose_name='Rasm'),
+        ),
+        migrations.AlterField(
+            model_name='bookanimal',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=animals.storage.ContentAddressedStorage(), upload_to='animal_images/', verbose_name='Rasm'),
+        ),
+        migrations.AlterField(
+            model_name='shelter',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=animals.storage.ContentAddressedStorage(), upload_to='shelter_images/', verbose_name='Rasm'),
+        ),
+        migrations.AlterField(
+            model_name='veterinarian',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=animals.storage.ContentAddressedStorage(), upload_to='veterinarian_images/', verbose_name='Rasm'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 21:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0015_mediablob_content_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookanimal',
+            name='external_id',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True, verbose_name='Reyestr ID'),
+        ),
+        migrations.AddField(
+            model_name='shelter',
+            name='external_id',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True, verbose_name='Reyestr ID'),
+        ),
+        migrations.AddField(
+            model_name='veterinarian',
+            name='external_id',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True, verbose_name='Reyestr ID'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0016_external_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='shelter',
+            name='current_animals',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Joriy hayvonlar soni'),
+        ),
+    ]
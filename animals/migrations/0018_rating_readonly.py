@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-18 22:20
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0017_shelter_current_animals_readonly'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='shelter',
+            name='rating',
+            field=models.DecimalField(decimal_places=1, default=0, editable=False, max_digits=3, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(5)], verbose_name='Reyting'),
+        ),
+        migrations.AlterField(
+            model_name='veterinarian',
+            name='rating',
+            field=models.DecimalField(decimal_places=1, default=0, editable=False, max_digits=3, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(5)], verbose_name='Reyting'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-18 22:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0018_rating_readonly'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookAnimalSearch',
+            fields=[
+                ('animal', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='animals.bookanimal')),
+                ('document', models.TextField(db_column='animals_bookanimal_fts')),
+            ],
+            options={
+                'db_table': 'animals_bookanimal_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -2,6 +2,42 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from users.models import CustomUser as User
 
+from .storage import ContentAddressedStorage
+
+# Rasmlar kontent xeshi bo'yicha bir marta saqlanadi (animals/storage.py)
+content_storage = ContentAddressedStorage()
+
+
+class CounterFieldsMixin:
+    """Signal'lar F() bilan yuritadigan hisoblagichlar (animals/stats.py) oddiy save() da yozilmaydi.
+
+    Xotiradagi obyekt eskirgan bo'lishi mumkin: uni to'liq saqlash bazadagi
+    hisoblagichlarni eski qiymat bilan almashtirib yuboradi. Shuning uchun
+    mavjud qatorni saqlashda update_fields dan COUNTER_FIELDS chiqarib tashlanadi.
+    update_fields aniq berilsa, u o'zgartirilmaydi.
+    """
+    COUNTER_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        updating = (
+            not self._state.adding
+            and self.pk is not None
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+            and kwargs.get('using', self._state.db) == self._state.db
+        )
+        if updating:
+            # Django dagidek: kechiktirilgan (deferred) ustunlar ham yozilmaydi
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
 class BookAnimal(models.Model):
     ANIMAL_TYPES = [
         ('dog', 'Kuchuk'),
@@ -28,6 +64,9 @@ class BookAnimal(models.Model):
         ('reserved', 'Band qilingan'),
     ]
     
+    # Boshpanada hali turgan hayvonlar (Shelter.current_animals hisobiga kiradi)
+    IN_SHELTER_STATUSES = ('available', 'pending', 'reserved')
+    
     name = models.CharField(max_length=100, verbose_name="Nomi")
     animal_type = models.CharField(max_length=50, choices=ANIMAL_TYPES, verbose_name="Hayvon turi")
     breed = models.CharField(max_length=100, blank=True, null=True, verbose_name="Zoti")
@@ -36,13 +75,20 @@ class BookAnimal(models.Model):
     description = models.TextField(blank=True, null=True, verbose_name="Tarif")
     location = models.CharField(max_length=200, verbose_name="Manzil")
     user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="Foydalanuvchi")
+    # Alohida indeks kerak emas: animal_shelter_status_idx shelter bilan boshlanadi
+    shelter = models.ForeignKey('Shelter', on_delete=models.SET_NULL, blank=True, null=True,
+                                related_name='animals', db_index=False, verbose_name="Boshpana")
     is_for_sale = models.BooleanField(default=False, verbose_name="Sotiladi")
     price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True, verbose_name="Narxi")
-    image = models.ImageField(upload_to='animal_images/', blank=True, null=True, verbose_name="Rasm")
+    image = models.ImageField(upload_to='animal_images/', storage=content_storage,
+                              blank=True, null=True, verbose_name="Rasm")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='available', verbose_name="Holati")
     vaccinated = models.BooleanField(default=False, verbose_name="Emlangan")
     sterilized = models.BooleanField(default=False, verbose_name="Sterilizatsiya qilingan")
     phone_number = models.CharField(max_length=20, blank=True, null=True, verbose_name="Telefon raqam")
+    # Tashqi reyestrdagi identifikator: `manage.py import_directory` shu bo'yicha yangilaydi
+    external_id = models.CharField(max_length=64, unique=True, blank=True, null=True, editable=False,
+                                   verbose_name="Reyestr ID")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Yaratilgan vaqt")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Yangilangan vaqt")
     
@@ -53,6 +99,16 @@ class BookAnimal(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Hayvon'
         verbose_name_plural = 'Hayvonlar'
+        indexes = [
+            # Ochiq ro'yxatlar: status='available' + (tur | sotuv) + -created_at
+            models.Index(fields=['status', '-created_at'], name='animal_status_created_idx'),
+            models.Index(fields=['status', 'animal_type', '-created_at'], name='animal_status_type_idx'),
+            models.Index(fields=['status', 'is_for_sale', '-created_at'], name='animal_status_sale_idx'),
+            # "Mening hayvonlarim"
+            models.Index(fields=['user', '-created_at'], name='animal_user_created_idx'),
+            # Boshpana sahifasi: shelter + status + -created_at
+            models.Index(fields=['shelter', 'status', '-created_at'], name='animal_shelter_status_idx'),
+        ]
     
     def get_status_color(self):
         colors = {
@@ -63,9 +119,12 @@ class BookAnimal(models.Model):
             'reserved': 'secondary'
         }
         return colors.get(self.status, 'secondary')
+    
+    def is_in_shelter(self):
+        return self.shelter_id is not None and self.status in self.IN_SHELTER_STATUSES
 
 
-class Shelter(models.Model):
+class Shelter(CounterFieldsMixin, models.Model):
     SHELTER_TYPES = [
         ('state', 'Davlat'),
         ('private', 'Xususiy'),
@@ -73,6 +132,9 @@ class Shelter(models.Model):
         ('international', 'Xalqaro'),
     ]
     
+    COUNTER_FIELDS = ('current_animals', 'donations_count', 'donations_total',
+                      'rating', 'review_count', 'rating_sum')
+    
     name = models.CharField(max_length=200, verbose_name="Boshpana nomi")
     shelter_type = models.CharField(max_length=50, choices=SHELTER_TYPES, verbose_name="Boshpana turi")
     description = models.TextField(verbose_name="Tarif")
@@ -81,15 +143,28 @@ class Shelter(models.Model):
     email = models.EmailField(blank=True, null=True, verbose_name="Email")
     website = models.URLField(blank=True, null=True, verbose_name="Veb-sayt")
     capacity = models.IntegerField(verbose_name="Sig'imi")
-    current_animals = models.IntegerField(default=0, verbose_name="Joriy hayvonlar soni")
+    # Boshpanadagi hayvonlar (animals/stats.py, signal'lar orqali F() bilan)
+    current_animals = models.IntegerField(default=0, editable=False, verbose_name="Joriy hayvonlar soni")
+    # Tasdiqlangan xayriyalar yig'indisi (animals/stats.py, signal'lar orqali F() bilan)
+    donations_count = models.IntegerField(default=0, editable=False,
+                                          verbose_name="Tasdiqlangan xayriyalar")
+    donations_total = models.DecimalField(max_digits=14, decimal_places=2, default=0, editable=False,
+                                          verbose_name="Xayriyalar summasi")
     director = models.CharField(max_length=100, verbose_name="Rahbar")
     founded_date = models.DateField(blank=True, null=True, verbose_name="Tashkil etilgan sana")
-    image = models.ImageField(upload_to='shelter_images/', blank=True, null=True, verbose_name="Rasm")
+    image = models.ImageField(upload_to='shelter_images/', storage=content_storage,
+                              blank=True, null=True, verbose_name="Rasm")
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Kenglik")
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Uzunlik")
     is_active = models.BooleanField(default=True, verbose_name="Faol")
-    rating = models.DecimalField(max_digits=3, decimal_places=1, default=0, 
+    # Sharhlar yig'indisi: rating = rating_sum / review_count (animals/stats.py)
+    rating = models.DecimalField(max_digits=3, decimal_places=1, default=0, editable=False,
                                  validators=[MinValueValidator(0), MaxValueValidator(5)], verbose_name="Reyting")
+    review_count = models.IntegerField(default=0, editable=False, verbose_name="Sharhlar soni")
+    rating_sum = models.IntegerField(default=0, editable=False, verbose_name="Baholar yig'indisi")
+    # Tashqi reyestrdagi identifikator: `manage.py import_directory` shu bo'yicha yangilaydi
+    external_id = models.CharField(max_length=64, unique=True, blank=True, null=True, editable=False,
+                                   verbose_name="Reyestr ID")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Yaratilgan vaqt")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Yangilangan vaqt")
     
@@ -100,6 +175,10 @@ class Shelter(models.Model):
         ordering = ['name']
         verbose_name = 'Boshpana'
         verbose_name_plural = 'Boshpanalar'
+        indexes = [
+            # "Yaqin atrofdagi boshpanalar" (animals/geo.py, bounding box)
+            models.Index(fields=['latitude', 'longitude'], name='shelter_location_idx'),
+        ]
     
     def available_space(self):
         return self.capacity - self.current_animals
@@ -110,7 +189,7 @@ class Shelter(models.Model):
         return round((self.current_animals / self.capacity) * 100, 2)
 
 
-class Veterinarian(models.Model):
+class Veterinarian(CounterFieldsMixin, models.Model):
     CLINIC_TYPES = [
         ('clinic', 'Klinika'),
         ('hospital', 'Shifoxona'),
@@ -127,8 +206,14 @@ class Veterinarian(models.Model):
         ('emergency', 'Shoshilinch yordam'),
         ('vaccination', 'Emlash'),
         ('grooming', 'Grooming'),
+        ('radiology', 'Rentgenologiya'),
+        ('laboratory', 'Laboratoriya tekshiruvlari'),
+        ('boarding', 'Qarovxona'),
+        ('training', 'Mashq qilish'),
     ]
     
+    COUNTER_FIELDS = ('rating', 'review_count', 'rating_sum')
+    
     name = models.CharField(max_length=200, verbose_name="Nomi")
     clinic_type = models.CharField(max_length=50, choices=CLINIC_TYPES, verbose_name="Klinika turi")
     description = models.TextField(verbose_name="Tarif")
@@ -140,12 +225,19 @@ class Veterinarian(models.Model):
     working_hours = models.CharField(max_length=100, verbose_name="Ish soatlari")
     director = models.CharField(max_length=100, verbose_name="Rahbar")
     doctors_count = models.IntegerField(default=1, verbose_name="Shifokorlar soni")
-    image = models.ImageField(upload_to='veterinarian_images/', blank=True, null=True, verbose_name="Rasm")
+    image = models.ImageField(upload_to='veterinarian_images/', storage=content_storage,
+                              blank=True, null=True, verbose_name="Rasm")
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Kenglik")
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Uzunlik")
     is_emergency = models.BooleanField(default=False, verbose_name="Shoshilinch xizmat")
-    rating = models.DecimalField(max_digits=3, decimal_places=1, default=0,
+    # Sharhlar yig'indisi: rating = rating_sum / review_count (animals/stats.py)
+    rating = models.DecimalField(max_digits=3, decimal_places=1, default=0, editable=False,
                                  validators=[MinValueValidator(0), MaxValueValidator(5)], verbose_name="Reyting")
+    review_count = models.IntegerField(default=0, editable=False, verbose_name="Sharhlar soni")
+    rating_sum = models.IntegerField(default=0, editable=False, verbose_name="Baholar yig'indisi")
+    # Tashqi reyestrdagi identifikator: `manage.py import_directory` shu bo'yicha yangilaydi
+    external_id = models.CharField(max_length=64, unique=True, blank=True, null=True, editable=False,
+                                   verbose_name="Reyestr ID")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Yaratilgan vaqt")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Yangilangan vaqt")
     
@@ -160,10 +252,99 @@ class Veterinarian(models.Model):
     def get_services_list(self):
         return self.services.split(',') if self.services else []
     
-    def is_open_now(self):
-        # Bu yerda haqiqiy vaqtni tekshirish logikasi bo'lishi kerak
-        # Oddiylik uchun doim ochiq deb qaytaramiz
-        return True
+    def get_service_codes(self):
+        """services maydonidagi ma'lum xizmat kodlari (takrorlanmasdan)"""
+        known = dict(self.SERVICES)
+        codes = []
+        for code in self.get_services_list():
+            code = code.strip()
+            if code in known and code not in codes:
+                codes.append(code)
+        return codes
+    
+    def sync_service_links(self):
+        """VeterinarianService jadvalini services maydoniga moslashtirish"""
+        codes = set(self.get_service_codes())
+        existing = set(self.service_links.values_list('service', flat=True))
+        if existing - codes:
+            self.service_links.filter(service__in=existing - codes).delete()
+        if codes - existing:
+            VeterinarianService.objects.bulk_create([
+                VeterinarianService(veterinarian=self, service=code)
+                for code in codes - existing
+            ])
+    
+    def get_services_display(self):
+        """Xizmatlar ro'yxati [{'code': ..., 'name': ...}] SERVICES tartibida"""
+        codes = {link.service for link in self.service_links.all()}
+        return [
+            {'code': code, 'name': name}
+            for code, name in self.SERVICES
+            if code in codes
+        ]
+    
+    def is_open_now(self, moment=None):
+        """Klinika hozir (yoki moment vaqtida) ochiqmi - opening_intervals bo'yicha"""
+        from .schedule import minute_of_week
+        minute = minute_of_week(moment)
+        return any(
+            interval.start_minute <= minute < interval.end_minute
+            for interval in self.opening_intervals.all()
+        )
+    
+    def sync_opening_intervals(self):
+        """OpeningInterval jadvalini working_hours matniga moslashtirish"""
+        from .schedule import parse_working_hours
+        intervals = set(parse_working_hours(self.working_hours))
+        existing = set(self.opening_intervals.values_list('start_minute', 'end_minute'))
+        if intervals == existing:
+            return
+        self.opening_intervals.all().delete()
+        OpeningInterval.objects.bulk_create([
+            OpeningInterval(veterinarian=self, start_minute=start, end_minute=end)
+            for start, end in sorted(intervals)
+        ])
+
+
+class VeterinarianService(models.Model):
+    """Veterinariya xizmatlari (indekslangan), services maydonidan sinxronlanadi"""
+    veterinarian = models.ForeignKey(Veterinarian, on_delete=models.CASCADE, related_name='service_links',
+                                     verbose_name="Veterinariya")
+    service = models.CharField(max_length=30, choices=Veterinarian.SERVICES, verbose_name="Xizmat")
+    
+    class Meta:
+        verbose_name = 'Veterinariya xizmati'
+        verbose_name_plural = 'Veterinariya xizmatlari'
+        constraints = [
+            models.UniqueConstraint(fields=['veterinarian', 'service'], name='unique_veterinarian_service'),
+        ]
+        indexes = [
+            # Xizmat bo'yicha filtr: service = ? -> veterinarian_id
+            models.Index(fields=['service', 'veterinarian'], name='vet_service_lookup_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.veterinarian.name} - {self.get_service_display()}"
+
+
+class OpeningInterval(models.Model):
+    """Klinika ish vaqti: haftaning daqiqalaridagi [start, end) oraliq (animals/schedule.py)"""
+    veterinarian = models.ForeignKey(Veterinarian, on_delete=models.CASCADE, related_name='opening_intervals',
+                                     verbose_name="Veterinariya")
+    start_minute = models.PositiveIntegerField(verbose_name="Boshlanish (hafta daqiqasi)")
+    end_minute = models.PositiveIntegerField(verbose_name="Tugash (hafta daqiqasi)")
+    
+    class Meta:
+        ordering = ['veterinarian', 'start_minute']
+        verbose_name = 'Ish vaqti oralig\'i'
+        verbose_name_plural = 'Ish vaqti oraliqlari'
+        indexes = [
+            # "Hozir ochiq": start_minute <= ? AND end_minute > ?
+            models.Index(fields=['start_minute', 'end_minute', 'veterinarian'], name='opening_interval_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.veterinarian.name}: {self.start_minute}-{self.end_minute}"
 
 
 class Donation(models.Model):
@@ -224,7 +405,7 @@ class Donation(models.Model):
 class AnimalImage(models.Model):
     animal = models.ForeignKey(BookAnimal, on_delete=models.CASCADE, related_name='images', 
                                verbose_name="Hayvon")
-    image = models.ImageField(upload_to='animal_gallery/', verbose_name="Rasm")
+    image = models.ImageField(upload_to='animal_gallery/', storage=content_storage, verbose_name="Rasm")
     is_main = models.BooleanField(default=False, verbose_name="Asosiy rasm")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Yaratilgan vaqt")
     
@@ -317,3 +498,124 @@ class ContactMessage(models.Model):
     email = models.EmailField()
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+
+
+class SiteStats(models.Model):
+    """Sayt statistikasi (bitta qator, pk=1).
+
+    Signal'lar orqali o'sib boruvchi tarzda yangilanadi (animals/stats.py),
+    bulk_create/update dan keyin `manage.py reconcile_site_stats` bilan qayta hisoblanadi.
+    """
+    SINGLETON_PK = 1
+
+    available_animals = models.IntegerField(default=0, verbose_name="Mavjud hayvonlar")
+    free_animals = models.IntegerField(default=0, verbose_name="Bepul hayvonlar")
+    paid_animals = models.IntegerField(default=0, verbose_name="Pulli hayvonlar")
+    dogs_count = models.IntegerField(default=0, verbose_name="Kuchuklar")
+    cats_count = models.IntegerField(default=0, verbose_name="Mushuklar")
+    other_animals = models.IntegerField(default=0, verbose_name="Boshqa hayvonlar")
+    active_shelters = models.IntegerField(default=0, verbose_name="Faol boshpanalar")
+    veterinarians_count = models.IntegerField(default=0, verbose_name="Veterinariyalar")
+    confirmed_donations = models.IntegerField(default=0, verbose_name="Tasdiqlangan xayriyalar")
+    donations_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0,
+                                           verbose_name="Xayriyalar summasi")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Yangilangan vaqt")
+
+    class Meta:
+        verbose_name = 'Sayt statistikasi'
+        verbose_name_plural = 'Sayt statistikasi'
+
+    def __str__(self):
+        return f"Sayt statistikasi ({self.updated_at:%d.%m.%Y %H:%M})"
+
+    @classmethod
+    def load(cls):
+        """Statistika qatorini olish; yo'q bo'lsa noldan hisoblab yaratish"""
+        try:
+            return cls.objects.get(pk=cls.SINGLETON_PK)
+        except cls.DoesNotExist:
+            from .stats import reconcile_site_stats
+            return reconcile_site_stats()
+
+
+class Job(models.Model):
+    """Fon vazifalari navbati (animals/jobs.py, `manage.py run_jobs`)"""
+    STATUS_CHOICES = [
+        ('pending', 'Kutilmoqda'),
+        ('running', 'Bajarilmoqda'),
+        ('done', 'Bajarildi'),
+        ('failed', 'Xato'),
+    ]
+
+    kind = models.CharField(max_length=50, verbose_name="Turi")
+    payload = models.JSONField(default=dict, verbose_name="Ma'lumotlar")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name="Holati")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Urinishlar")
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name="Maksimal urinishlar")
+    run_after = models.DateTimeField(verbose_name="Bajarish vaqti")
+    locked_at = models.DateTimeField(blank=True, null=True, verbose_name="Olingan vaqt")
+    last_error = models.TextField(blank=True, verbose_name="Oxirgi xato")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Yaratilgan vaqt")
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name="Tugagan vaqt")
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Fon vazifasi'
+        verbose_name_plural = 'Fon vazifalari'
+        indexes = [
+            # Worker navbatdagi vazifani shu indeks bo'yicha oladi
+            models.Index(fields=['status', 'run_after', 'id'], name='job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.get_status_display()})"
+
+
+class PendingUpload(models.Model):
+    """Hali qayta ishlanmagan yuklangan rasm (worker BookAnimal/AnimalImage ga o'tkazadi)"""
+    TARGET_CHOICES = [
+        ('main', 'Asosiy rasm'),
+        ('gallery', "Qo'shimcha rasm"),
+    ]
+
+    animal = models.ForeignKey(BookAnimal, on_delete=models.CASCADE, related_name='pending_uploads',
+                               verbose_name="Hayvon")
+    target = models.CharField(max_length=10, choices=TARGET_CHOICES, verbose_name="Maqsad")
+    file = models.FileField(upload_to='uploads/pending/', verbose_name="Fayl")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Yaratilgan vaqt")
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Qayta ishlanayotgan rasm'
+        verbose_name_plural = 'Qayta ishlanayotgan rasmlar'
+
+    def __str__(self):
+        return f"{self.animal_id} - {self.get_target_display()}"
+
+
+class MediaBlob(models.Model):
+    """Kontent bo'yicha saqlangan fayl va unga havolalar soni (animals/blobs.py)"""
+    name = models.CharField(max_length=255, unique=True, verbose_name="Fayl nomi")
+    size = models.PositiveBigIntegerField(default=0, verbose_name="Hajmi (bayt)")
+    ref_count = models.PositiveIntegerField(default=0, verbose_name="Havolalar soni")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Yaratilgan vaqt")
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Media fayl'
+        verbose_name_plural = 'Media fayllar'
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
+
+
+class BookAnimalSearch(models.Model):
+    """FTS5 indeksi (animals/search.py) - faqat JOIN uchun, jadvalni migratsiya 0005 yaratadi"""
+    animal = models.OneToOneField(BookAnimal, on_delete=models.DO_NOTHING, primary_key=True,
+                                  db_column='rowid', db_constraint=False, related_name='search_entry')
+    # FTS5 ning jadval nomidagi yashirin ustuni: MATCH va bm25() uchun
+    document = models.TextField(db_column='animals_bookanimal_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'animals_bookanimal_fts'
@@ -0,0 +1,138 @@
+# animals/pagination.py
+"""
+Kursor (keyset) pagination.
+
+Paginator dan farqli ravishda COUNT(*) va OFFSET ishlatilmaydi: keyingi sahifa
+oxirgi ko'rsatilgan yozuvning (created_at, id) kaliti bo'yicha olinadi, shuning
+uchun 500-sahifa ham 1-sahifa kabi tez ishlaydi.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+
+NEXT = 'n'
+PREVIOUS = 'p'
+# Bo'sh kursor - birinchi sahifa (get_page uni kursorsiz so'rov kabi o'qiydi)
+FIRST = ''
+
+# Kursordagi id BigAutoField oralig'idan chiqmasligi kerak
+MAX_ID = 2 ** 63 - 1
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(obj, direction):
+    payload = {'c': obj.created_at.isoformat(), 'i': obj.pk, 'd': direction}
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(payload['c'])
+        pk = int(payload['i'])
+        direction = payload['d']
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursor(token)
+    # USE_TZ da encode_cursor har doim vaqt zonasi bilan yozadi - boshqasi qo'lda o'zgartirilgan
+    naive = settings.USE_TZ and created_at.tzinfo is None
+    if direction not in (NEXT, PREVIOUS) or naive or not 0 < pk <= MAX_ID:
+        raise InvalidCursor(token)
+    return created_at, pk, direction
+
+
+class CursorPage:
+    """Bitta sahifa: Paginator.Page ga o'xshash, lekin sahifa raqamlarisiz"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Querysetni (-created_at, -id) tartibida kursor bo'yicha sahifalash"""
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+
+    def get_page(self, cursor=None):
+        """Kursor bo'yicha sahifani qaytarish. Noto'g'ri kursor - birinchi sahifa"""
+        if cursor:
+            try:
+                created_at, pk, direction = decode_cursor(cursor)
+            except InvalidCursor:
+                return self._first_page()
+            if direction == PREVIOUS:
+                return self._page_before(created_at, pk)
+            return self._page_after(created_at, pk)
+        return self._first_page()
+
+    def _first_page(self):
+        rows = list(self.queryset.order_by('-created_at', '-id')[:self.per_page + 1])
+        return self._build(rows, has_more_after=len(rows) > self.per_page, has_more_before=False)
+
+    def _page_after(self, created_at, pk):
+        rows = list(
+            self.queryset
+            .filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+            .order_by('-created_at', '-id')[:self.per_page + 1]
+        )
+        return self._build(rows, has_more_after=len(rows) > self.per_page, has_more_before=True)
+
+    def _page_before(self, created_at, pk):
+        rows = list(
+            self.queryset
+            .filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+            .order_by('created_at', 'id')[:self.per_page + 1]
+        )
+        has_more_before = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        rows.reverse()
+        return self._build(rows, has_more_after=True, has_more_before=has_more_before)
+
+    def _build(self, rows, has_more_after, has_more_before):
+        rows = rows[:self.per_page]
+        if not rows:
+            # Kursor oxirdan o'tib ketgan (yozuvlar o'chirilgan) - boshiga qaytish havolasi
+            return CursorPage([], previous_cursor=FIRST if has_more_before else None)
+        return CursorPage(
+            rows,
+            next_cursor=encode_cursor(rows[-1], NEXT) if has_more_after else None,
+            previous_cursor=encode_cursor(rows[0], PREVIOUS) if has_more_before else None,
+        )
+
+
+def pagination_query(request):
+    """Sahifa havolalari uchun joriy filtrlar (cursor va page dan tashqari)"""
+    params = request.GET.copy()
+    params.pop('cursor', None)
+    params.pop('page', None)
+    return params.urlencode()
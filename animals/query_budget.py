@@ -0,0 +1,110 @@
+# animals/query_budget.py
+"""
+View'lar uchun SQL so'rovlar byudjeti.
+
+    @query_budget(6)
+    def shelter_detail_view(request, pk):
+        ...
+
+Byudjet butun so'rov uchun hisoblanadi (sessiya va foydalanuvchi so'rovlari
+ham kiradi) va faqat GET/HEAD so'rovlarida tekshiriladi. DEBUG rejimida
+QueryBudgetMiddleware byudjetdan oshgan so'rovni logga yozadi, settings'da
+QUERY_BUDGET_RAISE = True bo'lsa QueryBudgetExceeded xatosini beradi.
+animals/tests.py har bir URL ni byudjet bo'yicha tekshiradi.
+"""
+import logging
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+BUDGET_METHODS = ('GET', 'HEAD')
+
+
+class QueryBudgetExceeded(Exception):
+    """So'rovlar soni view byudjetidan oshdi"""
+
+
+def query_budget(max_queries):
+    """View uchun maksimal so'rovlar sonini belgilash.
+
+    login_required kabi dekoratorlar functools.wraps ishlatgani uchun
+    atribut tashqi funksiyaga ham ko'chadi.
+    """
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+def get_query_budget(view_func):
+    return getattr(view_func, 'query_budget', None)
+
+
+class QueryCounter:
+    """Barcha bazalarda bajarilgan so'rovlarni sanash (DEBUG shart emas)"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __len__(self):
+        return len(self.queries)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def capture(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+
+def budget_report(path, counter, budget):
+    lines = [f"{path}: {len(counter)} ta so'rov (byudjet: {budget})"]
+    lines.extend(f'  {i}. {sql}' for i, sql in enumerate(counter.queries, 1))
+    return '\n'.join(lines)
+
+
+class QueryBudgetMiddleware:
+    """DEBUG rejimida view byudjetidan oshgan so'rovlarni aniqlash.
+
+    MIDDLEWARE ro'yxatining boshida turishi kerak - shunda sessiya va
+    autentifikatsiya so'rovlari ham hisobga olinadi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            # ASGI: ORM so'rovlari boshqa thread'dagi ulanishlarda bajariladi va
+            # bu yerdan sanalmaydi - byudjetlar WSGI yo'lida (testlarda) tekshiriladi
+            return self.get_response(request)
+        if not settings.DEBUG or request.method not in BUDGET_METHODS:
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        with counter.capture():
+            response = self.get_response(request)
+
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and len(counter) > budget:
+            report = budget_report(request.path, counter, budget)
+            if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+                raise QueryBudgetExceeded(report)
+            logger.warning(report)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func)
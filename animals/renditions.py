@@ -0,0 +1,159 @@
+# animals/renditions.py
+"""
+Yuklangan rasmlar uchun kichraytirilgan nusxalar (renditions).
+
+Har bir asl rasm yonida belgilangan o'lchamdagi JPEG va WebP nusxalar saqlanadi:
+
+    animal_images/rex.jpg
+    animal_images/rex.400x300.jpg
+    animal_images/rex.400x300.webp
+    animal_images/rex.800x600.jpg
+    animal_images/rex.800x600.webp
+
+Nusxalar rasm yuklangan tranzaksiya commit bo'lgandan keyin yaratiladi
+(animals/signals.py), mavjud media uchun - `manage.py generate_renditions`.
+Shablonlarda {% picture %} tegi (animals/templatetags/renditions.py) srcset bilan
+<picture> chiqaradi; nusxa hali yo'q bo'lsa asl rasm ishlatiladi.
+
+Nusxalar bor-yo'qligi umumiy keshda (animals/caching.py dagi alias) qisqa
+muddat saqlanadi - barcha worker'lar uchun bitta. Blob o'chirilganda kalit
+ham o'chiriladi (animals/blobs.py), aks holda xuddi shu kontent qayta
+yuklanganda yo'q fayllarga srcset chiqib qolardi.
+"""
+import hashlib
+import io
+import logging
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import caching
+
+logger = logging.getLogger(__name__)
+
+# Ro'yxat kartalari 4:3; ikkinchi o'lcham - retina ekranlar uchun
+SIZES = ((400, 300), (800, 600))
+FORMATS = {
+    'jpg': ('JPEG', {'quality': 80, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', {'quality': 75, 'method': 4}),
+}
+
+# Rasmli modellar va maydonlari
+IMAGE_FIELDS = {
+    'bookanimal': ('image',),
+    'animalimage': ('image',),
+    'shelter': ('image',),
+    'veterinarian': ('image',),
+}
+
+READY_KEY_PREFIX = 'renditions:'
+DEFAULT_READY_TIMEOUT = 60
+
+
+def rendition_name(name, size, ext):
+    """'animal_images/rex.jpg' -> 'animal_images/rex.400x300.webp'"""
+    root, _ext = posixpath.splitext(name)
+    width, height = size
+    return f'{root}.{width}x{height}.{ext}'
+
+
+def rendition_names(name):
+    return [rendition_name(name, size, ext) for size in SIZES for ext in FORMATS]
+
+
+def is_rendition(name):
+    root, _ext = posixpath.splitext(name)
+    suffix = posixpath.splitext(root)[1].lstrip('.')
+    return any(suffix == f'{w}x{h}' for w, h in SIZES)
+
+
+def _ready_key(name):
+    return READY_KEY_PREFIX + hashlib.md5(name.encode()).hexdigest()
+
+
+def ready_timeout():
+    """Keshdagi "nusxalar bor/yo'q" natijasi necha soniya ishoniladi"""
+    return getattr(settings, 'RENDITIONS_READY_TIMEOUT', DEFAULT_READY_TIMEOUT)
+
+
+def _stored(fieldfile):
+    # generate() nusxalarni tartib bilan yozadi - oxirgisi bor bo'lsa, hammasi bor
+    return fieldfile.storage.exists(rendition_names(fieldfile.name)[-1])
+
+
+def forget(name):
+    """Nusxalar o'chirildi - keshdagi natija barcha worker'lar uchun bekor"""
+    caching.get_cache().delete(_ready_key(name))
+
+
+def has_renditions(fieldfile):
+    """Rasmning barcha nusxalari saqlanganmi"""
+    if not fieldfile:
+        return False
+    cache = caching.get_cache()
+    key = _ready_key(fieldfile.name)
+    ready = cache.get(key)
+    if ready is None:
+        ready = _stored(fieldfile)
+        cache.set(key, ready, ready_timeout())
+    return ready
+
+
+def _encode(image, fmt):
+    pil_format, options = FORMATS[fmt]
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def generate(fieldfile, force=False):
+    """Rasm uchun barcha nusxalarni yaratish. Yaratilgan nusxalar soni qaytadi."""
+    if not fieldfile or is_rendition(fieldfile.name):
+        return 0
+    storage = fieldfile.storage
+    name = fieldfile.name
+    # Keshga emas, faylning o'ziga qaraladi
+    if not force and _stored(fieldfile):
+        return 0
+
+    try:
+        with storage.open(name, 'rb') as source:
+            image = Image.open(source)
+            image = ImageOps.exif_transpose(image)
+            image = image.convert('RGB')
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as exc:
+        logger.warning("Rasmni o'qib bo'lmadi: %s (%s)", name, exc)
+        return 0
+
+    created = 0
+    for size in SIZES:
+        # Kichik rasm kattalashtirilmaydi - faqat 4:3 ga kesiladi
+        scale = min(1, image.width / size[0], image.height / size[1])
+        target_size = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+        # Markazdan biroz yuqoriroq kesiladi - hayvonning boshi odatda yuqorida
+        resized = ImageOps.fit(image, target_size, Image.Resampling.LANCZOS, centering=(0.5, 0.4))
+        for ext in FORMATS:
+            target = rendition_name(name, size, ext)
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(_encode(resized, ext)))
+            created += 1
+    caching.get_cache().set(_ready_key(name), True, ready_timeout())
+    return created
+
+
+def srcset(fieldfile, ext):
+    """'.../rex.400x300.webp 400w, .../rex.800x600.webp 800w'"""
+    storage = fieldfile.storage
+    return ', '.join(
+        f'{storage.url(rendition_name(fieldfile.name, size, ext))} {size[0]}w'
+        for size in SIZES
+    )
+
+
+def image_fields(instance):
+    """Obyektning rasm maydonlari (FieldFile lar)"""
+    names = IMAGE_FIELDS.get(instance._meta.model_name, ())
+    return [getattr(instance, field) for field in names]
@@ -0,0 +1,138 @@
+# animals/routers.py
+"""
+O'qish/yozish bo'yicha bazalarni ajratish (read replica).
+
+settings'da 'replica' bazasi bo'lsa, ro'yxat va detail sahifalarining GET
+so'rovlari o'qishni replikadan bajaradi:
+
+    @query_budget(4)
+    @read_replica
+    def animals_list_view(request):
+        ...
+
+Yozish har doim 'default' (asosiy baza) ga ketadi. Replika asosiy bazadan
+biroz orqada qoladi, shuning uchun "o'z yozganini ko'rish" kafolati:
+POST/PUT/PATCH/DELETE dan keyin PrimaryPinMiddleware brauzerga
+REPLICA_PIN_SECONDS muddatli cookie qo'yadi va shu muddat ichida o'sha
+brauzerning barcha so'rovlari asosiy bazadan o'qiydi. Sessiyalar ham har doim
+asosiy bazadan o'qiladi (login'dan keyin replika yetib kelmagan bo'lsa ham
+foydalanuvchi chiqib ketmaydi).
+
+Replika sozlanmagan bo'lsa (testlar, lokal ishlab chiqish) hamma narsa
+'default' dan o'qiladi. Lokal SQLite replika `manage.py sync_replica` bilan
+nusxalanadi.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_ALIAS = 'replica'
+PIN_COOKIE = 'db_primary'
+SAFE_METHODS = ('GET', 'HEAD')
+
+# Har doim asosiy bazadan o'qiladigan ilovalar
+PRIMARY_ONLY_APPS = {'sessions'}
+
+# Thread va asyncio task'lar uchun alohida qiymat
+_reading_from_replica = ContextVar('reading_from_replica', default=False)
+
+
+def replica_available():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def pin_seconds():
+    """Yozishdan keyin asosiy bazaga bog'lanish muddati (replika kechikishidan katta bo'lishi kerak)"""
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+
+
+def reading_from_replica():
+    return _reading_from_replica.get() and replica_available()
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """Blok ichidagi o'qishlarni replikaga yo'naltirish"""
+    token = _reading_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _reading_from_replica.reset(token)
+
+
+def is_pinned(request):
+    return PIN_COOKIE in request.COOKIES
+
+
+def read_replica(view_func):
+    """GET/HEAD so'rovida (brauzer asosiy bazaga bog'lanmagan bo'lsa) replikadan o'qish"""
+    if iscoroutinefunction(view_func):
+        # ContextVar sync_to_async orqali ORM thread'iga ham o'tadi
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            enabled = request.method in SAFE_METHODS and not is_pinned(request)
+            with use_replica(enabled):
+                return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        enabled = request.method in SAFE_METHODS and not is_pinned(request)
+        with use_replica(enabled):
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    """use_replica() ichida o'qish - replikadan, qolgan hamma narsa - asosiy bazadan"""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in PRIMARY_ONLY_APPS and reading_from_replica():
+            return REPLICA_ALIAS
+        # Aniq qaytaramiz: aks holda Django replikadan o'qilgan obyektning
+        # bazasini (instance._state.db) oladi
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replika - asosiy bazaning nusxasi
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_ALIAS}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replika sxemasi asosiy bazadan nusxalanadi
+        if db == REPLICA_ALIAS:
+            return False
+        return None
+
+
+class PrimaryPinMiddleware:
+    """Yozish so'rovidan keyin brauzerni vaqtincha asosiy bazaga bog'lash"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and replica_available():
+            response.set_cookie(PIN_COOKIE, '1', max_age=pin_seconds(), httponly=True,
+                                samesite='Lax', secure=request.is_secure())
+        return response
@@ -0,0 +1,139 @@
+# animals/schedule.py
+"""
+Ish vaqtini (Veterinarian.working_hours) haftalik jadvalga aylantirish.
+
+Jadval hafta boshidan (dushanba 00:00) hisoblangan daqiqalardagi
+[start, end) oraliqlar ro'yxati sifatida saqlanadi (0 <= start < end <= 10080).
+Shunda "hozir ochiq" filtri oddiy indekslangan oraliq so'rovi bo'ladi:
+    start_minute <= hozir < end_minute
+
+Tushuniladigan yozuvlar:
+    "09:00-18:00"                     - har kuni
+    "Du-Ju 9:00-18:00, Sha 10:00-15:00"
+    "Dushanba-Shanba: 8.00 - 20.00; Yakshanba: dam olish"
+    "22:00-06:00"                     - tungi smena (keyingi kunga o'tadi)
+    "24/7", "24 soat", "Doimiy"       - doim ochiq
+"""
+import re
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.utils import timezone
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Kun nomlari prefikslari (uzbekcha va inglizcha), 0 = dushanba
+DAY_PREFIXES = [
+    (('du', 'mon'), 0),
+    (('se', 'tue'), 1),
+    (('chor', 'cho', 'wed'), 2),
+    (('pay', 'thu'), 3),
+    (('ju', 'fri'), 4),
+    (('sha', 'sat'), 5),
+    (('yak', 'sun'), 6),
+]
+
+ALWAYS_OPEN_RE = re.compile(r"24\s*/\s*7|24\s*soat|doimiy|kecha[\s-]*kunduz|non[\s-]*stop")
+TIME_RANGE_RE = re.compile(r'(\d{1,2})(?:[:.](\d{2}))?\s*[-–—]\s*(\d{1,2})(?:[:.](\d{2}))?')
+DAY_WORD_RE = re.compile(r"[a-z']+")
+
+
+def _day_index(word):
+    word = word.replace("'", '')
+    for prefixes, index in DAY_PREFIXES:
+        if any(word.startswith(prefix) for prefix in prefixes):
+            return index
+    return None
+
+
+def _parse_days(text):
+    """Segmentdagi kunlar to'plami; kun ko'rsatilmagan bo'lsa - None"""
+    days = set()
+    words = [(m.start(), m.end(), _day_index(m.group())) for m in DAY_WORD_RE.finditer(text)]
+    words = [w for w in words if w[2] is not None]
+    i = 0
+    while i < len(words):
+        _start, end, first = words[i]
+        # "Du-Ju" ko'rinishidagi oraliq
+        if i + 1 < len(words) and re.fullmatch(r'\s*[-–—]\s*', text[end:words[i + 1][0]]):
+            last = words[i + 1][2]
+            day = first
+            while True:
+                days.add(day)
+                if day == last:
+                    break
+                day = (day + 1) % 7
+            i += 2
+        else:
+            days.add(first)
+            i += 1
+    return days or None
+
+
+def _merge(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def parse_working_hours(text):
+    """Ish vaqti matnini [(start_minute, end_minute), ...] ga aylantirish.
+
+    Tushunilmagan matn uchun bo'sh ro'yxat qaytadi.
+    """
+    text = (text or '').lower()
+    if ALWAYS_OPEN_RE.search(text):
+        return [(0, MINUTES_PER_WEEK)]
+
+    intervals = []
+    # Har bir vaqt oralig'i uchun kunlar undan oldingi matndan olinadi:
+    # "Du-Ju 9-18, Sha 10-15" -> "du-ju " va ", sha "
+    position = 0
+    for match in TIME_RANGE_RE.finditer(text):
+        prefix = text[position:match.start()]
+        position = match.end()
+        days = _parse_days(prefix)
+        if days is None:
+            days = range(7)
+
+        start_h, start_m, end_h, end_m = match.groups()
+        if int(start_m or 0) >= 60 or int(end_m or 0) >= 60:
+            # "9:75" - xato yozilgan vaqt, 10:15 deb taxmin qilmaymiz
+            continue
+        start = int(start_h) * 60 + int(start_m or 0)
+        end = int(end_h) * 60 + int(end_m or 0)
+        if start > MINUTES_PER_DAY or end > MINUTES_PER_DAY:
+            continue
+        if end <= start:
+            # Tungi smena: ertasi kuni tugaydi ("00:00-00:00" - butun kun)
+            end += MINUTES_PER_DAY
+
+        for day in days:
+            day_start = day * MINUTES_PER_DAY + start
+            day_end = day * MINUTES_PER_DAY + end
+            if day_end > MINUTES_PER_WEEK:
+                # Yakshanbadan dushanbaga o'tuvchi oraliq ikkiga bo'linadi
+                intervals.append((day_start, MINUTES_PER_WEEK))
+                intervals.append((0, day_end - MINUTES_PER_WEEK))
+            else:
+                intervals.append((day_start, day_end))
+
+    # Vaqtsiz bo'limlar ("Yakshanba: dam olish") oraliq qo'shmaydi - yopiq
+    return _merge(intervals)
+
+
+def local_now():
+    """Klinikalar joylashgan vaqt zonasidagi joriy vaqt"""
+    zone = ZoneInfo(getattr(settings, 'WORKING_HOURS_TIME_ZONE', settings.TIME_ZONE))
+    return timezone.now().astimezone(zone)
+
+
+def minute_of_week(moment=None):
+    """Dushanba 00:00 dan boshlab o'tgan daqiqalar"""
+    moment = moment or local_now()
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
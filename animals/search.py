@@ -0,0 +1,146 @@
+# animals/search.py
+"""
+Hayvonlar bo'yicha to'liq matnli qidiruv.
+
+SQLite'da BookAnimal jadvalining FTS5 "soya" indeksi (animals_bookanimal_fts)
+ishlatiladi: rowid = BookAnimal.id, natijalar BM25 bo'yicha saralanadi. Indeks
+jadvali boshqarilmaydigan (managed = False) BookAnimalSearch modeli orqali
+JOIN qilinadi.
+Boshqa bazalarda eski icontains qidiruviga qaytiladi.
+
+Indeks post_save/post_delete signal'lari orqali yangilanadi. bulk_create(),
+QuerySet.update() va delete() signal yubormaydi: ulardan keyin chaqiruvchi
+rebuild_index() ni o'zi chaqirishi kerak (masalan, animals/importing.py).
+"""
+import re
+
+from django.db import connections, router
+from django.db.models import F, FloatField, Func, Lookup, Q, Value
+
+from .models import BookAnimal, BookAnimalSearch
+
+FTS_TABLE = 'animals_bookanimal_fts'
+FTS_COLUMNS = ('name', 'breed', 'location', 'description')
+
+# BM25 og'irliklari: nom va zot tarifdan muhimroq
+FTS_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class Match(Lookup):
+    """FTS5: search_entry__document__match=<ifoda>"""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', (*lhs_params, *rhs_params)
+
+
+BookAnimalSearch._meta.get_field('document').register_lookup(Match)
+
+
+def _db_alias(write=False):
+    if write:
+        return router.db_for_write(BookAnimal)
+    return router.db_for_read(BookAnimal)
+
+
+def is_enabled(using=None):
+    """FTS indeksi shu bazada ishlaydimi"""
+    using = using or _db_alias()
+    return connections[using].vendor == 'sqlite'
+
+
+def create_index_sql():
+    columns = ', '.join(FTS_COLUMNS)
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        f"USING fts5({columns}, tokenize='unicode61 remove_diacritics 2')"
+    )
+
+
+def drop_index_sql():
+    return f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+
+def build_match_query(text):
+    """Foydalanuvchi matnini xavfsiz FTS5 MATCH ifodasiga aylantirish.
+
+    Har bir so'z prefiks sifatida qidiriladi ("mush" -> mushuk),
+    so'zlar AND bilan birlashtiriladi. So'z bo'lmasa bo'sh satr qaytadi.
+    """
+    tokens = _TOKEN_RE.findall(text or '')
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def index_animal(animal, using=None):
+    """Bitta hayvonni indeksga yozish (mavjud bo'lsa almashtiriladi)"""
+    using = using or _db_alias(write=True)
+    if not is_enabled(using):
+        return
+    values = [getattr(animal, column) or '' for column in FTS_COLUMNS]
+    placeholders = ', '.join(['%s'] * (len(FTS_COLUMNS) + 1))
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [animal.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) VALUES ({placeholders})",
+            [animal.pk, *values],
+        )
+
+
+def remove_animal(pk, using=None):
+    """Hayvonni indeksdan o'chirish"""
+    using = using or _db_alias(write=True)
+    if not is_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild_index(using=None):
+    """Indeksni BookAnimal jadvalidan to'liq qayta qurish. Yozuvlar sonini qaytaradi"""
+    using = using or _db_alias(write=True)
+    if not is_enabled(using):
+        return 0
+    table = BookAnimal._meta.db_table
+    columns = ', '.join(FTS_COLUMNS)
+    selects = ', '.join(f"COALESCE({column}, '')" for column in FTS_COLUMNS)
+    with connections[using].cursor() as cursor:
+        cursor.execute(create_index_sql())
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {selects} FROM {table}"
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def search_animals(queryset, query):
+    """Querysetni qidiruv matni bo'yicha filtrlash va relevantlik bo'yicha saralash"""
+    if not query:
+        return queryset
+
+    if not is_enabled(queryset.db):
+        return queryset.filter(
+            Q(name__icontains=query) |
+            Q(breed__icontains=query) |
+            Q(location__icontains=query) |
+            Q(description__icontains=query)
+        )
+
+    match = build_match_query(query)
+    if not match:
+        return queryset.none()
+
+    # FTS jadvali bir marta JOIN qilinadi: MATCH bitta skan, bm25() shu qatorlar uchun
+    rank = Func(F('search_entry__document'), *(Value(weight) for weight in FTS_WEIGHTS),
+                function='bm25', output_field=FloatField())
+    return (
+        queryset
+        .filter(search_entry__document__match=match)
+        .annotate(search_rank=rank)
+        .order_by('search_rank', '-created_at')
+    )
@@ -0,0 +1,292 @@
+# animals/signals.py
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    BookAnimal, Shelter, Veterinarian, Donation, AnimalImage, Review, PendingUpload
+)
+from . import blobs, caching, renditions, search, snapshots, stats
+
+
+# ==================== SAQLANGAN HOLAT ====================
+
+# Rasm maydonlari ham (stats o'z ustunlarini import paytida qo'shadi)
+for model, field in blobs.blob_fields():
+    snapshots.register(model, field)
+
+
+def remember_stored_snapshot(sender, instance, raw=False, using=None, **kwargs):
+    """Bazadagi eski qatorni bitta so'rovda o'qish (quyidagi pre_save'lar uchun umumiy).
+
+    Boshqa pre_save'lardan oldin ulanadi - signal'lar ulanish tartibida chaqiriladi.
+    """
+    if raw:
+        return
+    snapshots.remember(instance, using=using)
+
+
+def forget_stored_snapshot(sender, instance, **kwargs):
+    snapshots.forget(instance)
+
+
+for model in snapshots.registered_models():
+    pre_save.connect(remember_stored_snapshot, sender=model)
+    post_save.connect(forget_stored_snapshot, sender=model)
+
+
+# ==================== QIDIRUV INDEKSI ====================
+
+@receiver(post_save, sender=BookAnimal)
+def update_animal_search_index(sender, instance, raw=False, using=None, **kwargs):
+    """Hayvon saqlanganda FTS indeksini yangilash"""
+    if raw:
+        return
+    search.index_animal(instance, using=using)
+
+
+@receiver(post_delete, sender=BookAnimal)
+def remove_animal_search_index(sender, instance, using=None, **kwargs):
+    """Hayvon o'chirilganda uni indeksdan olib tashlash"""
+    search.remove_animal(instance.pk, using=using)
+
+
+# ==================== VETERINARIYA XIZMATLARI VA ISH VAQTI ====================
+
+@receiver(post_save, sender=Veterinarian)
+def sync_veterinarian_services(sender, instance, raw=False, **kwargs):
+    """services va working_hours o'zgarganda indekslangan jadvallarni yangilash"""
+    if raw:
+        return
+    instance.sync_service_links()
+    instance.sync_opening_intervals()
+
+
+# ==================== SAYT STATISTIKASI ====================
+
+STATS_MODELS = (BookAnimal, Shelter, Veterinarian, Donation)
+
+
+def remember_site_stats_contribution(sender, instance, raw=False, using=None, **kwargs):
+    """Saqlashdan oldingi hissani eslab qolish"""
+    if raw:
+        return
+    instance._site_stats_contribution = stats.stored_contribution(instance, using=using)
+
+
+def update_site_stats_on_save(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    old = getattr(instance, '_site_stats_contribution', {})
+    new = stats.contribution(instance)
+    stats.apply_delta(old, new, using=using)
+    instance._site_stats_contribution = new
+
+
+def update_site_stats_on_delete(sender, instance, using=None, **kwargs):
+    stats.apply_delta(stats.contribution(instance), {}, using=using)
+
+
+for model in STATS_MODELS:
+    pre_save.connect(remember_site_stats_contribution, sender=model)
+    post_save.connect(update_site_stats_on_save, sender=model)
+    post_delete.connect(update_site_stats_on_delete, sender=model)
+
+
+# ==================== BOSHPANADAGI HAYVONLAR ====================
+
+@receiver(pre_save, sender=BookAnimal)
+def remember_animal_shelter(sender, instance, raw=False, using=None, **kwargs):
+    """Saqlashdan oldin hayvon qaysi boshpana hisobida turganini eslab qolish"""
+    if raw:
+        return
+    instance._counted_shelter_id = stats.stored_animal_shelter(instance, using=using)
+
+
+@receiver(post_save, sender=BookAnimal)
+def update_shelter_animals_on_save(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    old = getattr(instance, '_counted_shelter_id', None)
+    new = instance.shelter_id if instance.is_in_shelter() else None
+    changed = stats.apply_shelter_delta(old, new, using=using)
+    instance._counted_shelter_id = new
+    if changed:
+        # update() signal yubormaydi - boshpana keshini o'zimiz bekor qilamiz
+        caching.invalidate_tags('shelter:*', *(f'shelter:{pk}' for pk in changed), using=using)
+
+
+@receiver(post_delete, sender=BookAnimal)
+def update_shelter_animals_on_delete(sender, instance, using=None, **kwargs):
+    if not instance.is_in_shelter():
+        return
+    stats.apply_shelter_delta(instance.shelter_id, None, using=using)
+    caching.invalidate_tags('shelter:*', f'shelter:{instance.shelter_id}', using=using)
+
+
+# ==================== BOSHPANA XAYRIYALARI ====================
+
+@receiver(pre_save, sender=Donation)
+def remember_shelter_donation(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    instance._shelter_donation = stats.stored_shelter_donation(instance, using=using)
+
+
+@receiver(post_save, sender=Donation)
+def update_shelter_donations_on_save(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    new = stats.shelter_donation(instance)
+    changed = stats.apply_shelter_donation_delta(
+        getattr(instance, '_shelter_donation', None), new, using=using
+    )
+    instance._shelter_donation = new
+    if changed:
+        caching.invalidate_tags('shelter:*', *(f'shelter:{pk}' for pk in changed), using=using)
+
+
+@receiver(post_delete, sender=Donation)
+def update_shelter_donations_on_delete(sender, instance, using=None, **kwargs):
+    changed = stats.apply_shelter_donation_delta(stats.shelter_donation(instance), None, using=using)
+    if changed:
+        caching.invalidate_tags('shelter:*', *(f'shelter:{pk}' for pk in changed), using=using)
+
+
+# ==================== REYTINGLAR ====================
+
+def _invalidate_rated(changed, using=None):
+    tags = set()
+    for model, pk in changed:
+        prefix = caching.MODEL_TAGS[model._meta.model_name]
+        tags.update((f'{prefix}:*', f'{prefix}:{pk}'))
+    caching.invalidate_tags(*sorted(tags), using=using)
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_rating(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    instance._rating_contributions = stats.stored_review_contributions(instance, using=using)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, raw=False, using=None, **kwargs):
+    """Sharh qo'shilganda yoki bahosi o'zgarganda reytingni F() bilan yangilash"""
+    if raw:
+        return
+    new = stats.review_contributions(instance)
+    changed = stats.apply_rating_delta(getattr(instance, '_rating_contributions', {}), new, using=using)
+    instance._rating_contributions = new
+    _invalidate_rated(changed, using=using)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, using=None, **kwargs):
+    changed = stats.apply_rating_delta(stats.review_contributions(instance), {}, using=using)
+    _invalidate_rated(changed, using=using)
+
+
+# ==================== RASM NUSXALARI ====================
+
+RENDITION_MODELS = (BookAnimal, AnimalImage, Shelter, Veterinarian)
+
+
+def remember_new_images(sender, instance, raw=False, **kwargs):
+    """Saqlanayotgan (hali yozilmagan) yangi rasmlarni belgilash"""
+    if raw:
+        return
+    instance._new_image_fields = [
+        fieldfile.field.name for fieldfile in renditions.image_fields(instance)
+        if fieldfile and not fieldfile._committed
+    ]
+
+
+def _generate_renditions(instance, field):
+    if renditions.generate(getattr(instance, field)):
+        # Keshlangan fragmentlar endi srcset bilan chiqsin
+        tags = caching.model_tags(instance)
+        if isinstance(instance, AnimalImage):
+            tags = [f'animal:{instance.animal_id}']
+        caching.invalidate_tags(*tags)
+
+
+def generate_renditions_on_save(sender, instance, raw=False, using=None, **kwargs):
+    """Yangi rasm nusxalarini tranzaksiya commit bo'lgandan keyin yaratish"""
+    if raw:
+        return
+    for field in getattr(instance, '_new_image_fields', ()):
+        transaction.on_commit(lambda field=field: _generate_renditions(instance, field),
+                              using=using, robust=True)
+    instance._new_image_fields = []
+
+
+for model in RENDITION_MODELS:
+    pre_save.connect(remember_new_images, sender=model)
+    post_save.connect(generate_renditions_on_save, sender=model)
+
+
+@receiver(post_delete, sender=PendingUpload)
+def delete_pending_upload_file(sender, instance, using=None, **kwargs):
+    """Qayta ishlangan yoki bekor qilingan yuklamaning vaqtinchalik faylini o'chirish"""
+    if instance.file:
+        transaction.on_commit(lambda: instance.file.delete(save=False), using=using, robust=True)
+
+
+# ==================== MEDIA FAYLLAR ====================
+
+def remember_blob_references(sender, instance, raw=False, using=None, **kwargs):
+    """Saqlashdan oldin bazadagi eski rasm fayllarini eslab qolish"""
+    if raw:
+        return
+    instance._counted_blobs = blobs.stored_references(instance, using=using)
+
+
+def update_blob_references_on_save(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    new = blobs.references(instance)
+    blobs.apply_blob_delta(getattr(instance, '_counted_blobs', {}), new, using=using)
+    instance._counted_blobs = new
+
+
+def update_blob_references_on_delete(sender, instance, using=None, **kwargs):
+    blobs.apply_blob_delta(blobs.references(instance), {}, using=using)
+
+
+for model in {model for model, _field in blobs.blob_fields()}:
+    pre_save.connect(remember_blob_references, sender=model)
+    post_save.connect(update_blob_references_on_save, sender=model)
+    post_delete.connect(update_blob_references_on_delete, sender=model)
+
+
+# ==================== KESH TEGLARI ====================
+
+@receiver(post_save, sender=BookAnimal)
+@receiver(post_delete, sender=BookAnimal)
+@receiver(post_save, sender=Shelter)
+@receiver(post_delete, sender=Shelter)
+@receiver(post_save, sender=Veterinarian)
+@receiver(post_delete, sender=Veterinarian)
+@receiver(post_save, sender=Donation)
+@receiver(post_delete, sender=Donation)
+def invalidate_model_cache(sender, instance, using=None, **kwargs):
+    """Obyekt o'zgarganda uning teglarini bekor qilish"""
+    caching.invalidate_tags(*caching.model_tags(instance), using=using)
+
+
+@receiver(post_save, sender=AnimalImage)
+@receiver(post_delete, sender=AnimalImage)
+def invalidate_animal_image_cache(sender, instance, using=None, **kwargs):
+    caching.invalidate_tags(f'animal:{instance.animal_id}', using=using)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review_cache(sender, instance, using=None, **kwargs):
+    tags = []
+    if instance.veterinarian_id:
+        tags.append(f'veterinarian:{instance.veterinarian_id}')
+    if instance.shelter_id:
+        tags.append(f'shelter:{instance.shelter_id}')
+    caching.invalidate_tags(*tags, using=using)
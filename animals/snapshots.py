@@ -0,0 +1,48 @@
+# animals/snapshots.py
+"""
+Obyektning saqlashdan oldingi (bazadagi) holati.
+
+Bir nechta pre_save signal'i eski qiymatlarga muhtoj: SiteStats hissasi,
+boshpana hisoblagichi, xayriya yig'indisi, blob havolalari. Har biri alohida
+SELECT qilmasligi uchun qator bir marta, barcha ro'yxatdan o'tgan ustunlar
+birlashmasi bilan o'qiladi (animals/signals.py dagi birinchi pre_save) va
+saqlash tugaguncha obyektda turadi.
+"""
+from collections import defaultdict
+
+ATTRIBUTE = '_stored_snapshot'
+
+_fields = defaultdict(set)
+
+
+def register(model, *fields):
+    """Model uchun eski holatdan o'qiladigan ustunlarni qo'shish"""
+    _fields[model].update(fields)
+
+
+def registered_models():
+    return list(_fields)
+
+
+def load(instance, using=None):
+    """Bazadagi qator (faqat ro'yxatdan o'tgan ustunlar) yoki None"""
+    if instance._state.adding or instance.pk is None:
+        return None
+    model = type(instance)
+    fields = sorted(_fields[model])
+    return model._default_manager.using(using).filter(pk=instance.pk).only(*fields).first()
+
+
+def remember(instance, using=None):
+    setattr(instance, ATTRIBUTE, load(instance, using=using))
+
+
+def forget(instance):
+    instance.__dict__.pop(ATTRIBUTE, None)
+
+
+def stored(instance, using=None):
+    """Saqlash paytida - eslab qolingan holat, aks holda bazadan o'qiladi"""
+    if ATTRIBUTE in instance.__dict__:
+        return instance.__dict__[ATTRIBUTE]
+    return load(instance, using=using)
@@ -0,0 +1,77 @@
+# animals/sqlite/base.py
+"""
+Bir nechta gunicorn worker bir vaqtda yozadigan SQLite uchun backend.
+
+    'ENGINE': 'animals.sqlite',
+    'OPTIONS': {
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': 5,
+        'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; ...',
+        'busy_retries': 5,
+        'busy_backoff': 0.05,
+    },
+
+Django'ning sqlite3 backend'idan farqi - SQLITE_BUSY ("database is locked")
+bo'lganda ochiq tranzaksiyadan tashqaridagi so'rov eksponensial kechikish
+bilan qayta bajariladi. transaction_mode=IMMEDIATE bilan yozish qulfi
+BEGIN da olinadi, shuning uchun atomic() bloki qulf kutib qolsa faqat BEGIN
+qaytariladi - tranzaksiya ichidagi ish hali boshlanmagan. Autocommit rejimidagi
+alohida so'rovlar ham o'z-o'zidan atomar, ularni qaytarish xavfsiz.
+Tranzaksiya o'rtasidagi xato esa odatdagidek yuqoriga chiqadi.
+"""
+import logging
+import random
+import time
+
+from django.db.backends.sqlite3 import base
+
+logger = logging.getLogger(__name__)
+
+BUSY_MESSAGES = ('database is locked', 'database table is locked', 'database is busy')
+
+
+def is_busy(exc):
+    return any(message in str(exc) for message in BUSY_MESSAGES)
+
+
+class BusyRetryCursorWrapper(base.SQLiteCursorWrapper):
+
+    def __init__(self, connection, retries, backoff):
+        super().__init__(connection)
+        self.retries = retries
+        self.backoff = backoff
+
+    def _retry(self, method, *args):
+        attempt = 0
+        while True:
+            try:
+                return method(*args)
+            except base.Database.OperationalError as exc:
+                if attempt >= self.retries or self.connection.in_transaction or not is_busy(exc):
+                    raise
+                # 50ms, 100ms, 200ms, ... +-50% tasodifiy - workerlar bir vaqtda qaytmasin
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                logger.debug("SQLite band, %.3fs dan keyin qayta urinish (%d): %s", delay, attempt + 1, args[0])
+                time.sleep(delay)
+                attempt += 1
+
+    def execute(self, query, params=None):
+        return self._retry(super().execute, query, params)
+
+    def executemany(self, query, param_list):
+        # param_list generator bo'lishi mumkin - qayta urinish uchun ro'yxatga aylantiramiz
+        return self._retry(super().executemany, query, list(param_list))
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.busy_retries = kwargs.pop('busy_retries', 5)
+        self.busy_backoff = kwargs.pop('busy_backoff', 0.05)
+        return kwargs
+
+    def create_cursor(self, name=None):
+        return self.connection.cursor(
+            factory=lambda conn: BusyRetryCursorWrapper(conn, self.busy_retries, self.busy_backoff)
+        )
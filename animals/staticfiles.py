@@ -0,0 +1,105 @@
+# animals/staticfiles.py
+"""
+collectstatic uchun minify + xesh + oldindan siqish.
+
+MinifiedManifestStaticFilesStorage loyiha CSS/JS fayllarini (static/css, static/js)
+STATIC_ROOT ga yozishda minify qiladi, ManifestStaticFilesStorage ularga kontent
+xeshli nom beradi (css/base.3f2a1c9e.css), so'ng har bir matnli fayl yoniga
+.gz (va brotli o'rnatilgan bo'lsa .br) nusxa yoziladi. Nginx `gzip_static` /
+`brotli_static` ularni qayta siqmasdan beradi, xeshli nomlar esa
+`Cache-Control: immutable` bilan keshlanishi mumkin.
+
+Minifikatsiya ehtiyotkor: faqat izohlar va ortiqcha bo'shliqlar olib tashlanadi.
+"""
+import gzip
+import posixpath
+import re
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # ixtiyoriy: faqat .gz yoziladi
+    brotli = None
+
+# Faqat loyihaning o'z fayllari; admin va boshqa ilovalarniki tegilmaydi
+MINIFY_PREFIXES = ('css/', 'js/')
+COMPRESS_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.map')
+
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+CSS_SPACE_RE = re.compile(r'\s+')
+CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css(text):
+    text = CSS_COMMENT_RE.sub('', text)
+    text = CSS_SPACE_RE.sub(' ', text)
+    # ':' ga tegilmaydi - selektorlarda "a :hover" va "a:hover" har xil
+    text = CSS_PUNCT_RE.sub(r'\1', text)
+    return text.replace(';}', '}').strip()
+
+
+def minify_js(text):
+    """Satr boshidagi bo'shliqlar, bo'sh satrlar va to'liq satrli // izohlarni olib tashlash.
+
+    Satr oxirlari saqlanadi (ASI), ko'p satrli `...` shablon ichiga tegilmaydi.
+    """
+    lines = []
+    in_template = False
+    for line in text.splitlines():
+        if in_template:
+            lines.append(line)
+        else:
+            stripped = line.strip()
+            if not stripped or stripped.startswith('//'):
+                continue
+            lines.append(stripped)
+        if line.count('`') % 2:
+            in_template = not in_template
+    return '\n'.join(lines) + '\n'
+
+
+MINIFIERS = {
+    '.css': minify_css,
+    '.js': minify_js,
+}
+
+
+class MinifiedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def _minifier(self, name):
+        if not name.startswith(MINIFY_PREFIXES) or '.min.' in name:
+            return None
+        return MINIFIERS.get(posixpath.splitext(name)[1])
+
+    def _save(self, name, content):
+        minifier = self._minifier(name)
+        if minifier:
+            # post_process bitta ContentFile ni ketma-ket bir necha marta saqlaydi
+            if hasattr(content, 'seek'):
+                content.seek(0)
+            content = ContentFile(minifier(content.read().decode('utf-8')).encode('utf-8'))
+        return super()._save(name, content)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted({*paths, *self.hashed_files.values()}):
+            if name.endswith(COMPRESS_EXTENSIONS) and self.exists(name):
+                self.precompress(name)
+
+    def precompress(self, name):
+        """name.gz va name.br yozish (asl fayldan kichik bo'lsagina)"""
+        with self.open(name) as source:
+            data = source.read()
+        variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(data, quality=11)))
+        for suffix, compressed in variants:
+            target = name + suffix
+            if self.exists(target):
+                self.delete(target)
+            if len(compressed) < len(data):
+                super()._save(target, ContentFile(compressed))
@@ -0,0 +1,285 @@
+# animals/stats.py
+"""
+SiteStats hisoblagichlarini yangilash.
+
+Har bir obyektning statistikaga "hissasi" hisoblanadi (masalan, mavjud bepul
+kuchuk -> available_animals +1, free_animals +1, dogs_count +1). Saqlashda eski va
+yangi hissa farqi F() bilan qo'shiladi, o'chirishda hissa ayiriladi.
+
+Shelter.current_animals ham shu tarzda yuritiladi: hayvon boshpanaga
+biriktirilsa yoki undan chiqsa (asrab olindi, boshqa boshpanaga o'tdi)
+tegishli boshpana hisoblagichi +1/-1 qilinadi. Boshpananing tasdiqlangan
+xayriyalari (Shelter.donations_count/donations_total) va sharhlar bo'yicha
+reyting (review_count, rating_sum -> rating) ham xuddi shunday.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, FloatField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+
+from . import snapshots
+from .models import BookAnimal, Shelter, Veterinarian, Donation, Review, SiteStats
+
+CONFIRMED_DONATION_STATUSES = ('confirmed', 'delivered')
+
+
+def _animal_contribution(animal):
+    if animal.status != 'available':
+        return {}
+    contribution = {'available_animals': 1}
+    contribution['paid_animals' if animal.is_for_sale else 'free_animals'] = 1
+    if animal.animal_type == 'dog':
+        contribution['dogs_count'] = 1
+    elif animal.animal_type == 'cat':
+        contribution['cats_count'] = 1
+    else:
+        contribution['other_animals'] = 1
+    return contribution
+
+
+def _shelter_contribution(shelter):
+    return {'active_shelters': 1} if shelter.is_active else {}
+
+
+def _veterinarian_contribution(vet):
+    return {'veterinarians_count': 1}
+
+
+def _donation_contribution(donation):
+    if donation.status not in CONFIRMED_DONATION_STATUSES:
+        return {}
+    return {'confirmed_donations': 1, 'donations_amount': Decimal(donation.amount or 0)}
+
+
+CONTRIBUTIONS = {
+    BookAnimal: (_animal_contribution, ('status', 'is_for_sale', 'animal_type')),
+    Shelter: (_shelter_contribution, ('is_active',)),
+    Veterinarian: (_veterinarian_contribution, ()),
+    Donation: (_donation_contribution, ('status', 'amount')),
+}
+
+
+def contribution(instance):
+    func, _fields = CONTRIBUTIONS[type(instance)]
+    return func(instance)
+
+
+for _model, (_func, _fields) in CONTRIBUTIONS.items():
+    snapshots.register(_model, *_fields)
+
+
+def stored_contribution(instance, using=None):
+    """Bazada saqlangan (o'zgarishdan oldingi) holat bo'yicha hissa"""
+    if instance._state.adding or instance.pk is None:
+        return {}
+    func, fields = CONTRIBUTIONS[type(instance)]
+    if not fields:
+        return func(instance)
+    stored = snapshots.stored(instance, using=using)
+    return func(stored) if stored else {}
+
+
+def apply_delta(old, new, using=None):
+    """Eski va yangi hissa farqini SiteStats qatoriga atomar qo'shish"""
+    delta = {}
+    for key in set(old) | set(new):
+        change = new.get(key, 0) - old.get(key, 0)
+        if change:
+            delta[key] = F(key) + change
+    if not delta:
+        return
+    updated = SiteStats.objects.using(using).filter(pk=SiteStats.SINGLETON_PK).update(**delta)
+    if not updated:
+        # Qator hali yo'q - noldan hisoblaymiz (joriy o'zgarish ham hisobga olinadi)
+        transaction.on_commit(lambda: reconcile_site_stats(using=using), using=using)
+
+
+def reconcile_site_stats(using=None):
+    """Barcha hisoblagichlarni noldan qayta hisoblash"""
+    animals = BookAnimal.objects.using(using).filter(status='available').aggregate(
+        available_animals=Count('id'),
+        free_animals=Count('id', filter=Q(is_for_sale=False)),
+        paid_animals=Count('id', filter=Q(is_for_sale=True)),
+        dogs_count=Count('id', filter=Q(animal_type='dog')),
+        cats_count=Count('id', filter=Q(animal_type='cat')),
+        other_animals=Count('id', filter=~Q(animal_type__in=['dog', 'cat'])),
+    )
+    donations = Donation.objects.using(using).filter(
+        status__in=CONFIRMED_DONATION_STATUSES
+    ).aggregate(
+        confirmed_donations=Count('id'),
+        donations_amount=Sum('amount'),
+    )
+    values = {
+        **animals,
+        'active_shelters': Shelter.objects.using(using).filter(is_active=True).count(),
+        'veterinarians_count': Veterinarian.objects.using(using).count(),
+        'confirmed_donations': donations['confirmed_donations'],
+        'donations_amount': donations['donations_amount'] or 0,
+    }
+    stats, _created = SiteStats.objects.using(using).update_or_create(
+        pk=SiteStats.SINGLETON_PK, defaults=values
+    )
+    return stats
+
+
+# ==================== BOSHPANADAGI HAYVONLAR ====================
+
+snapshots.register(BookAnimal, 'shelter', 'status')
+
+
+def stored_animal_shelter(animal, using=None):
+    """Bazada saqlangan holat bo'yicha hayvon hisoblanadigan boshpana (yoki None)"""
+    stored = snapshots.stored(animal, using=using)
+    return stored.shelter_id if stored and stored.is_in_shelter() else None
+
+
+def apply_shelter_delta(old_shelter_id, new_shelter_id, using=None):
+    """Hayvon boshpanalar orasida ko'chganda current_animals ni atomar yangilash.
+
+    O'zgargan boshpanalar pk ro'yxati qaytadi (kesh teglarini bekor qilish uchun).
+    """
+    if old_shelter_id == new_shelter_id:
+        return []
+    changed = []
+    for shelter_id, change in ((old_shelter_id, -1), (new_shelter_id, 1)):
+        if shelter_id is None:
+            continue
+        Shelter.objects.using(using).filter(pk=shelter_id).update(
+            current_animals=F('current_animals') + change
+        )
+        changed.append(shelter_id)
+    return changed
+
+
+def reconcile_shelter_animals(using=None):
+    """Barcha boshpanalar uchun current_animals ni bitta UPDATE bilan qayta hisoblash"""
+    counts = (
+        BookAnimal.objects.using(using)
+        .filter(shelter=OuterRef('pk'), status__in=BookAnimal.IN_SHELTER_STATUSES)
+        .order_by()
+        .values('shelter')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    return Shelter.objects.using(using).update(
+        current_animals=Coalesce(Subquery(counts), 0)
+    )
+
+
+# ==================== BOSHPANA XAYRIYALARI ====================
+
+def shelter_donation(donation):
+    """Xayriyaning boshpana hisobiga hissasi: (shelter_id, summa) yoki None"""
+    if donation.status not in CONFIRMED_DONATION_STATUSES:
+        return None
+    return donation.shelter_id, Decimal(donation.amount or 0)
+
+
+snapshots.register(Donation, 'shelter', 'status', 'amount')
+
+
+def stored_shelter_donation(donation, using=None):
+    """Bazada saqlangan holat bo'yicha hissa"""
+    stored = snapshots.stored(donation, using=using)
+    return shelter_donation(stored) if stored else None
+
+
+def apply_shelter_donation_delta(old, new, using=None):
+    """Boshpana xayriya yig'indilarini atomar yangilash; o'zgargan boshpanalar pk ro'yxati"""
+    if old == new:
+        return []
+    changed = []
+    for contribution, sign in ((old, -1), (new, 1)):
+        if contribution is None:
+            continue
+        shelter_id, amount = contribution
+        Shelter.objects.using(using).filter(pk=shelter_id).update(
+            donations_count=F('donations_count') + sign,
+            donations_total=F('donations_total') + sign * amount,
+        )
+        changed.append(shelter_id)
+    return changed
+
+
+def reconcile_shelter_donations(using=None):
+    """Barcha boshpanalar xayriya yig'indilarini bitta UPDATE bilan qayta hisoblash"""
+    confirmed = (
+        Donation.objects.using(using)
+        .filter(shelter=OuterRef('pk'), status__in=CONFIRMED_DONATION_STATUSES)
+        .order_by()
+        .values('shelter')
+    )
+    return Shelter.objects.using(using).update(
+        donations_count=Coalesce(Subquery(confirmed.annotate(n=Count('id')).values('n')), 0),
+        donations_total=Coalesce(
+            Subquery(confirmed.annotate(total=Sum('amount')).values('total')),
+            Decimal('0'),
+            output_field=Shelter._meta.get_field('donations_total'),
+        ),
+    )
+
+
+# ==================== REYTINGLAR ====================
+
+RATED_MODELS = (('veterinarian', Veterinarian), ('shelter', Shelter))
+
+
+def review_contributions(review):
+    """Sharhning reytinglarga hissasi: {(model, pk): baho}"""
+    return {
+        (model, getattr(review, f'{field}_id')): int(review.rating)
+        for field, model in RATED_MODELS
+        if getattr(review, f'{field}_id') is not None
+    }
+
+
+snapshots.register(Review, 'veterinarian', 'shelter', 'rating')
+
+
+def stored_review_contributions(review, using=None):
+    stored = snapshots.stored(review, using=using)
+    return review_contributions(stored) if stored else {}
+
+
+def rating_expression():
+    """rating_sum / review_count, bir xonagacha yaxlitlangan (sharh yo'q bo'lsa 0)"""
+    return Coalesce(
+        Round(Cast(F('rating_sum'), FloatField()) / NullIf(F('review_count'), 0), 1),
+        0.0,
+    )
+
+
+def apply_rating_delta(old, new, using=None):
+    """Sharh qo'shilgan/o'zgargan/o'chirilganda review_count, rating_sum va rating ni yangilash.
+
+    Chaqiruvchi tranzaksiya ichida bo'lishi kerak. O'zgargan (model, pk) lar qaytadi.
+    """
+    changed = []
+    for key in set(old) | set(new):
+        count = (key in new) - (key in old)
+        total = new.get(key, 0) - old.get(key, 0)
+        if not count and not total:
+            continue
+        model, pk = key
+        rows = model.objects.using(using).filter(pk=pk)
+        rows.update(review_count=F('review_count') + count, rating_sum=F('rating_sum') + total)
+        # Alohida UPDATE: bitta so'rovda yangi qiymatlarga murojaat qilish bazaga bog'liq
+        rows.update(rating=rating_expression())
+        changed.append(key)
+    return changed
+
+
+def reconcile_ratings(using=None):
+    """review_count, rating_sum va rating ni sharhlardan qayta hisoblash"""
+    updated = 0
+    for field, model in RATED_MODELS:
+        reviews = Review.objects.using(using).filter(**{field: OuterRef('pk')}).order_by().values(field)
+        with transaction.atomic(using=using):
+            updated += model.objects.using(using).update(
+                review_count=Coalesce(Subquery(reviews.annotate(n=Count('id')).values('n')), 0),
+                rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0),
+            )
+            model.objects.using(using).update(rating=rating_expression())
+    return updated
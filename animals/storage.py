@@ -0,0 +1,71 @@
+# animals/storage.py
+"""
+Kontent bo'yicha manzillanadigan (content-addressed) media storage.
+
+Yuklangan fayl bo'laklab SHA-256 bilan xeshlanadi va bir marta saqlanadi:
+
+    blobs/3f/a9/3fa9...c2.jpg
+
+Bir xil rasm qayta yuklansa (boshqa hayvonga, galereyaga yoki tahrirlashda)
+yangi fayl yozilmaydi - mavjud nom qaytadi. Ikki darajali katalog (ab/cd/)
+bitta katalogda yuz minglab fayl to'planishining oldini oladi.
+
+Fayl nechta obyektga tegishli ekanini MediaBlob.ref_count yuritadi
+(animals/blobs.py); oxirgi havola o'chganda fayl ham o'chiriladi.
+Kichraytirilgan nusxalar (animals/renditions.py) xesh nomi yonida oddiy
+fayl sifatida saqlanadi.
+"""
+import hashlib
+import posixpath
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+from . import renditions
+
+BLOB_PREFIX = 'blobs'
+
+
+def content_digest(content):
+    """Faylni xotiraga to'liq o'qimasdan SHA-256 hisoblash"""
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def blob_name(digest, ext):
+    """'3fa9...c2', '.jpg' -> 'blobs/3f/a9/3fa9...c2.jpg'"""
+    return posixpath.join(BLOB_PREFIX, digest[:2], digest[2:4], f'{digest}{ext.lower()}')
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(BLOB_PREFIX + '/') and not renditions.is_rendition(name)
+
+
+@deconstructible(path='animals.storage.ContentAddressedStorage')
+class ContentAddressedStorage(FileSystemStorage):
+
+    def _is_derived(self, name):
+        # Nusxalar va allaqachon xeshlangan nomlar o'z nomi bilan yoziladi
+        return name.startswith(BLOB_PREFIX + '/') or renditions.is_rendition(name)
+
+    def get_available_name(self, name, max_length=None):
+        if self._is_derived(name):
+            return super().get_available_name(name, max_length=max_length)
+        # Yakuniy nom _save da kontentdan hisoblanadi - upload_to katalogini tekshirish shart emas
+        return name
+
+    def _save(self, name, content):
+        if self._is_derived(name):
+            return super()._save(name, content)
+        target = blob_name(content_digest(content), posixpath.splitext(name)[1])
+        if self.exists(target):
+            return target
+        saved = super()._save(target, content)
+        if saved != target:
+            # Parallel so'rov aynan shu kontentni bizdan oldin yozib ulgurdi
+            self.delete(saved)
+        return target
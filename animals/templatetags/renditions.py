@@ -0,0 +1,50 @@
+# animals/templatetags/renditions.py
+"""
+Rasm nusxalari (animals/renditions.py) uchun teglar.
+
+    {% load renditions %}
+    {% picture animal.image alt=animal.name css_class="pet-image" %}
+
+WebP va JPEG srcset bilan <picture> chiqaradi. Nusxalar hali yaratilmagan
+bo'lsa oddiy <img> (asl rasm) chiqadi.
+"""
+from django import template
+from django.utils.html import format_html
+
+from animals import renditions
+
+register = template.Library()
+
+DEFAULT_SIZES = '(max-width: 576px) 100vw, 400px'
+
+
+@register.simple_tag
+def picture(fieldfile, alt='', css_class='', sizes=DEFAULT_SIZES, loading='lazy'):
+    if not fieldfile:
+        return ''
+    if not renditions.has_renditions(fieldfile):
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}">',
+            fieldfile.url, alt, css_class, loading,
+        )
+    width, height = renditions.SIZES[0]
+    jpeg_srcset = renditions.srcset(fieldfile, 'jpg')
+    return format_html(
+        # display: contents - <picture> sahifa joylashuviga ta'sir qilmaydi
+        '<picture style="display: contents">'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" '
+        'loading="{}" decoding="async">'
+        '</picture>',
+        renditions.srcset(fieldfile, 'webp'), sizes,
+        fieldfile.storage.url(renditions.rendition_name(fieldfile.name, (width, height), 'jpg')),
+        jpeg_srcset, sizes, width, height, alt, css_class, loading,
+    )
+
+
+@register.simple_tag
+def rendition_srcset(fieldfile, ext='webp'):
+    """Faqat srcset qiymati: <img srcset="{% rendition_srcset animal.image 'jpg' %}">"""
+    if not fieldfile or not renditions.has_renditions(fieldfile):
+        return ''
+    return renditions.srcset(fieldfile, ext)
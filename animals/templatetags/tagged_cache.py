@@ -0,0 +1,52 @@
+# animals/templatetags/tagged_cache.py
+"""
+{% tagcache %} - teglar bilan bekor qilinadigan fragment keshi.
+
+    {% load tagged_cache %}
+    {% tagcache 'home_pets' 'animal:*' current_category search_query %}
+        ...
+    {% endtagcache %}
+
+Birinchi argument - fragment nomi, ikkinchisi - vergul bilan ajratilgan teglar,
+qolganlari - kalitga qo'shiladigan o'zgaruvchilar (Django'ning {% cache %} kabi).
+"""
+from django import template
+
+from animals import caching
+
+register = template.Library()
+
+
+class TagCacheNode(template.Node):
+    def __init__(self, nodelist, fragment_name, tags, vary_on):
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.tags = tags
+        self.vary_on = vary_on
+
+    def render(self, context):
+        name = self.fragment_name.resolve(context)
+        tags = [tag.strip() for tag in self.tags.resolve(context).split(',') if tag.strip()]
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        return caching.get_or_set(
+            caching.make_key(f'fragment:{name}', *vary_on),
+            tags,
+            lambda: self.nodelist.render(context),
+        )
+
+
+@register.tag('tagcache')
+def do_tagcache(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' kamida ikkita argument oladi: fragment nomi va teglar"
+        )
+    nodelist = parser.parse(('endtagcache',))
+    parser.delete_first_token()
+    return TagCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        parser.compile_filter(bits[2]),
+        [parser.compile_filter(bit) for bit in bits[3:]],
+    )
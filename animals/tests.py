@@ -1,3 +1,1934 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import random
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from importlib import import_module
+from io import BytesIO, StringIO
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.contrib.sessions.models import Session
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, include, path, resolve, reverse
+from django.utils import timezone
+from PIL import Image
+
+from users import urls as users_urls
+from users.models import CustomUser
+from . import urls as animals_urls
+from . import views
+from .models import (
+    BookAnimal, Shelter, Veterinarian, Donation, AnimalImage, Review, AdoptionRequest, MediaBlob,
+    SiteStats, Job, PendingUpload, VeterinarianService, content_storage
+)
+from . import async_views, blobs, caching, geo, importing, jobs, renditions, routers, search, uploads
+from .facets import EXTRA_FACET_FIELDS, count_facets
+from .forms import ShelterForm
+from .schedule import MINUTES_PER_DAY as DAY, MINUTES_PER_WEEK as WEEK, parse_working_hours
+from .pagination import CursorPaginator, NEXT, encode_cursor
+from .query_budget import QueryBudgetExceeded, get_query_budget
+from .sqlite.base import BusyRetryCursorWrapper
+from .staticfiles import minify_css, minify_js
+from .stats import apply_delta, reconcile_shelter_donations, reconcile_site_stats
+
+
+# ==================== SO'ROV REJALARI (EXPLAIN QUERY PLAN) ====================
+
+# "SCAN animals_bookanimal" - jadval to'liq ko'rib chiqilmoqda (indeks ishlatilmagan).
+# FTS jadvali (animals_bookanimal_fts) bunga kirmaydi.
+FULL_SCAN_RE = re.compile(r'\bSCAN (?:TABLE )?animals_bookanimal(?:\s|$)')
+
+
+class BookAnimalQueryPlanTests(TestCase):
+    """Hayvonlar ro'yxatlaridagi so'rovlar indekssiz to'liq skanga tushmasligi kerak"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(username='owner', password='pass12345')
+        cls.shelter = Shelter.objects.create(
+            name='Mehr', shelter_type='state', description='Boshpana', address='Toshkent',
+            phone_number='+998901234567', capacity=50, director='Direktor',
+        )
+        animals = []
+        for i in range(40):
+            animals.append(BookAnimal(
+                name=f'Hayvon {i}',
+                animal_type=['dog', 'cat', 'bird', 'other'][i % 4],
+                location='Toshkent',
+                description='Mehribon va sog\'lom',
+                user=cls.user,
+                is_for_sale=bool(i % 2),
+                status='available' if i % 5 else 'adopted',
+                shelter=cls.shelter if i % 3 == 0 else None,
+            ))
+        BookAnimal.objects.bulk_create(animals)
+        cls.animal = BookAnimal.objects.filter(status='available').first()
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("EXPLAIN QUERY PLAN faqat SQLite uchun")
+        # Keshdan olingan sahifa so'rov bajarmaydi
+        cache.clear()
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertNoFullScan(self, url, login=False):
+        if login:
+            self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        animal_queries = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].lstrip().upper().startswith('SELECT')
+            and 'FROM "animals_bookanimal"' in q['sql']
+        ]
+        self.assertTrue(animal_queries, f"{url} BookAnimal so'rovini bajarmadi")
+        for sql in animal_queries:
+            plan = self.explain(sql)
+            scans = [line for line in plan if FULL_SCAN_RE.search(line)]
+            self.assertFalse(scans, f"{url}: to'liq skan\n{sql}\n" + '\n'.join(plan))
+
+    def test_home_view(self):
+        self.assertNoFullScan(reverse('home'))
+
+    def test_home_view_filters(self):
+        base = reverse('home')
+        self.assertNoFullScan(f'{base}?category=free')
+        self.assertNoFullScan(f'{base}?animal_type=dog')
+        self.assertNoFullScan(f'{base}?animal_type=other&category=paid')
+
+    def test_animals_list_view(self):
+        self.assertNoFullScan(reverse('animals_list'))
+
+    def test_animals_list_view_filters(self):
+        base = reverse('animals_list')
+        self.assertNoFullScan(f'{base}?animal_type=cat')
+        self.assertNoFullScan(f'{base}?category=paid')
+        self.assertNoFullScan(f'{base}?animal_type=dog&category=free&page=2')
+
+    def test_animals_list_view_search(self):
+        self.assertNoFullScan(f"{reverse('animals_list')}?search=hayvon")
+
+    def test_animal_detail_similar_animals(self):
+        self.assertNoFullScan(reverse('animal_detail', args=[self.animal.pk]))
+
+    def test_my_animals_view(self):
+        self.assertNoFullScan(reverse('my_animals'), login=True)
+
+    def test_shelter_detail_animals(self):
+        self.assertNoFullScan(reverse('shelter_detail', args=[self.shelter.pk]))
+
+
+# ==================== SO'ROVLAR BYUDJETI ====================
+
+class QueryBudgetTests(TestCase):
+    """Har bir URL o'z view byudjetidan ko'p so'rov bajarmasligi kerak.
+
+    Ro'yxatlar bir nechta qator bilan to'ldiriladi: N+1 bo'lsa byudjetdan oshadi.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(username='owner', password='pass12345')
+        cls.donor = CustomUser.objects.create_user(username='donor', password='pass12345')
+        cls.visitor = CustomUser.objects.create_user(username='visitor', password='pass12345')
+        cls.staff = CustomUser.objects.create_user(username='staff', password='pass12345', is_staff=True)
+
+        cls.shelters = [
+            Shelter.objects.create(
+                name=f'Boshpana {i}', shelter_type='state', description='Tavsif',
+                address='Toshkent', phone_number='+998901234567', capacity=50,
+                director='Direktor', latitude=41.3 + i / 100, longitude=69.2 + i / 100,
+            )
+            for i in range(3)
+        ]
+        cls.shelter = cls.shelters[0]
+
+        cls.animals = [
+            BookAnimal.objects.create(
+                name=f'Hayvon {i}', animal_type=['dog', 'cat', 'bird'][i % 3],
+                location='Toshkent', description='Mehribon', user=cls.owner,
+                shelter=cls.shelter, is_for_sale=bool(i % 2),
+            )
+            for i in range(8)
+        ]
+        cls.animal = cls.animals[0]
+        for i in range(3):
+            AnimalImage.objects.create(animal=cls.animal, image=f'animal_gallery/{i}.jpg')
+
+        cls.vets = [
+            Veterinarian.objects.create(
+                name=f'Klinika {i}', clinic_type='clinic', description='Tavsif',
+                address='Toshkent', phone_number='+998901234567', services='general,surgery',
+                working_hours='Du-Sha 9:00-18:00', director='Shifokor',
+                latitude=41.3 + i / 100, longitude=69.2 + i / 100,
+            )
+            for i in range(4)
+        ]
+        cls.vet = cls.vets[0]
+
+        for user in (cls.owner, cls.donor):
+            Review.objects.create(user=user, veterinarian=cls.vet, rating=5, comment='Yaxshi')
+            Review.objects.create(user=user, shelter=cls.shelter, rating=4, comment='Yaxshi')
+
+        cls.donations = [
+            Donation.objects.create(
+                donor=cls.donor, shelter=shelter, donation_type='money',
+                amount=10000, status='confirmed',
+            )
+            for shelter in cls.shelters * 2
+        ]
+        cls.adoption_requests = [
+            AdoptionRequest.objects.create(
+                animal=animal, user=cls.donor, message='Iltimos',
+                phone_number='+998901234567', address='Toshkent',
+            )
+            for animal in cls.animals[:4]
+        ]
+        # Ishlayotgan saytda statistika qatori allaqachon mavjud
+        reconcile_site_stats()
+
+    def setUp(self):
+        cache.clear()
+
+    def cases(self):
+        """URL nomi -> (manzil, foydalanuvchi, kutilgan status)"""
+        animal, shelter, vet = self.animal, self.shelter, self.vet
+        return {
+            'home': (reverse('home'), None, 200),
+            'animals_list': (reverse('animals_list'), None, 200),
+            'my_animals': (reverse('my_animals'), self.owner, 200),
+            'add_animal': (reverse('add_animal'), self.owner, 200),
+            'add_animal_info': (reverse('add_animal_info'), self.owner, 200),
+            'animal_detail': (reverse('animal_detail', args=[animal.pk]), self.owner, 200),
+            'edit_animal': (reverse('edit_animal', args=[animal.pk]), self.owner, 200),
+            'delete_animal': (reverse('delete_animal', args=[animal.pk]), self.owner, 200),
+            'request_adoption': (reverse('request_adoption', args=[animal.pk]), self.visitor, 200),
+            'shelters_list': (reverse('shelters_list'), None, 200),
+            'shelter_create': (reverse('shelter_create'), self.staff, 200),
+            'shelter_detail': (reverse('shelter_detail', args=[shelter.pk]), None, 200),
+            'donate_to_shelter': (reverse('donate_to_shelter', args=[shelter.pk]), self.donor, 200),
+            'veterinarians_list': (reverse('veterinarians_list'), None, 200),
+            'veterinarian_detail': (reverse('veterinarian_detail', args=[vet.pk]), None, 200),
+            'donations_list': (reverse('donations_list'), self.donor, 200),
+            'create_donation': (reverse('create_donation'), self.donor, 200),
+            'donation_detail': (reverse('donation_detail', args=[self.donations[0].pk]), self.donor, 200),
+            'about': (reverse('about'), None, 200),
+            'contact': (reverse('contact'), None, 200),
+            'faq': (reverse('faq'), None, 200),
+            'terms': (reverse('terms'), None, 200),
+            'privacy': (reverse('privacy'), None, 200),
+            'profile': (reverse('profile'), self.donor, 200),
+            'add_review': (reverse('add_review', args=['veterinarian', vet.pk]), self.visitor, 200),
+            'manage_adoption_request': (
+                reverse('manage_adoption_request', args=[self.adoption_requests[0].pk, 'approve']),
+                self.owner, 302,
+            ),
+            'login': (reverse('login'), None, 200),
+            'register': (reverse('register'), None, 200),
+            'logout': (reverse('logout'), self.owner, 302),
+            'api_list': (reverse('api_list', args=['animals']), None, 200),
+            'api_detail': (reverse('api_detail', args=['shelters', shelter.pk]), None, 200),
+            'api_export': (reverse('api_export', args=['veterinarians']), None, 200),
+        }
+
+    def assertWithinBudget(self, name, url, user, status):
+        budget = get_query_budget(resolve(url).func)
+        self.assertIsNotNone(budget, f"{name}: view uchun @query_budget belgilanmagan")
+        if user is not None:
+            self.client.force_login(user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.client.logout()
+        self.assertEqual(response.status_code, status, name)
+        queries = '\n'.join(f"  {q['sql']}" for q in ctx.captured_queries)
+        self.assertLessEqual(
+            len(ctx), budget,
+            f"{name}: {len(ctx)} ta so'rov (byudjet: {budget})\n{queries}"
+        )
+
+    def test_every_url_has_a_case(self):
+        names = {
+            pattern.name
+            for module in (animals_urls, users_urls)
+            for pattern in module.urlpatterns
+            if isinstance(pattern, URLPattern)
+        }
+        self.assertEqual(names - set(self.cases()), set())
+
+    def test_query_budgets(self):
+        for name, (url, user, status) in self.cases().items():
+            with self.subTest(name):
+                cache.clear()
+                self.assertWithinBudget(name, url, user, status)
+
+    def test_query_budgets_with_warm_cache(self):
+        # Ikkinchi so'rov keshdan (home, veterinariyalar ro'yxati) - byudjet baribir saqlanadi
+        for name in ('home', 'veterinarians_list'):
+            url, user, status = self.cases()[name]
+            self.client.get(url)
+            with self.subTest(name):
+                self.assertWithinBudget(name, url, user, status)
+
+    @override_settings(DEBUG=True, QUERY_BUDGET_RAISE=False)
+    def test_middleware_logs_exceeded_budget(self):
+        with mock.patch.object(views.faq_view, 'query_budget', 0), \
+                self.assertLogs('animals.query_budget', level='WARNING') as logs:
+            self.client.force_login(self.owner)
+            self.client.get(reverse('faq'))
+        self.assertIn("byudjet: 0", logs.output[0])
+
+    @override_settings(DEBUG=True, QUERY_BUDGET_RAISE=True)
+    def test_middleware_raises_exceeded_budget(self):
+        self.client.force_login(self.owner)
+        with mock.patch.object(views.faq_view, 'query_budget', 0):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse('faq'))
+
+
+# ==================== SHARTLI GET (ETAG) ====================
+
+class ConditionalDetailTests(TestCase):
+    """Detail sahifalar o'zgarmagan bo'lsa 304 qaytaradi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(username='etag_owner', password='x')
+        cls.other = CustomUser.objects.create_user(username='etag_other', password='x')
+        cls.shelter = Shelter.objects.create(
+            name='Boshpana', shelter_type='state', description='Tavsif', address='Toshkent',
+            phone_number='+998901234567', capacity=50, director='Direktor',
+        )
+        cls.animal = BookAnimal.objects.create(
+            name='Rex', animal_type='dog', location='Toshkent', description='d', user=cls.owner,
+            shelter=cls.shelter,
+        )
+        cls.donation = Donation.objects.create(
+            donor=cls.owner, shelter=cls.shelter, donation_type='money', amount=1000, status='confirmed',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def revalidate(self, url):
+        # Birinchi javob CSRF cookie o'rnatishi mumkin - u ETag ga kiradi
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('must-revalidate', response['Cache-Control'])
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_page_returns_304(self):
+        for url in (reverse('animal_detail', args=[self.animal.pk]),
+                    reverse('shelter_detail', args=[self.shelter.pk])):
+            with self.subTest(url):
+                self.assertEqual(self.revalidate(url).status_code, 304)
+
+    def test_related_change_invalidates_etag(self):
+        url = reverse('animal_detail', args=[self.animal.pk])
+        etag = self.client.get(url)['ETag']
+        AnimalImage.objects.create(animal=self.animal, image='animal_gallery/new.jpg')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_only_etag_is_used(self):
+        url = reverse('animal_detail', args=[self.animal.pk])
+        self.client.force_login(self.owner)
+        self.client.get(url)
+        adoption = AdoptionRequest.objects.create(
+            animal=self.animal, user=self.other, message='Salom', phone_number='+998901234567', address='-',
+        )
+        response = self.client.get(url)
+        self.assertFalse(response.has_header('Last-Modified'))
+        # O'chirilgan qator hech qanday vaqtni oldinga surmaydi - faqat ETag o'zgaradi
+        adoption.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT').status_code, 200
+        )
+
+    def test_etag_depends_on_user(self):
+        url = reverse('animal_detail', args=[self.animal.pk])
+        etag = self.client.get(url)['ETag']
+        self.client.force_login(self.owner)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_forbidden_donation_is_not_revalidated(self):
+        url = reverse('donation_detail', args=[self.donation.pk])
+        self.client.force_login(self.owner)
+        self.assertEqual(self.revalidate(url).status_code, 304)
+        self.client.force_login(self.other)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(response.has_header('ETag'))
+
+
+# ==================== MEDIA FAYLLAR ====================
+
+class ContentAddressedStorageTests(TestCase):
+    """Bir xil rasm bir marta saqlanadi va oxirgi havola o'chganda o'chiriladi"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.owner = CustomUser.objects.create_user(username='blob_owner', password='x')
+
+    def animal(self, content, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return BookAnimal.objects.create(
+                name='Rex', animal_type='dog', location='Toshkent', description='d',
+                user=self.owner, image=ContentFile(content, name='rex.JPG'), **kwargs
+            )
+
+    def delete(self, obj):
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.delete()
+
+    def test_same_content_is_stored_once(self):
+        first = self.animal(b'same bytes')
+        second = self.animal(b'same bytes')
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertRegex(first.image.name, r'^blobs/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$')
+        self.assertEqual(MediaBlob.objects.get().ref_count, 2)
+
+        self.delete(first)
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
+        self.assertTrue(content_storage.exists(second.image.name))
+
+        self.delete(second)
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertFalse(content_storage.exists(second.image.name))
+
+    def test_replaced_image_releases_old_blob(self):
+        animal = self.animal(b'old bytes')
+        old_name = animal.image.name
+        with self.captureOnCommitCallbacks(execute=True):
+            animal.image = ContentFile(b'new bytes', name='rex.jpg')
+            animal.save()
+        self.assertFalse(content_storage.exists(old_name))
+        self.assertEqual(list(MediaBlob.objects.values_list('name', 'ref_count')),
+                         [(animal.image.name, 1)])
+
+    def test_released_blob_forgets_renditions(self):
+        cache.clear()
+        content = jpeg_bytes()
+        animal = self.animal(content)
+        name = animal.image.name
+        self.assertTrue(renditions.has_renditions(animal.image))
+
+        self.delete(animal)
+        self.assertFalse(content_storage.exists(renditions.rendition_names(name)[-1]))
+        # Holat umumiy keshda - boshqa worker ham eski natijani olmaydi
+        self.assertFalse(renditions.has_renditions(animal.image))
+
+        # Xuddi shu kontent qayta yuklanadi - nom o'sha, nusxalar yangidan yaratiladi
+        animal = self.animal(content)
+        self.assertEqual(animal.image.name, name)
+        for rendition in renditions.rendition_names(name):
+            self.assertTrue(content_storage.exists(rendition), rendition)
+        self.assertTrue(renditions.has_renditions(animal.image))
+
+
+class MediaServingTests(TestCase):
+    """MEDIA_URL ostidagi fayllar: Range, shartli GET va kesh sarlavhalari"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.name = content_storage.save('photo.jpg', ContentFile(b'0123456789'))
+        self.url = f'/media/{self.name}'
+
+    def test_full_file_is_immutable(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_request(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-3')
+        self.assertEqual(b''.join(response.streaming_content), b'789')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=20-')
+        self.assertEqual(response.status_code, 416)
+
+    @override_settings(MEDIA_X_ACCEL_REDIRECT='/protected-media/')
+    def test_accel_redirect(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.name}')
+        self.assertEqual(response.content, b'')
+
+    def test_path_outside_media_root(self):
+        self.assertEqual(self.client.get('/media/a/%2e%2e/%2e%2e/manage.py').status_code, 404)
+        self.assertEqual(self.client.get('/media/blobs/').status_code, 404)
+
+
+class PrivateMediaTests(TestCase):
+    """Xayriya cheklari va qayta ishlanmagan yuklamalar ochiq berilmaydi"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        for name in ('donation_receipts/receipt.jpg', 'uploads/pending/original.jpg'):
+            default_storage.save(name, ContentFile(b'0123456789'))
+
+        self.donor = CustomUser.objects.create_user(username='receipt_donor', password='x')
+        shelter = Shelter.objects.create(
+            name='Boshpana', shelter_type='state', description='Tavsif', address='Toshkent',
+            phone_number='+998901234567', capacity=50, director='Direktor',
+        )
+        Donation.objects.create(donor=self.donor, shelter=shelter, donation_type='money', amount=100,
+                                receipt_image='donation_receipts/receipt.jpg')
+        self.url = '/media/donation_receipts/receipt.jpg'
+
+    def test_receipt_not_served_anonymously(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('public', response.get('Cache-Control', ''))
+
+        self.client.force_login(CustomUser.objects.create_user(username='stranger', password='x'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_receipt_served_privately_to_donor_and_staff(self):
+        self.client.force_login(self.donor)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotIn('public', response['Cache-Control'])
+
+        staff = CustomUser.objects.create_user(username='staff', password='x', is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_pending_upload_never_served(self):
+        self.client.force_login(CustomUser.objects.create_superuser(username='root', password='x'))
+        self.assertEqual(self.client.get('/media/uploads/pending/original.jpg').status_code, 404)
+        self.assertEqual(self.client.get('/media/blobs/../uploads/pending/original.jpg').status_code, 404)
+
+
+# ==================== O'QISH REPLIKASI ====================
+
+@mock.patch('animals.routers.replica_available', return_value=True)
+class ReadReplicaTests(TestCase):
+    """'replica' bazasi bor deb hisoblanadi - yo'naltirish va bog'lash mantiqi tekshiriladi"""
+
+    def test_router(self, _):
+        router = routers.ReplicaRouter()
+        self.assertEqual(router.db_for_read(BookAnimal), 'default')
+        with routers.use_replica():
+            self.assertEqual(router.db_for_read(BookAnimal), 'replica')
+            self.assertEqual(router.db_for_read(Session), 'default')
+            self.assertEqual(router.db_for_write(BookAnimal), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'animals'))
+
+    def test_read_replica_view(self, _):
+        view = routers.read_replica(lambda request: routers.reading_from_replica())
+        factory = RequestFactory()
+        self.assertTrue(view(factory.get('/')))
+        self.assertFalse(view(factory.post('/')))
+        pinned = factory.get('/')
+        pinned.COOKIES[routers.PIN_COOKIE] = '1'
+        self.assertFalse(view(pinned))
+
+    def test_write_pins_to_primary(self, _):
+        response = self.client.get(reverse('contact'))
+        self.assertNotIn(routers.PIN_COOKIE, response.cookies)
+        response = self.client.post(reverse('contact'), {})
+        self.assertEqual(response.cookies[routers.PIN_COOKIE]['max-age'], routers.pin_seconds())
+
+    def test_stale_replica_result_not_cached(self, _):
+        caching.invalidate_tags('animal:*')
+        key = caching.make_key('replica-test')
+        with routers.use_replica():
+            caching.get_or_set(key, ['animal:*'], lambda: 'eski')
+        self.assertEqual(caching.get_or_set(key, ['animal:*'], lambda: 'yangi'), 'yangi')
+
+
+# ==================== ASYNC VIEW'LAR (ASGI) ====================
+
+class AsyncURLConf:
+    """ASYNC_VIEWS=1 dagidek: o'qish sahifalari async_views dan"""
+    urlpatterns = [
+        path('', async_views.home_view, name='home'),
+        path('animals/', async_views.animals_list_view, name='animals_list'),
+        path('animals/<int:pk>/', async_views.animal_detail_view, name='animal_detail'),
+        path('shelters/', async_views.shelters_list_view, name='shelters_list'),
+        path('veterinarians/', async_views.veterinarians_list_view, name='veterinarians_list'),
+        path('', include('config.urls')),
+    ]
+
+
+@override_settings(ROOT_URLCONF=AsyncURLConf)
+class AsyncQueryBudgetTests(QueryBudgetTests):
+    """Xuddi shu byudjetlar, o'qish sahifalari async_views dan"""
+
+
+@override_settings(ROOT_URLCONF=AsyncURLConf)
+class AsyncViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(username='async_owner', password='x')
+        cls.shelter = Shelter.objects.create(
+            name='Async boshpana', shelter_type='state', description='Tavsif', address='Toshkent',
+            phone_number='+998901234567', capacity=50, director='Direktor',
+        )
+        cls.animal = BookAnimal.objects.create(
+            name='Reksik', animal_type='dog', location='Toshkent', description='d', user=cls.owner,
+            shelter=cls.shelter,
+        )
+        AdoptionRequest.objects.create(
+            animal=cls.animal, user=cls.owner, message='Salom', phone_number='+998901234567', address='-',
+        )
+        Veterinarian.objects.create(
+            name='Async klinika', clinic_type='clinic', description='Tavsif', address='Toshkent',
+            phone_number='+998901234567', services='general', working_hours='24/7', director='Shifokor',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_read_pages(self):
+        pages = {
+            '/': 'Reksik',
+            f'/animals/{self.animal.pk}/': 'Reksik',
+            '/shelters/': 'Async boshpana',
+            '/veterinarians/': 'Async klinika',
+        }
+        for url, text in pages.items():
+            with self.subTest(url):
+                self.assertTrue(iscoroutinefunction(resolve(url).func))
+                self.assertContains(await self.async_client.get(url), text)
+        self.assertEqual((await self.async_client.get('/animals/999999/')).status_code, 404)
+
+    async def test_animals_list(self):
+        # animals/list.html hozircha hayvon nomlarini chiqarmaydi - kontekst tekshiriladi
+        self.assertTrue(iscoroutinefunction(resolve('/animals/').func))
+        for query, names in (('', ['Reksik']), ('?search=Reksik', ['Reksik']), ('?search=Yo%27q', [])):
+            with self.subTest(query):
+                response = await self.async_client.get(f'/animals/{query}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context['total_count'], len(names))
+                self.assertEqual([animal.name for animal in response.context['page_obj']], names)
+        response = await self.async_client.get('/animals/', {'page': '1'})
+        self.assertEqual((response.context['page_obj'].paginator.count, response.context['dogs_count']), (1, 1))
+
+    async def test_owner_sees_requests_and_etag(self):
+        await self.async_client.aforce_login(self.owner)
+        url = f'/animals/{self.animal.pk}/'
+        # Birinchi javob CSRF cookie o'rnatadi - u ETag ga kiradi
+        await self.async_client.get(url)
+        response = await self.async_client.get(url)
+        self.assertEqual([r.message async for r in response.context['adoption_requests']], ['Salom'])
+        response = await self.async_client.get(url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+
+# ==================== JSON API ====================
+
+class ApiTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = CustomUser.objects.create_user(username='api_owner', password='x')
+        cls.shelter = Shelter.objects.create(
+            name='API boshpana', shelter_type='state', description='Tavsif', address='Toshkent',
+            phone_number='+998901234567', capacity=50, director='Direktor',
+        )
+        cls.animals = [
+            BookAnimal.objects.create(
+                name=f'Hayvon {i}', animal_type=['dog', 'cat'][i % 2], location='Toshkent',
+                description='Uzun tavsif', user=owner, shelter=cls.shelter, is_for_sale=bool(i % 2),
+            )
+            for i in range(5)
+        ]
+
+    def test_sparse_fields_and_cursor(self):
+        url = reverse('api_list', args=['animals'])
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(url, {'fields': 'name,shelter', 'limit': 2}).json()
+        self.assertEqual(data['results'][0], {'id': self.animals[-1].pk, 'name': 'Hayvon 4',
+                                              'shelter': self.shelter.pk})
+        # .only(): tavsif ustuni o'qilmaydi
+        self.assertNotIn('"description"', ctx.captured_queries[0]['sql'])
+
+        names = [row['name'] for row in data['results']]
+        while data['next']:
+            data = self.client.get(data['next']).json()
+            names.extend(row['name'] for row in data['results'])
+        self.assertEqual(names, [f'Hayvon {i}' for i in reversed(range(5))])
+
+    def test_cursor_past_the_end_links_to_first_page(self):
+        url = reverse('api_list', args=['animals'])
+        cursor = encode_cursor(self.animals[0], NEXT)
+        data = self.client.get(url, {'animal_type': 'dog', 'cursor': cursor}).json()
+        self.assertEqual((data['results'], data['next']), ([], None))
+        self.assertEqual(data['previous'], f'http://testserver{url}?animal_type=dog')
+        first = self.client.get(data['previous']).json()
+        self.assertEqual([row['name'] for row in first['results']], ['Hayvon 4', 'Hayvon 2', 'Hayvon 0'])
+
+    def test_filters_and_errors(self):
+        url = reverse('api_list', args=['animals'])
+        data = self.client.get(url, {'animal_type': 'cat', 'is_for_sale': 'true'}).json()
+        self.assertEqual([row['name'] for row in data['results']], ['Hayvon 3', 'Hayvon 1'])
+        self.assertEqual(self.client.get(url, {'fields': 'user'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'is_for_sale': 'ha'}).status_code, 400)
+        for shelter in ('999999999999999999999999999999', '9223372036854775808', '²', '-1'):
+            with self.subTest(shelter=shelter):
+                self.assertEqual(self.client.get(url, {'shelter': shelter}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'shelter': '9223372036854775807'}).json()['results'], [])
+        self.assertEqual(self.client.get(reverse('api_list', args=['users'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('api_detail', args=['animals', 0])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('api_detail', args=['animals', 10 ** 30])).status_code, 404)
+
+    def test_ndjson_export(self):
+        response = self.client.get(reverse('api_export', args=['animals']), {'fields': 'name'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines],
+                         [{'id': animal.pk, 'name': animal.name} for animal in self.animals])
+
+    @override_settings(ROOT_URLCONF=AsyncURLConf)
+    async def test_ndjson_export_asgi(self):
+        response = await self.async_client.get(reverse('api_export', args=['shelters']))
+        lines = [line async for line in response.streaming_content]
+        self.assertEqual(json.loads(b''.join(lines))['name'], 'API boshpana')
+
+
+# ==================== REYESTR IMPORTI ====================
+
+class ImportDirectoryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        CustomUser.objects.create_user(username='registry', password='x')
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write(self, name, text):
+        path = f'{self.directory}/{name}'
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        return path
+
+    def run_import(self, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_directory', *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_csv_upsert_and_row_errors(self):
+        header = 'external_id,name,shelter_type,description,address,phone_number,capacity,director\n'
+        path = self.write('shelters.csv', header + (
+            'SH-1,Birinchi,state,Tavsif,Toshkent,+998901234567,50,Direktor\n'
+            'SH-2,Ikkinchi,private,Tavsif,Samarqand,+998901234568,ko\'p,Direktor\n'
+            ',Nomsiz,state,Tavsif,Buxoro,+998901234569,10,Direktor\n'
+        ))
+        stdout, stderr = self.run_import('shelters', path)
+        self.assertIn('3 qator: 1 ta yangi, 0 ta yangilandi, 2 ta xato', stdout)
+        self.assertIn(f'{path}:3: capacity:', stderr)
+        self.assertIn(f'{path}:4: external_id:', stderr)
+        self.assertEqual(SiteStats.load().active_shelters, 1)
+
+        path = self.write('shelters.csv', header + (
+            'SH-1,Yangi nom,state,Tavsif,Toshkent,+998901234567,60,Direktor\n'
+            'SH-2,Ikkinchi,private,Tavsif,Samarqand,+998901234568,30,Direktor\n'
+        ))
+        stdout, _ = self.run_import('shelters', path, '--batch-size', '1')
+        self.assertIn('1 ta yangi, 1 ta yangilandi, 0 ta xato', stdout)
+        self.assertEqual(Shelter.objects.get(external_id='SH-1').name, 'Yangi nom')
+        self.assertEqual(Shelter.objects.count(), 2)
+
+    def test_jsonl_animals_and_veterinarians(self):
+        shelter = Shelter.objects.create(
+            name='Boshpana', shelter_type='state', description='Tavsif', address='Toshkent',
+            phone_number='+998901234567', capacity=50, director='Direktor', external_id='SH-1',
+        )
+        path = self.write('animals.jsonl', '\n'.join(json.dumps(row) for row in [
+            {'external_id': 'A-1', 'name': 'Reksik', 'animal_type': 'dog', 'location': 'Toshkent',
+             'description': 'd', 'shelter': 'SH-1'},
+            {'external_id': 'A-2', 'name': 'Mosh', 'animal_type': 'cat', 'location': 'Toshkent',
+             'description': 'd', 'shelter': 'SH-404'},
+            {'external_id': 'A-3', 'name': 'Ajdar', 'animal_type': 'dragon', 'location': 'Toshkent'},
+        ]) + '\n')
+        stdout, stderr = self.run_import('animals', path, '--owner', 'registry', '--workers', '2')
+        self.assertIn('1 ta yangi, 0 ta yangilandi, 2 ta xato', stdout)
+        self.assertIn("shelter: 'SH-404' reyestrda topilmadi", stderr)
+        self.assertIn('animal_type:', stderr)
+        animal = BookAnimal.objects.get(external_id='A-1')
+        self.assertEqual((animal.shelter, animal.user.username), (shelter, 'registry'))
+        shelter.refresh_from_db()
+        self.assertEqual(shelter.current_animals, 1)
+
+        path = self.write('vets.jsonl', json.dumps({
+            'external_id': 'V-1', 'name': 'Klinika', 'clinic_type': 'clinic', 'description': 'd',
+            'address': 'Toshkent', 'phone_number': '+998901234567', 'services': 'surgery, dental',
+            'working_hours': '24/7', 'director': 'Direktor',
+        }) + '\n')
+        self.run_import('veterinarians', path)
+        vet = Veterinarian.objects.get(external_id='V-1')
+        self.assertEqual(set(vet.service_links.values_list('service', flat=True)), {'surgery', 'dental'})
+        self.assertEqual(vet.opening_intervals.count(), 1)
+
+    def test_new_row_needs_required_columns(self):
+        Shelter.objects.create(
+            name='Eski', shelter_type='state', description='Tavsif', address='Toshkent',
+            phone_number='+998901234567', capacity=50, director='Direktor', external_id='SH-1',
+        )
+        path = self.write('shelters.jsonl', '\n'.join(json.dumps(row) for row in [
+            # Mavjud yozuv - faqat nom yangilanadi
+            {'external_id': 'SH-1', 'name': 'Yangi nom'},
+            # Yangi yozuv - capacity (NOT NULL) va matn ustunlari yo'q
+            {'external_id': 'X1', 'name': 'Only name'},
+            {'external_id': 'X2', 'name': 'Sig\'imli', 'capacity': 10},
+        ]) + '\n')
+        stdout, stderr = self.run_import('shelters', path)
+        self.assertIn('3 qator: 0 ta yangi, 1 ta yangilandi, 2 ta xato', stdout)
+        self.assertIn(f'{path}:2: ', stderr)
+        self.assertIn('capacity:', stderr)
+        self.assertIn(f'{path}:3: ', stderr)
+        self.assertIn('address:', stderr.splitlines()[1])
+        self.assertEqual(list(Shelter.objects.values_list('external_id', 'name')), [('SH-1', 'Yangi nom')])
+
+    def test_database_error_fails_only_its_batch(self):
+        header = 'external_id,name,shelter_type,description,address,phone_number,capacity,director\n'
+        path = self.write('shelters.csv', header + (
+            'SH-1,Birinchi,state,Tavsif,Toshkent,+998901234567,50,Direktor\n'
+            'SH-2,Ikkinchi,state,Tavsif,Toshkent,+998901234567,50,Direktor\n'
+        ))
+        upsert_batch = importing.upsert_batch
+
+        def fail_first(kind, rows, *args):
+            if rows[0].values['external_id'] == 'SH-1':
+                raise IntegrityError('UNIQUE constraint failed')
+            return upsert_batch(kind, rows, *args)
+
+        with mock.patch('animals.importing.upsert_batch', side_effect=fail_first):
+            stdout, stderr = self.run_import('shelters', path, '--batch-size', '1')
+        self.assertIn('1 ta yangi, 0 ta yangilandi, 1 ta xato', stdout)
+        self.assertIn(f"{path}:2: bo'lak bazaga yozilmadi: UNIQUE constraint failed", stderr)
+        self.assertEqual(list(Shelter.objects.values_list('external_id', flat=True)), ['SH-2'])
+
+
+# ==================== QIDIRUV (FTS5) ====================
+
+class SearchIndexTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(username='search_owner', password='x')
+
+    def setUp(self):
+        if not search.is_enabled():
+            self.skipTest("FTS5 indeksi faqat SQLite uchun")
+
+    def create(self, name, description='', **kwargs):
+        return BookAnimal.objects.create(
+            name=name, animal_type='dog', location='Toshkent', description=description,
+            user=self.owner, **kwargs,
+        )
+
+    def found(self, query):
+        return list(search.search_animals(BookAnimal.objects.all(), query).values_list('name', flat=True))
+
+    def test_index_follows_save_and_delete(self):
+        animal = self.create('Reksik')
+        self.assertEqual(self.found('reks'), ['Reksik'])
+        animal.name = 'Bobik'
+        animal.save()
+        self.assertEqual(self.found('reksik'), [])
+        self.assertEqual(self.found('bobik'), ['Bobik'])
+        animal.delete()
+        self.assertEqual(self.found('bobik'), [])
+
+    def test_bm25_ranks_name_above_description(self):
+        self.create('Oddiy', description='Bu it Laykaga o\'xshaydi')
+        self.create('Layka')
+        self.assertEqual(self.found('layka'), ['Layka', 'Oddiy'])
+        # Belgilar MATCH sintaksisiga aralashmaydi
+        self.assertEqual(self.found('"layka*'), ['Layka', 'Oddiy'])
+        self.assertEqual(self.found('!!!'), [])
+
+    def test_index_joined_once_and_survives_aliasing(self):
+        self.create('Layka')
+        self.create('Bobik', description='Layka bilan do\'st')
+        results = search.search_animals(BookAnimal.objects.all(), 'layka')
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual([animal.name for animal in results], ['Layka', 'Bobik'])
+        sql = ctx.captured_queries[0]['sql']
+        self.assertEqual(sql.count('MATCH'), 1)
+        self.assertEqual(sql.count('JOIN "animals_bookanimal_fts"'), 1)
+        # Ichki so'rov sifatida jadval taxallus (U0) oladi
+        nested = BookAnimal.objects.filter(pk__in=results.values('pk')).order_by('name')
+        self.assertEqual([animal.name for animal in nested], ['Bobik', 'Layka'])
+
+    def test_rebuild_after_bulk_update(self):
+        animal = self.create('Reksik')
+        BookAnimal.objects.filter(pk=animal.pk).update(name='Sharik')
+        self.assertEqual(self.found('sharik'), [])
+        self.assertEqual(search.rebuild_index(), 1)
+        self.assertEqual(self.found('sharik'), ['Sharik'])
+
+
+# ==================== FACETLAR ====================
+
+class FacetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = CustomUser.objects.create_user(username='facet_owner', password='x')
+        BookAnimal.objects.bulk_create([
+            BookAnimal(
+                name=f'Hayvon {i}', animal_type=['dog', 'cat', 'bird', 'fish', 'dog'][i % 5],
+                location='Toshkent', user=owner, is_for_sale=bool(i % 2),
+                gender=['male', 'female', 'unknown', None][i % 4],
+                vaccinated=bool(i % 3), sterilized=i % 7 == 0,
+                status='available' if i % 6 else 'adopted',
+            )
+            for i in range(60)
+        ])
+
+    def assertMatchesSeparateCounts(self, queryset):
+        with self.assertNumQueries(1):
+            facets = count_facets(queryset, extra_fields=EXTRA_FACET_FIELDS)
+        self.assertEqual(facets.total, queryset.count())
+        self.assertEqual(facets.free, queryset.filter(is_for_sale=False).count())
+        self.assertEqual(facets.paid, queryset.filter(is_for_sale=True).count())
+        self.assertEqual(facets.dogs, queryset.filter(animal_type='dog').count())
+        self.assertEqual(facets.cats, queryset.filter(animal_type='cat').count())
+        self.assertEqual(facets.not_dogs_or_cats,
+                         queryset.exclude(animal_type__in=['dog', 'cat']).count())
+        for code, _label in BookAnimal.ANIMAL_TYPES:
+            self.assertEqual(facets.by_type[code], queryset.filter(animal_type=code).count())
+        for value, _label in BookAnimal.GENDER_CHOICES:
+            self.assertEqual(facets.extra['gender'][value], queryset.filter(gender=value).count())
+        for name in ('vaccinated', 'sterilized'):
+            for value in (True, False):
+                self.assertEqual(facets.extra[name][value], queryset.filter(**{name: value}).count())
+
+    def test_counts_match_per_filter_counts(self):
+        self.assertMatchesSeparateCounts(BookAnimal.objects.all())
+        self.assertMatchesSeparateCounts(
+            BookAnimal.objects.filter(status='available', is_for_sale=False).order_by('-created_at')
+        )
+        self.assertMatchesSeparateCounts(BookAnimal.objects.filter(name='Yo\'q'))
+
+    def test_unknown_extra_field(self):
+        with self.assertRaises(ValueError):
+            count_facets(BookAnimal.objects.all(), extra_fields=['name'])
+
+
+# ==================== KURSOR PAGINATION ====================
+
+class CursorPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = CustomUser.objects.create_user(username='cursor_owner', password='x')
+        for i in range(7):
+            BookAnimal.objects.create(name=f'Hayvon {i}', animal_type='dog', location='Toshkent', user=owner)
+        # Bir xil created_at: tartib id bo'yicha hal qilinadi
+        tied = BookAnimal.objects.order_by('id')[2:5].values_list('pk', flat=True)
+        moment = BookAnimal.objects.get(pk=tied[0]).created_at
+        BookAnimal.objects.filter(pk__in=list(tied)).update(created_at=moment)
+        cls.expected = list(BookAnimal.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+
+    def paginator(self):
+        return CursorPaginator(BookAnimal.objects.all(), 3)
+
+    def pks(self, page):
+        return [animal.pk for animal in page]
+
+    def test_next_and_previous_round_trip(self):
+        paginator = self.paginator()
+        page = paginator.get_page()
+        self.assertFalse(page.has_previous())
+        pages = [self.pks(page)]
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor)
+            pages.append(self.pks(page))
+        # Hech bir yozuv tushib qolmaydi va takrorlanmaydi (teng created_at ham)
+        self.assertEqual(sum(pages, []), self.expected)
+        self.assertEqual([len(p) for p in pages], [3, 3, 1])
+        self.assertFalse(page.has_next())
+
+        back = []
+        while page.has_previous():
+            page = paginator.get_page(page.previous_cursor)
+            back.append(self.pks(page))
+        self.assertEqual(back, pages[-2::-1])
+        self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+
+    def test_cursor_past_the_end(self):
+        last = BookAnimal.objects.get(pk=self.expected[-1])
+        page = self.paginator().get_page(encode_cursor(last, NEXT))
+        self.assertEqual((list(page), page.has_next(), page.has_previous()), ([], False, True))
+        # Bo'sh sahifadan orqaga - birinchi sahifa
+        self.assertEqual(self.pks(self.paginator().get_page(page.previous_cursor)), self.expected[:3])
+
+    def test_tampered_cursor_returns_first_page(self):
+        first = self.pks(self.paginator().get_page())
+        tampered = [
+            'bm90LWpzb24', '!!!', 'eyJjIjoxfQ',
+            # {"c":"2020-01-01T00:00:00+00:00","i":1,"d":"x"}
+            'eyJjIjoiMjAyMC0wMS0wMVQwMDowMDowMCswMDowMCIsImkiOjEsImQiOiJ4In0',
+            # id 64-bit dan katta
+            'eyJjIjoiMjAyMC0wMS0wMVQwMDowMDowMCswMDowMCIsImkiOjEwMDAwMDAwMDAwMDAwMDAwMDAwMDAwLCJkIjoibiJ9',
+            # vaqt zonasisiz sana
+            'eyJjIjoiMjAyMC0wMS0wMVQwMDowMDowMCIsImkiOjEsImQiOiJuIn0',
+        ]
+        for cursor in tampered:
+            with self.subTest(cursor):
+                self.assertEqual(self.pks(self.paginator().get_page(cursor)), first)
+
+
+# ==================== SAYT STATISTIKASI ====================
+
+class SiteStatsTests(TestCase):
+
+    COUNTERS = ('available_animals', 'free_animals', 'paid_animals', 'dogs_count', 'cats_count',
+                'other_animals')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(username='stats_owner', password='x')
+
+    def counters(self):
+        stats = SiteStats.objects.get()
+        return {name: getattr(stats, name) for name in self.COUNTERS}
+
+    def assertReconciled(self):
+        # F() bilan yuritilgan qiymatlar noldan hisoblanganiga teng
+        current = self.counters()
+        reconcile_site_stats()
+        self.assertEqual(current, self.counters())
+
+    def test_create_change_and_delete(self):
+        reconcile_site_stats()
+        animal = BookAnimal.objects.create(name='Reksik', animal_type='dog', location='Toshkent',
+                                           user=self.owner)
+        self.assertEqual(self.counters(), {**dict.fromkeys(self.COUNTERS, 0),
+                                           'available_animals': 1, 'free_animals': 1, 'dogs_count': 1})
+        animal.animal_type = 'cat'
+        animal.is_for_sale = True
+        animal.save()
+        self.assertEqual(self.counters(), {**dict.fromkeys(self.COUNTERS, 0),
+                                           'available_animals': 1, 'paid_animals': 1, 'cats_count': 1})
+        self.assertReconciled()
+        animal.status = 'adopted'
+        animal.save()
+        self.assertEqual(self.counters(), dict.fromkeys(self.COUNTERS, 0))
+        animal.status = 'available'
+        animal.save()
+        animal.delete()
+        self.assertEqual(self.counters(), dict.fromkeys(self.COUNTERS, 0))
+
+    def test_missing_row_is_rebuilt_after_commit(self):
+        BookAnimal.objects.create(name='Mosh', animal_type='bird', location='Toshkent', user=self.owner)
+        SiteStats.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_delta({}, {'available_animals': 1})
+            self.assertFalse(SiteStats.objects.exists())
+        self.assertEqual(self.counters()['other_animals'], 1)
+
+    def test_stored_row_read_once_per_save(self):
+        animal = BookAnimal.objects.create(name='Reksik', animal_type='dog', location='Toshkent',
+                                           user=self.owner)
+        animal.name = 'Bobik'
+        with CaptureQueriesContext(connection) as ctx:
+            animal.save()
+        reads = [q['sql'] for q in ctx.captured_queries
+                 if q['sql'].startswith('SELECT') and 'FROM "animals_bookanimal"' in q['sql']]
+        self.assertEqual(len(reads), 1, reads)
+
+
+# ==================== TEGLI KESH ====================
+
+class TaggedCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.shelter = Shelter.objects.create(
+            name='Kesh boshpana', shelter_type='state', description='Tavsif', address='Toshkent',
+            phone_number='+998901234567', capacity=50, director='Direktor',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.builds = 0
+
+    def read(self, tags):
+        def build():
+            self.builds += 1
+            return self.builds
+        return caching.get_or_set(caching.make_key('tagged-test', *tags), tags, build)
+
+    def test_save_and_delete_bump_tags(self):
+        for tags in (['shelter:*'], [f'shelter:{self.shelter.pk}']):
+            with self.subTest(tags=tags):
+                first = self.read(tags)
+                self.assertEqual(self.read(tags), first)
+                self.shelter.name = 'Yangi nom'
+                self.shelter.save()
+                self.assertEqual(self.read(tags), first + 1)
+        other = self.read(['veterinarian:*'])
+        builds = self.builds
+        self.shelter.delete()
+        self.assertEqual(self.read(['shelter:*']), builds + 1)
+        # Boshqa teglar tegilmaydi
+        self.assertEqual(self.read(['veterinarian:*']), other)
+
+    def test_stale_write_during_transaction_is_dropped(self):
+        self.read(['animal:*'])
+        owner = CustomUser.objects.create_user(username='cache_owner', password='x')
+        with self.captureOnCommitCallbacks(execute=True):
+            BookAnimal.objects.create(name='Reksik', animal_type='dog', location='Toshkent', user=owner)
+            # Commit'dan oldin boshqa so'rov eski holatni keshga yozdi
+            stale = self.read(['animal:*'])
+        self.assertNotEqual(self.read(['animal:*']), stale)
+
+    def test_review_bumps_rated_object(self):
+        first = self.read([f'shelter:{self.shelter.pk}'])
+        Review.objects.create(shelter=self.shelter, user=CustomUser.objects.create_user(username='r'),
+                              rating=5, comment='Zo\'r')
+        self.assertEqual(self.read([f'shelter:{self.shelter.pk}']), first + 1)
+
+
+# ==================== GEO: GRID INDEKS ====================
+
+class GridIndexTests(TestCase):
+
+    # Toshkent atrofi va uzoq shaharlar
+    POINTS = [
+        (1, 41.3111, 69.2797), (2, 41.3200, 69.2500), (3, 41.2995, 69.2401),
+        (4, 41.3500, 69.3500), (5, 39.6542, 66.9597), (6, 40.7821, 72.3442),
+        (7, 42.4600, 59.6100),
+    ]
+
+    def brute_force(self, lat, lon, k, exclude=()):
+        return sorted(
+            (geo.haversine_km(lat, lon, p_lat, p_lon), pk)
+            for pk, p_lat, p_lon in self.POINTS if pk not in exclude
+        )[:k]
+
+    def test_matches_brute_force(self):
+        index = geo.GridIndex(self.POINTS, cell_deg=0.1)
+        self.assertEqual(len(index), len(self.POINTS))
+        for lat, lon in [(41.31, 69.28), (39.0, 66.0), (45.0, 75.0), (42.46, 59.61)]:
+            for k in (1, 3, len(self.POINTS), 20):
+                with self.subTest(lat=lat, lon=lon, k=k):
+                    result = index.nearest(lat, lon, k)
+                    self.assertEqual(result, self.brute_force(lat, lon, k))
+                    self.assertEqual(result, sorted(result))
+
+    def test_dense_points_match_brute_force(self):
+        rng = random.Random(0)
+        points = [(pk, 41 + rng.random(), 69 + rng.random()) for pk in range(2000)]
+        index = geo.GridIndex(points, cell_deg=0.05)
+        for lat, lon in [(41.5, 69.5), (41.01, 69.99), (40.5, 70.5)]:
+            expected = sorted(
+                (geo.haversine_km(lat, lon, p_lat, p_lon), pk)
+                for pk, p_lat, p_lon in points if pk % 3
+            )[:10]
+            self.assertEqual(index.nearest(lat, lon, 10, exclude={pk for pk, *_ in points if not pk % 3}),
+                             expected)
+
+    def test_exclude_and_empty(self):
+        index = geo.GridIndex(self.POINTS, cell_deg=0.5)
+        result = index.nearest(41.3111, 69.2797, 2, exclude={1})
+        self.assertEqual([pk for _distance, pk in result], [2, 3])
+        self.assertEqual(index.nearest(41.3, 69.2, 0), [])
+        self.assertEqual(geo.GridIndex([]).nearest(41.3, 69.2, 3), [])
+
+    def test_sparse_far_apart_points(self):
+        # Kataklar orasida yuzlab bo'sh halqa
+        points = [(1, -33.86, 151.21), (2, 51.50, -0.12), (3, 41.31, 69.28)]
+        index = geo.GridIndex(points, cell_deg=0.05)
+        self.assertEqual([pk for _d, pk in index.nearest(40.0, 70.0, 2)], [3, 2])
+
+    def test_wide_ring_at_high_latitude(self):
+        # 60-kenglikda o'nlab gradus uzunlikni qamragan halqalar
+        rng = random.Random(1)
+        points = [(pk, 60 + rng.uniform(-2, 2), rng.uniform(-60, 60)) for pk in range(300)]
+        index = geo.GridIndex(points, cell_deg=1)
+        lat, lon = 60.5, 0.5
+        for k in (1, 5, 50):
+            expected = sorted(
+                (geo.haversine_km(lat, lon, p_lat, p_lon), pk) for pk, p_lat, p_lon in points
+            )[:k]
+            self.assertEqual(index.nearest(lat, lon, k), expected)
+        # Quyi chegara halqadan tashqaridagi hech bir nuqtagacha masofadan oshmaydi
+        ci, cj = index._cell(lat, lon)
+        for r in range(0, 60, 5):
+            bound = index._min_distance_outside(lat, lon, r)
+            for _pk, p_lat, p_lon in points:
+                i, j = index._cell(p_lat, p_lon)
+                if max(abs(i - ci), abs(j - cj)) > r:
+                    self.assertLessEqual(bound, geo.haversine_km(lat, lon, p_lat, p_lon))
+
+    def test_model_index_rebuilds_after_max_age(self):
+        vet = Veterinarian.objects.create(
+            name='Klinika', clinic_type='clinic', description='d', address='Toshkent',
+            phone_number='+998901234567', services='general', working_hours='9-18', director='D',
+            latitude=41.3, longitude=69.2,
+        )
+        index = geo.ModelGridIndex(Veterinarian.objects.all, 'veterinarian:*')
+        self.assertEqual(len(index.get()), 1)
+        # Signal'siz o'zgarish (boshqa worker yoki update()) - teg bekor qilinmaydi
+        Veterinarian.objects.filter(pk=vet.pk).update(latitude=None)
+        self.assertEqual(len(index.get()), 1)
+        with override_settings(GEO_INDEX_MAX_AGE=0):
+            self.assertEqual(len(index.get()), 0)
+
+
+# ==================== GEO: RADIUS BO'YICHA QIDIRUV ====================
+
+class RadiusSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        def shelter(name, lat, lon):
+            return Shelter.objects.create(
+                name=name, shelter_type='state', description='Tavsif', address='-',
+                phone_number='+998901234567', capacity=10, director='D', latitude=lat, longitude=lon,
+            )
+        cls.center = shelter('Markaz', 41.311100, 69.279700)
+        cls.near = shelter('Yaqin', 41.330000, 69.300000)
+        # ~0.1 gradus shimolda: ~11.1 km - 10 km radius to'rtburchagida emas
+        cls.north = shelter('Shimol', 41.411100, 69.279700)
+        # To'rtburchak burchagida, lekin doiradan tashqarida (~13 km)
+        cls.corner = shelter('Burchak', 41.390000, 69.390000)
+        cls.date_line = shelter('Fiji', -17.000000, 179.990000)
+
+    def names(self, lat, lon, radius_km):
+        return [obj.name for obj in geo.within_radius(Shelter.objects.all(), lat, lon, radius_km)]
+
+    def test_distance_order_and_edges(self):
+        self.assertEqual(self.names(41.3111, 69.2797, 10), ['Markaz', 'Yaqin'])
+        self.assertEqual(self.names(41.3111, 69.2797, 11.2), ['Markaz', 'Yaqin', 'Shimol'])
+        results = geo.within_radius(Shelter.objects.all(), 41.3111, 69.2797, 15)
+        self.assertEqual([obj.name for obj in results], ['Markaz', 'Yaqin', 'Shimol', 'Burchak'])
+        self.assertEqual([obj.distance_km for obj in results], sorted(obj.distance_km for obj in results))
+
+    def test_bounding_box_edges(self):
+        # 180-meridiandan o'tadigan to'rtburchak
+        min_lat, max_lat, min_lon, max_lon = geo.bounding_box(-17, -179.99, 50)
+        self.assertGreater(min_lon, max_lon)
+        self.assertEqual(self.names(-17, -179.99, 50), ['Fiji'])
+        # Qutb doira ichida - barcha uzunliklar
+        self.assertEqual(geo.bounding_box(89.9, 0, 50)[2:], (-180.0, 180.0))
+
+    def test_shelters_list_bad_input(self):
+        url = reverse('shelters_list')
+        response = self.client.get(url, {'lat': 41.3111, 'lon': 69.2797, 'radius_km': 10})
+        self.assertEqual([s.name for s in response.context['shelters']], ['Markaz', 'Yaqin'])
+        for params in [
+            {'lat': 41, 'lon': 69, 'radius_km': 'nan'},
+            {'lat': 'nan', 'lon': 69},
+            {'lat': 41, 'lon': 'inf'},
+            {'lat': 41, 'lon': 69, 'radius_km': '-inf'},
+            {'lat': 95, 'lon': 69},
+            {'lat': 'abc', 'lon': 69},
+        ]:
+            with self.subTest(params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200)
+                # Oddiy ro'yxat
+                self.assertIsNone(response.context['near'])
+                self.assertEqual(len(response.context['shelters']), 5)
+
+
+# ==================== ISH VAQTI ====================
+
+class WorkingHoursTests(TestCase):
+
+    def test_parse(self):
+        weekdays = [(day * DAY + 9 * 60, day * DAY + 18 * 60) for day in range(5)]
+        cases = {
+            'Du-Ju 9:00-18:00': weekdays,
+            'Du-Ju 9-18, Sha 10:30-15': weekdays + [(5 * DAY + 630, 5 * DAY + 900)],
+            '24/7': [(0, WEEK)],
+            'Kecha-kunduz': [(0, WEEK)],
+            # Tungi smena ertasi kuni tugaydi
+            'Ju 22:00-02:00': [(4 * DAY + 22 * 60, 5 * DAY + 2 * 60)],
+            # Yakshanbadan dushanbaga o'tadi - ikkiga bo'linadi
+            'Yak 20-8': [(0, 8 * 60), (6 * DAY + 20 * 60, WEEK)],
+            'Yakshanba: dam olish': [],
+            'Du-Ju 9:75-18:00': [],
+            'Du-Ju 9:00-18:60': [],
+            'Du 25:00-26:00': [],
+            '': [],
+        }
+        for text, expected in cases.items():
+            with self.subTest(text):
+                self.assertEqual(parse_working_hours(text), expected)
+
+    def test_is_open_now(self):
+        vet = Veterinarian.objects.create(
+            name='Klinika', clinic_type='clinic', description='d', address='Toshkent',
+            phone_number='+998901234567', services='general', working_hours='Du-Ju 9-18, Sha 22:00-02:00',
+            director='D',
+        )
+        zone = ZoneInfo('Asia/Tashkent')
+        # 2026-10-19 - dushanba
+        moments = {
+            datetime(2026, 10, 19, 8, 59, tzinfo=zone): False,
+            datetime(2026, 10, 19, 9, 0, tzinfo=zone): True,
+            datetime(2026, 10, 19, 18, 0, tzinfo=zone): False,
+            datetime(2026, 10, 24, 23, 30, tzinfo=zone): True,
+            datetime(2026, 10, 25, 1, 59, tzinfo=zone): True,
+            datetime(2026, 10, 25, 2, 0, tzinfo=zone): False,
+        }
+        for moment, expected in moments.items():
+            with self.subTest(moment):
+                self.assertEqual(vet.is_open_now(moment), expected)
+
+        vet.working_hours = '24/7'
+        vet.save()
+        self.assertTrue(vet.is_open_now(datetime(2026, 10, 25, 3, 0, tzinfo=zone)))
+
+
+# ==================== BOSHPANA HISOBLAGICHLARI ====================
+
+class ShelterCounterTests(TestCase):
+    """Signal'lar F() bilan yuritadigan hisoblagichlar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(username='counter_owner', password='x')
+
+    def setUp(self):
+        self.first = self.create_shelter('Birinchi')
+        self.second = self.create_shelter('Ikkinchi')
+
+    def create_shelter(self, name):
+        return Shelter.objects.create(
+            name=name, shelter_type='state', description='Tavsif', address='Toshkent',
+            phone_number='+998901234567', capacity=50, director='Direktor',
+        )
+
+    def create_animal(self, **kwargs):
+        return BookAnimal.objects.create(name='Reksik', animal_type='dog', location='Toshkent',
+                                         user=self.owner, **kwargs)
+
+    def current(self, shelter):
+        return Shelter.objects.get(pk=shelter.pk).current_animals
+
+    def test_animal_moves(self):
+        animal = self.create_animal(shelter=self.first)
+        self.assertEqual((self.current(self.first), self.current(self.second)), (1, 0))
+        animal.shelter = self.second
+        animal.save()
+        self.assertEqual((self.current(self.first), self.current(self.second)), (0, 1))
+        # Asrab olindi - boshpanada emas
+        animal.status = 'adopted'
+        animal.save()
+        self.assertEqual(self.current(self.second), 0)
+        animal.status = 'reserved'
+        animal.save()
+        self.assertEqual(self.current(self.second), 1)
+        animal.shelter = None
+        animal.save()
+        self.assertEqual(self.current(self.second), 0)
+
+        animal = self.create_animal(shelter=self.first)
+        self.create_animal(shelter=self.first, status='sold')
+        animal.delete()
+        self.assertEqual(self.current(self.first), 0)
+
+    def donations(self, shelter):
+        shelter = Shelter.objects.get(pk=shelter.pk)
+        return shelter.donations_count, shelter.donations_total
+
+    def test_donation_totals(self):
+        donation = Donation.objects.create(shelter=self.first, donation_type='money', amount=100)
+        self.assertEqual(self.donations(self.first), (0, 0))
+        donation.status = 'confirmed'
+        donation.save()
+        self.assertEqual(self.donations(self.first), (1, 100))
+        donation.amount = 250
+        donation.save()
+        self.assertEqual(self.donations(self.first), (1, 250))
+        donation.shelter = self.second
+        donation.status = 'delivered'
+        donation.save()
+        self.assertEqual((self.donations(self.first), self.donations(self.second)), ((0, 0), (1, 250)))
+        donation.status = 'cancelled'
+        donation.save()
+        self.assertEqual(self.donations(self.second), (0, 0))
+
+        Donation.objects.create(shelter=self.first, donation_type='money', amount=40, status='confirmed')
+        donation = Donation.objects.create(shelter=self.first, donation_type='food', amount=60,
+                                           status='confirmed')
+        self.assertEqual(self.donations(self.first), (2, 100))
+        donation.delete()
+        self.assertEqual(self.donations(self.first), (1, 40))
+
+    def test_reconcile_shelter_donations(self):
+        Donation.objects.create(shelter=self.first, donation_type='money', amount=40, status='confirmed')
+        Donation.objects.create(shelter=self.first, donation_type='money', amount=5, status='pending')
+        Shelter.objects.update(donations_count=7, donations_total=999)
+        self.assertEqual(reconcile_shelter_donations(), 2)
+        self.assertEqual((self.donations(self.first), self.donations(self.second)), ((1, 40), (0, 0)))
+
+    def test_stale_save_keeps_counters(self):
+        stale = Shelter.objects.get(pk=self.first.pk)
+        self.create_animal(shelter=self.first)
+        Donation.objects.create(shelter=self.first, donation_type='money', amount=100, status='confirmed')
+        Review.objects.create(shelter=self.first, user=self.owner, rating=4, comment='Yaxshi')
+        stale.name = 'Yangi nom'
+        stale.save()
+        self.first.refresh_from_db()
+        self.assertEqual(
+            (self.first.name, self.first.current_animals, self.first.donations_count,
+             self.first.donations_total, self.first.review_count, self.first.rating_sum,
+             self.first.rating),
+            ('Yangi nom', 1, 1, 100, 1, 4, 4),
+        )
+
+        vet = Veterinarian.objects.create(
+            name='Klinika', clinic_type='clinic', description='d', address='Toshkent',
+            phone_number='+998901234567', services='general', working_hours='9-18', director='D',
+        )
+        stale = Veterinarian.objects.get(pk=vet.pk)
+        Review.objects.create(veterinarian=vet, user=self.owner, rating=5, comment="Zo'r")
+        Review.objects.create(veterinarian=vet, user=CustomUser.objects.create_user(username='critic'),
+                              rating=2, comment='Yomon')
+        stale.save()
+        vet.refresh_from_db()
+        self.assertEqual((vet.review_count, vet.rating_sum, float(vet.rating)), (2, 7, 3.5))
+
+    def test_counters_not_editable(self):
+        from .admin import ShelterAdmin, VeterinarianAdmin
+        counters = {'current_animals', 'donations_count', 'donations_total', 'rating',
+                    'review_count', 'rating_sum'}
+        self.assertFalse(counters & set(ShelterForm().fields))
+        for model, model_admin in ((Shelter, ShelterAdmin), (Veterinarian, VeterinarianAdmin)):
+            with self.subTest(model=model):
+                readonly = set(model_admin.readonly_fields)
+                self.assertLessEqual(set(model.COUNTER_FIELDS), readonly)
+                self.assertFalse(any(model._meta.get_field(name).editable for name in model.COUNTER_FIELDS))
+
+    def ratings(self, obj):
+        obj = type(obj).objects.get(pk=obj.pk)
+        return obj.review_count, obj.rating_sum, float(obj.rating)
+
+    def test_review_edit_delete_and_move(self):
+        vet = Veterinarian.objects.create(
+            name='Klinika', clinic_type='clinic', description='Tavsif', address='Toshkent',
+            phone_number='+998901234567', services='general', working_hours='24/7', director='Shifokor',
+        )
+        critic = CustomUser.objects.create_user(username='review_critic', password='x')
+        praise = Review.objects.create(shelter=self.first, user=self.owner, rating=5, comment='Yaxshi')
+        review = Review.objects.create(shelter=self.first, user=critic, rating=3, comment="O'rtacha")
+        self.assertEqual(self.ratings(self.first), (2, 8, 4.0))
+
+        # Bahoni o'zgartirish - son o'zgarmaydi, yig'indi kamayadi
+        review.rating = 1
+        review.save()
+        self.assertEqual(self.ratings(self.first), (2, 6, 3.0))
+
+        # Boshpanadan veterinariyaga ko'chirish
+        review.shelter, review.veterinarian = None, vet
+        review.save()
+        self.assertEqual(self.ratings(self.first), (1, 5, 5.0))
+        self.assertEqual(self.ratings(vet), (1, 1, 1.0))
+
+        # Bir vaqtda ko'chirish va baho o'zgarishi
+        review.veterinarian, review.shelter, review.rating = None, self.second, 4
+        review.save()
+        self.assertEqual(self.ratings(vet), (0, 0, 0.0))
+        self.assertEqual(self.ratings(self.second), (1, 4, 4.0))
+
+        praise.delete()
+        self.assertEqual(self.ratings(self.first), (0, 0, 0.0))
+
+        # Qayta hisoblash hech narsani o'zgartirmasligi kerak
+        before = [self.ratings(obj) for obj in (self.first, self.second, vet)]
+        call_command('reconcile_ratings', stdout=StringIO())
+        self.assertEqual([self.ratings(obj) for obj in (self.first, self.second, vet)], before)
+
+
+# ==================== SQLITE: BAND BAZA ====================
+
+class BusyRetryTests(SimpleTestCase):
+    """Ikkinchi ulanish yozish qulfini ushlab turadi - "database is locked" haqiqiy"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = f'{directory}/busy.sqlite3'
+        self.holder = sqlite3.connect(path, isolation_level=None)
+        self.addCleanup(self.holder.close)
+        self.holder.execute('CREATE TABLE item (value INTEGER)')
+        # timeout=0 - qulf bo'lsa darhol SQLITE_BUSY
+        self.connection = sqlite3.connect(path, timeout=0, isolation_level=None)
+        self.addCleanup(self.connection.close)
+
+    def cursor(self):
+        return self.connection.cursor(factory=lambda conn: BusyRetryCursorWrapper(conn, 3, 0.01))
+
+    def count(self):
+        return self.holder.execute('SELECT COUNT(*) FROM item').fetchone()[0]
+
+    def test_retries_outside_transaction(self):
+        self.holder.execute('BEGIN IMMEDIATE')
+        # Birinchi kutishda qulf bo'shatiladi - ikkinchi urinish o'tadi
+        with mock.patch('animals.sqlite.base.time.sleep',
+                        side_effect=lambda delay: self.holder.execute('COMMIT')) as sleep:
+            self.cursor().execute('INSERT INTO item VALUES (%s)', [1])
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(self.count(), 1)
+
+    def test_gives_up_after_retries(self):
+        self.holder.execute('BEGIN IMMEDIATE')
+        self.addCleanup(self.holder.execute, 'ROLLBACK')
+        with mock.patch('animals.sqlite.base.time.sleep') as sleep:
+            with self.assertRaisesMessage(sqlite3.OperationalError, 'database is locked'):
+                self.cursor().execute('INSERT INTO item VALUES (%s)', [1])
+        self.assertEqual(sleep.call_count, 3)
+
+    def test_no_retry_inside_transaction(self):
+        cursor = self.cursor()
+        cursor.execute('BEGIN')
+        cursor.execute('SELECT COUNT(*) FROM item')
+        self.holder.execute('BEGIN IMMEDIATE')
+        self.addCleanup(self.holder.execute, 'ROLLBACK')
+        with mock.patch('animals.sqlite.base.time.sleep') as sleep:
+            with self.assertRaisesMessage(sqlite3.OperationalError, 'database is locked'):
+                cursor.execute('INSERT INTO item VALUES (%s)', [1])
+        sleep.assert_not_called()
+        self.assertTrue(self.connection.in_transaction)
+
+
+# ==================== RASM NUSXALARI ====================
+
+def jpeg_bytes(size=(1000, 750), color='orange'):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+class RenditionTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        cache.clear()
+        self.owner = CustomUser.objects.create_user(username='rendition_owner', password='x')
+
+    def fieldfile(self, content):
+        animal = BookAnimal.objects.create(name='Reksik', animal_type='dog', location='Toshkent',
+                                           user=self.owner, image=ContentFile(content, 'rex.jpg'))
+        return animal.image
+
+    def picture(self, fieldfile):
+        return Template('{% load renditions %}{% picture image alt="Reksik" %}').render(
+            Context({'image': fieldfile}))
+
+    def test_generate_creates_every_size_and_format(self):
+        image = self.fieldfile(jpeg_bytes())
+        self.assertIn('<img src="', self.picture(image))
+        self.assertNotIn('<picture', self.picture(image))
+
+        self.assertEqual(renditions.generate(image), 4)
+        for name in renditions.rendition_names(image.name):
+            self.assertTrue(content_storage.exists(name), name)
+        with content_storage.open(renditions.rendition_name(image.name, (400, 300), 'webp')) as file:
+            self.assertEqual(Image.open(file).size, (400, 300))
+        # Ikkinchi marta - nusxalar bor
+        self.assertEqual(renditions.generate(image), 0)
+
+        html = self.picture(image)
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn(f"{renditions.rendition_name(image.name, (800, 600), 'webp')} 800w", html)
+        self.assertIn('width="400" height="300"', html)
+
+    def test_small_image_is_not_upscaled(self):
+        image = self.fieldfile(jpeg_bytes(size=(200, 100)))
+        renditions.generate(image)
+        with content_storage.open(renditions.rendition_name(image.name, (800, 600), 'jpg')) as file:
+            self.assertEqual(Image.open(file).size, (133, 100))
+
+    def test_unreadable_image_falls_back(self):
+        image = self.fieldfile(b'rasm emas')
+        with self.assertLogs('animals.renditions', level='WARNING'):
+            self.assertEqual(renditions.generate(image), 0)
+        self.assertIn(f'<img src="{image.url}"', self.picture(image))
+        self.assertEqual(Template('{% load renditions %}{% rendition_srcset image %}').render(
+            Context({'image': image})), '')
+
+    def test_deleted_blob_is_regenerated(self):
+        content = jpeg_bytes()
+        image = self.fieldfile(content)
+        renditions.generate(image)
+        self.assertTrue(renditions.has_renditions(image))
+
+        blobs.delete_files(image.name)
+        self.assertFalse(renditions.has_renditions(image))
+        self.assertNotIn('<picture', self.picture(image))
+        # Xuddi shu kontent - xuddi shu nom; nusxalar qayta yaratiladi
+        self.assertEqual(self.fieldfile(content).name, image.name)
+        self.assertEqual(renditions.generate(image), 4)
+        self.assertIn('<picture', self.picture(image))
+
+    def test_generate_renditions_command(self):
+        image = self.fieldfile(jpeg_bytes())
+        stdout = StringIO()
+        call_command('generate_renditions', '--model', 'bookanimal', stdout=stdout)
+        self.assertIn('1 ta rasm uchun 4 ta nusxa yaratildi', stdout.getvalue())
+        self.assertTrue(renditions.has_renditions(image))
+
+        stdout = StringIO()
+        call_command('generate_renditions', stdout=stdout)
+        self.assertIn('0 ta rasm uchun 0 ta nusxa yaratildi', stdout.getvalue())
+
+
+# ==================== FON VAZIFALARI ====================
+
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        self.calls = []
+        handlers = mock.patch.dict(jobs.HANDLERS, {'echo': self.echo, 'broken': self.broken})
+        handlers.start()
+        self.addCleanup(handlers.stop)
+
+    def echo(self, **payload):
+        self.calls.append(payload)
+
+    def broken(self):
+        raise ValueError("buzildi")
+
+    def job(self, pk):
+        return Job.objects.get(pk=pk)
+
+    def test_enqueue_claim_and_run(self):
+        job = jobs.enqueue('echo', value=1)
+        later = jobs.enqueue('echo', delay=60, value=2)
+        self.assertEqual(jobs.claim(10), [job.pk])
+        # Band qilingan vazifa ikkinchi marta olinmaydi
+        self.assertEqual(jobs.claim(10), [])
+        claimed = self.job(job.pk)
+        self.assertEqual((claimed.status, claimed.attempts), ('running', 1))
+        self.assertIsNotNone(claimed.locked_at)
+
+        self.assertTrue(jobs.run(job.pk))
+        self.assertEqual(self.calls, [{'value': 1}])
+        done = self.job(job.pk)
+        self.assertEqual((done.status, done.locked_at), ('done', None))
+        self.assertIsNotNone(done.finished_at)
+        self.assertEqual(self.job(later.pk).status, 'pending')
+
+    def test_retry_with_backoff_then_fail(self):
+        job = jobs.enqueue('broken', max_attempts=2)
+        jobs.claim(1)
+        with self.assertLogs('animals.jobs', level='ERROR'):
+            self.assertFalse(jobs.run(job.pk))
+        retried = self.job(job.pk)
+        self.assertEqual((retried.status, retried.locked_at), ('pending', None))
+        self.assertIn('ValueError: buzildi', retried.last_error)
+        delay = retried.run_after - timezone.now()
+        self.assertTrue(timedelta(seconds=5) < delay <= jobs.retry_delay(1), delay)
+        self.assertEqual(jobs.claim(1), [])
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        jobs.claim(1)
+        with self.assertLogs('animals.jobs', level='ERROR'):
+            jobs.run(job.pk)
+        failed = self.job(job.pk)
+        self.assertEqual((failed.status, failed.attempts), ('failed', 2))
+        self.assertIsNotNone(failed.finished_at)
+
+    def test_unknown_kind_fails(self):
+        job = jobs.enqueue('missing', max_attempts=1)
+        jobs.claim(1)
+        with self.assertLogs('animals.jobs', level='ERROR'):
+            self.assertFalse(jobs.run(job.pk))
+        self.assertIn("Noma'lum vazifa turi", self.job(job.pk).last_error)
+
+    def test_release_stale_respects_heartbeat(self):
+        alive, dead, exhausted = (jobs.enqueue('echo', max_attempts=2) for _ in range(3))
+        jobs.claim(3)
+        Job.objects.filter(pk=exhausted.pk).update(attempts=2)
+        old = timezone.now() - timedelta(minutes=20)
+        Job.objects.update(locked_at=old)
+        # Heartbeat faqat bajarilayotgan vazifani yangilaydi
+        self.assertEqual(jobs.touch([alive.pk]), 1)
+
+        self.assertEqual(jobs.release_stale(timedelta(minutes=10)), 1)
+        self.assertEqual(self.job(alive.pk).status, 'running')
+        self.assertEqual((self.job(dead.pk).status, self.job(dead.pk).locked_at), ('pending', None))
+        self.assertEqual(self.job(exhausted.pk).status, 'failed')
+        self.assertEqual(jobs.touch([dead.pk]), 0)
+
+    def test_run_refreshes_lock_when_starting(self):
+        job = jobs.enqueue('echo')
+        jobs.claim(1)
+        old = timezone.now() - timedelta(minutes=20)
+        Job.objects.filter(pk=job.pk).update(locked_at=old)
+        def check_lock(**payload):
+            self.assertGreater(self.job(job.pk).locked_at, old)
+
+        with mock.patch.dict(jobs.HANDLERS, {'echo': check_lock}):
+            self.assertTrue(jobs.run(job.pk))
+
+    def test_purge_finished(self):
+        old, recent, failed = (jobs.enqueue('echo') for _ in range(3))
+        Job.objects.filter(pk=old.pk).update(status='done', finished_at=timezone.now() - timedelta(days=8))
+        Job.objects.filter(pk=recent.pk).update(status='done', finished_at=timezone.now())
+        Job.objects.filter(pk=failed.pk).update(status='failed', finished_at=timezone.now() - timedelta(days=8))
+        self.assertEqual(jobs.purge_finished(timedelta(days=7)), 1)
+        self.assertEqual(set(Job.objects.values_list('pk', flat=True)), {recent.pk, failed.pk})
+
+
+def exif_jpeg(size=(3000, 1000)):
+    """Kamera rasmi kabi: burilish (Orientation=6) va GPS koordinatalari bilan"""
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = 'Camera'
+    exif.get_ifd(0x8825).update({1: 'N', 2: (41.0, 18.0, 0.0), 3: 'E', 4: (69.0, 15.0, 0.0)})
+    buffer = BytesIO()
+    Image.new('RGB', size, 'green').save(buffer, 'JPEG', exif=exif)
+    return buffer.getvalue()
+
+
+class UploadProcessingTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        owner = CustomUser.objects.create_user(username='upload_owner', password='x')
+        self.animal = BookAnimal.objects.create(name='Reksik', animal_type='dog', location='Toshkent',
+                                                user=owner)
+
+    def upload(self, content, target='main', name='photo.jpg'):
+        return PendingUpload.objects.create(animal=self.animal, target=target,
+                                            file=ContentFile(content, name))
+
+    def test_main_image_is_rotated_resized_and_stripped(self):
+        self.assertIn(b'Camera', exif_jpeg())
+        upload = self.upload(exif_jpeg())
+        pending_name = upload.file.name
+        # Vaqtinchalik fayl commit'dan keyin o'chiriladi
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(uploads.process(upload))
+
+        self.animal.refresh_from_db()
+        with self.animal.image.open('rb'):
+            data = self.animal.image.read()
+        image = Image.open(BytesIO(data))
+        self.assertEqual((image.format, image.size), ('JPEG', (683, 2048)))
+        self.assertEqual(dict(image.getexif()), {})
+        self.assertNotIn(b'Camera', data)
+        self.assertFalse(PendingUpload.objects.exists())
+        self.assertFalse(default_storage.exists(pending_name))
+
+    def test_gallery_image_keeps_transparency(self):
+        buffer = BytesIO()
+        Image.new('RGBA', (100, 80), (255, 0, 0, 128)).save(buffer, 'PNG')
+        self.assertTrue(uploads.process(self.upload(buffer.getvalue(), 'gallery', 'logo.png')))
+        image = self.animal.images.get().image
+        self.assertTrue(image.name.endswith('.png'))
+        with image.open('rb'):
+            self.assertEqual(Image.open(image).mode, 'RGBA')
+
+    def test_bad_image_is_dropped(self):
+        upload = self.upload(b'<?php echo 1; ?>', name='shell.jpg')
+        pending_name = upload.file.name
+        with self.assertLogs('animals.uploads', level='WARNING'), \
+                self.captureOnCommitCallbacks(execute=True):
+            self.assertFalse(uploads.process(upload))
+        self.assertFalse(PendingUpload.objects.exists())
+        self.assertFalse(default_storage.exists(pending_name))
+        self.animal.refresh_from_db()
+        self.assertFalse(self.animal.image)
+
+
+class RunJobsCommandTests(TransactionTestCase):
+    """Vazifalar thread pool'da, alohida ulanishlarda - ma'lumot commit qilingan bo'lishi kerak"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_once_processes_staged_uploads(self):
+        owner = CustomUser.objects.create_user(username='worker_owner', password='x')
+        animal = BookAnimal.objects.create(name='Reksik', animal_type='dog', location='Toshkent',
+                                           user=owner)
+        uploads.stage(animal, main=ContentFile(exif_jpeg(), 'main.jpg'),
+                      gallery=[ContentFile(b'rasm emas', 'bad.jpg')])
+        stdout = StringIO()
+        with self.assertLogs('animals.uploads', level='WARNING'):
+            call_command('run_jobs', '--once', '--workers', '2', stdout=stdout)
+        self.assertIn('Bajarildi: 1, xato: 0', stdout.getvalue())
+        self.assertEqual(Job.objects.get().status, 'done')
+        self.assertFalse(PendingUpload.objects.exists())
+        animal.refresh_from_db()
+        self.assertTrue(animal.image.name.endswith('.jpg'))
+
+    def test_heartbeat_refreshes_lock_in_background(self):
+        job = jobs.enqueue('echo')
+        jobs.claim(1)
+        old = timezone.now() - timedelta(minutes=20)
+        Job.objects.filter(pk=job.pk).update(locked_at=old)
+        with jobs.heartbeat([job.pk], 0.01):
+            deadline = time.monotonic() + 5
+            while Job.objects.get(pk=job.pk).locked_at == old and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertGreater(Job.objects.get(pk=job.pk).locked_at, old)
+        self.assertEqual(jobs.release_stale(timedelta(minutes=10)), 0)
+
+
+# ==================== VETERINARIYA XIZMATLARI ====================
+
+class VeterinarianServiceTests(TestCase):
+    """services matni VeterinarianService qatorlariga yoyiladi; filtr shu jadvaldan"""
+
+    def create_vet(self, name, services):
+        return Veterinarian.objects.create(
+            name=name, clinic_type='clinic', description='Tavsif', address='Toshkent',
+            phone_number='+998901234567', services=services, working_hours='24/7', director='Shifokor',
+        )
+
+    def links(self, vet):
+        return set(vet.service_links.values_list('service', flat=True))
+
+    def test_save_creates_and_replaces_links(self):
+        vet = self.create_vet('Klinika', 'general,surgery')
+        self.assertEqual(self.links(vet), {'general', 'surgery'})
+
+        vet.services = 'surgery, dental, noma\'lum, dental'
+        vet.save()
+        self.assertEqual(self.links(vet), {'surgery', 'dental'})
+        self.assertEqual(vet.service_links.count(), 2)
+        self.assertEqual([s['code'] for s in vet.get_services_display()], ['surgery', 'dental'])
+
+    def test_filter_uses_through_table(self):
+        dental = self.create_vet('Tish', 'dental')
+        self.create_vet('Jarroh', 'surgery')
+        # update() signal/save chaqirmaydi - matnda bor, lekin jadvalda yo'q
+        stale = self.create_vet('Eski', 'general')
+        Veterinarian.objects.filter(pk=stale.pk).update(services='dental')
+
+        request = RequestFactory().get('/veterinarians/', {'service': 'dental'})
+        vets, filters = views.filter_veterinarians(request)
+        self.assertIn('animals_veterinarianservice', str(vets.query))
+        self.assertEqual(list(vets), [dental])
+        self.assertEqual(filters['service'], 'dental')
+
+        request = RequestFactory().get('/veterinarians/', {'search': 'stomatolog'})
+        self.assertEqual(list(views.filter_veterinarians(request)[0]), [dental])
+
+    def test_migration_backfill(self):
+        migration = import_module('animals.migrations.0008_veterinarianservice')
+        vet = self.create_vet('Klinika', 'general')
+        Veterinarian.objects.filter(pk=vet.pk).update(services='general, dental,x-ray')
+        VeterinarianService.objects.all().delete()
+
+        migration.split_services(django_apps, mock.Mock(connection=connection))
+        self.assertEqual(self.links(vet), {'general', 'dental'})
+
+
+# ==================== STATIC FAYLLAR ====================
+
+class StaticFilesTests(SimpleTestCase):
+
+    def test_minify_css(self):
+        css = '/* izoh\n ko\'p satr */\na :hover {\n  color: red;\n  margin: 0 ;\n}\n\nul > li , p { x: 1 }\n'
+        self.assertEqual(minify_css(css), 'a :hover{color: red;margin: 0}ul>li,p{x: 1}')
+
+    def test_minify_js(self):
+        js = '  // izoh\n  const a = `x\n   y`;\n\n  foo(); // oxirgi izoh qoladi\n'
+        self.assertEqual(minify_js(js), 'const a = `x\n   y`;\nfoo(); // oxirgi izoh qoladi\n')
+
+    def test_build_static(self):
+        source, root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        files = {
+            'css/site.css': '/* sarlavha */\n' + ''.join(
+                f'.card-{i} {{\n    margin: {i}px;\n    color: #333;\n}}\n' for i in range(200)),
+            'css/tiny.css': 'a{}',
+            'js/app.js': '// izoh\nfunction f() {\n    return 1;\n}\n',
+        }
+        for name, text in files.items():
+            os.makedirs(os.path.dirname(os.path.join(source, name)), exist_ok=True)
+            with open(os.path.join(source, name), 'w') as file:
+                file.write(text)
+
+        storages = {
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'staticfiles': {'BACKEND': 'animals.staticfiles.MinifiedManifestStaticFilesStorage'},
+        }
+        stdout = StringIO()
+        with override_settings(STATIC_ROOT=root, STATICFILES_DIRS=[source], STORAGES=storages):
+            call_command('build_static', verbosity=0, stdout=stdout)
+            hashed = {name: staticfiles_storage.stored_name(name) for name in files}
+        self.assertIn('3 ta CSS/JS fayl', stdout.getvalue())
+
+        self.assertRegex(hashed['css/site.css'], r'^css/site\.[0-9a-f]{12}\.css$')
+        with open(os.path.join(root, hashed['css/site.css']), 'rb') as file:
+            css = file.read()
+        self.assertTrue(css.startswith(b'.card-0{margin: 0px;color: #333}'))
+        with open(os.path.join(root, hashed['css/site.css'] + '.gz'), 'rb') as file:
+            self.assertEqual(gzip.decompress(file.read()), css)
+        with open(os.path.join(root, hashed['js/app.js']), 'rb') as file:
+            self.assertEqual(file.read(), b'function f() {\nreturn 1;\n}\n')
+        # Siqilgani kattaroq - .gz yozilmaydi
+        self.assertFalse(os.path.exists(os.path.join(root, hashed['css/tiny.css'] + '.gz')))
+
+    def test_build_static_needs_manifest_storage(self):
+        with self.assertRaises(CommandError):
+            call_command('build_static', stdout=StringIO())
@@ -0,0 +1,87 @@
+# animals/uploads.py
+"""
+Hayvon rasmlarini so'rovdan tashqarida qayta ishlash.
+
+View yuklangan fayllarni o'qimasdan PendingUpload sifatida saqlaydi va bitta
+vazifani navbatga qo'yadi (stage). Worker (`manage.py run_jobs`) har bir faylni
+ochadi, EXIF bo'yicha buradi, MAX_DIMENSION gacha kichraytiradi, EXIF/GPS
+ma'lumotlarini olib tashlab qayta kodlaydi va BookAnimal.image yoki AnimalImage
+ga yozadi. Kichraytirilgan nusxalar (animals/renditions.py) signal orqali yaratiladi.
+"""
+import io
+import logging
+import posixpath
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import jobs
+from .models import AnimalImage, PendingUpload
+
+logger = logging.getLogger(__name__)
+
+JOB_KIND = 'process_animal_uploads'
+MAX_DIMENSION = 2048
+
+
+def stage(animal, main=None, gallery=()):
+    """Yuklangan fayllarni saqlab, qayta ishlash vazifasini navbatga qo'yish"""
+    uploads = []
+    if main:
+        uploads.append(PendingUpload(animal=animal, target='main', file=main))
+    uploads.extend(PendingUpload(animal=animal, target='gallery', file=f) for f in gallery)
+    if not uploads:
+        return []
+    uploads = PendingUpload.objects.bulk_create(uploads)
+    jobs.enqueue(JOB_KIND, upload_ids=[upload.pk for upload in uploads])
+    return uploads
+
+
+def normalize(fieldfile):
+    """Rasmni burish, kichraytirish va metama'lumotsiz qayta kodlash -> ContentFile"""
+    with fieldfile.open('rb'):
+        image = Image.open(fieldfile)
+        image = ImageOps.exif_transpose(image)
+        icc_profile = image.info.get('icc_profile')
+        image.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.Resampling.LANCZOS)
+
+    stem = posixpath.splitext(posixpath.basename(fieldfile.name))[0]
+    buffer = io.BytesIO()
+    # exif= berilmagani uchun EXIF (GPS, kamera ma'lumotlari) yozilmaydi
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image.save(buffer, 'PNG', optimize=True, icc_profile=icc_profile)
+        name = f'{stem}.png'
+    else:
+        image.convert('RGB').save(buffer, 'JPEG', quality=85, optimize=True, progressive=True,
+                                  icc_profile=icc_profile)
+        name = f'{stem}.jpg'
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+def process(upload):
+    """Bitta PendingUpload ni qayta ishlash; fayl va qator o'chiriladi"""
+    try:
+        content = normalize(upload.file)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as exc:
+        # Rasm emas yoki buzilgan fayl - qayta urinishdan foyda yo'q
+        logger.warning("Yuklangan rasmni o'qib bo'lmadi: %s (%s)", upload.file.name, exc)
+        upload.delete()
+        return False
+
+    with transaction.atomic():
+        if upload.target == 'main':
+            animal = upload.animal
+            animal.image = content
+            animal.save(update_fields=['image', 'updated_at'])
+        else:
+            AnimalImage.objects.create(animal_id=upload.animal_id, image=content)
+        upload.delete()
+    return True
+
+
+@jobs.register(JOB_KIND)
+def process_animal_uploads(upload_ids):
+    uploads = PendingUpload.objects.filter(pk__in=upload_ids).select_related('animal')
+    for upload in uploads:
+        process(upload)
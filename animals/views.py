@@ -1,13 +1,22 @@
+import math
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Sum
-from django.db import models
+from django.db.models import Count, Exists, OuterRef, Q, Subquery
+from django.db import models, transaction
 from django.core.paginator import Paginator
 from .models import (
     BookAnimal, Shelter, Veterinarian, Donation,
-    AnimalImage, Review, AdoptionRequest
+    AnimalImage, Review, AdoptionRequest, SiteStats, OpeningInterval, PendingUpload
 )
+from . import caching, geo, schedule, uploads
+from .conditional import PageState, conditional_page
+from .facets import count_facets, EXTRA_FACET_FIELDS
+from .pagination import CursorPaginator, pagination_query
+from .query_budget import query_budget
+from .routers import read_replica
+from .search import search_animals
 from users.models import CustomUser
 
 # ==================== ASOSIY VIEW'LAR ====================
@@ -18,9 +27,8 @@ from django.shortcuts import render
 from django.db.models import Q
 from .models import BookAnimal, Shelter, Veterinarian, Donation
 
-def home_view(request):
-    """Asosiy sahifa"""
-    # Filter parametrlarini olish
+def filter_home_animals(request):
+    """Bosh sahifa filtrlari -> (queryset, category, animal_type, search_query)"""
     category = request.GET.get('category', '')
     animal_type = request.GET.get('animal_type', '')
     search_query = request.GET.get('search', '')
@@ -42,57 +50,64 @@ def home_view(request):
             animals = animals.filter(animal_type=animal_type)
     
     if search_query:
-        animals = animals.filter(
-            Q(name__icontains=search_query) |
-            Q(breed__icontains=search_query) |
-            Q(location__icontains=search_query) |
-            Q(description__icontains=search_query)
-        )
+        animals = search_animals(animals, search_query)
     
+    return animals, category, animal_type, search_query
+
+
+# Bosh sahifadagi keshlangan ro'yxatlar: (nom, teglar, queryset yasovchi)
+HOME_CACHED_LISTS = {
     # So'nggi qo'shilgan hayvonlar (filtrlarsiz)
-    latest_animals = BookAnimal.objects.filter(status='available').order_by('-created_at')[:6]
-    
-    # Statistikalar
-    total_animals = BookAnimal.objects.filter(status='available').count()
-    free_animals = BookAnimal.objects.filter(status='available', is_for_sale=False).count()
-    paid_animals = BookAnimal.objects.filter(status='available', is_for_sale=True).count()
-    
-    # Hayvon turlari bo'yicha statistikalar
-    dogs_count = BookAnimal.objects.filter(status='available', animal_type='dog').count()
-    cats_count = BookAnimal.objects.filter(status='available', animal_type='cat').count()
-    other_count = BookAnimal.objects.filter(status='available').exclude(animal_type__in=['dog', 'cat']).count()
-    
-    total_shelters = Shelter.objects.filter(is_active=True).count()
-    total_donations = Donation.objects.filter(status__in=['confirmed', 'delivered']).count() if hasattr(Donation, 'status') else 0
-    
-    top_shelters = Shelter.objects.filter(is_active=True).order_by('-rating')[:3]
-    top_veterinarians = Veterinarian.objects.all().order_by('-rating')[:3]
-    
-    context = {
-        'animals': animals[:12],  # Faqat birinchi 12 ta hayvonni ko'rsat
-        'latest_animals': latest_animals,
-        'total_animals': total_animals,
-        'free_animals': free_animals,
-        'paid_animals': paid_animals,
-        'dogs_count': dogs_count,
-        'cats_count': cats_count,
-        'other_count': other_count,
-        'total_shelters': total_shelters,
-        'total_donations': total_donations,
-        'top_shelters': top_shelters,
-        'top_veterinarians': top_veterinarians,
+    'latest_animals': (['animal:*'], lambda: BookAnimal.objects.filter(status='available').order_by('-created_at')[:6]),
+    'top_shelters': (['shelter:*'], lambda: Shelter.objects.filter(is_active=True).order_by('-rating')[:3]),
+    'top_veterinarians': (['veterinarian:*'], lambda: Veterinarian.objects.all().order_by('-rating')[:3]),
+}
+
+
+def home_context(filters, animals, stats, cached_lists):
+    category, animal_type, search_query = filters
+    return {
+        'animals': animals,
+        'latest_animals': cached_lists['latest_animals'],
+        'total_animals': stats.available_animals,
+        'free_animals': stats.free_animals,
+        'paid_animals': stats.paid_animals,
+        'dogs_count': stats.dogs_count,
+        'cats_count': stats.cats_count,
+        'other_count': stats.other_animals,
+        'total_shelters': stats.active_shelters,
+        'total_donations': stats.confirmed_donations,
+        'top_shelters': cached_lists['top_shelters'],
+        'top_veterinarians': cached_lists['top_veterinarians'],
         'current_category': category,
         'current_animal_type': animal_type,
         'search_query': search_query,
     }
+
+
+@query_budget(7)
+@read_replica
+def home_view(request):
+    """Asosiy sahifa"""
+    animals, *filters = filter_home_animals(request)
+    
+    cached_lists = {
+        name: caching.cached_queryset(name, tags, queryset())
+        for name, (tags, queryset) in HOME_CACHED_LISTS.items()
+    }
+    
+    # Statistikalar (bitta qatordan)
+    stats = SiteStats.load()
+    
+    # Faqat birinchi 12 ta hayvonni ko'rsat
+    context = home_context(filters, animals[:12], stats, cached_lists)
     return render(request, 'main_app/home.html', context)
 
 
 # ==================== HAYVONLAR VIEW'LARI ====================
 
-def animals_list_view(request):
-    """Barcha hayvonlar ro'yxati"""
-    # Filtrlarni olish
+def filter_animals(request):
+    """Hayvonlar ro'yxati filtrlari -> (queryset, category, animal_type, search_query)"""
     category = request.GET.get('category', '')
     animal_type = request.GET.get('animal_type', '')
     search_query = request.GET.get('search', '')
@@ -109,50 +124,100 @@ def animals_list_view(request):
         animals = animals.filter(animal_type=animal_type)
     
     if search_query:
-        animals = animals.filter(
-            Q(name__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(location__icontains=search_query) |
-            Q(breed__icontains=search_query)
-        )
-    
-    paginator = Paginator(animals, 12)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
-    
-    total_count = animals.count()
-    dogs_count = animals.filter(animal_type='dog').count()
-    cats_count = animals.filter(animal_type='cat').count()
-    other_count = animals.filter(animal_type='other').count()
-    free_count = animals.filter(is_for_sale=False).count()
-    paid_count = animals.filter(is_for_sale=True).count()
+        animals = search_animals(animals, search_query)
     
-    context = {
+    return animals, category, animal_type, search_query
+
+
+def uses_page_numbers(request):
+    # Relevantlik bo'yicha saralangan natijalar va eski ?page= havolalari
+    return bool(request.GET.get('search')) or 'page' in request.GET
+
+
+def animals_page(request, animals, total=None):
+    """Sahifa obyekti (total - facetlardan olingan umumiy son, raqamli sahifalar uchun)"""
+    if uses_page_numbers(request):
+        paginator = Paginator(animals, 12)
+        # Paginator COUNT(*) ni qayta bajarmasligi uchun
+        paginator.count = total
+        page_obj = paginator.get_page(request.GET.get('page', 1))
+        page_obj.object_list = list(page_obj.object_list)
+        return page_obj
+    return CursorPaginator(animals, 12).get_page(request.GET.get('cursor'))
+
+
+def animals_list_context(request, filters, facets, page_obj):
+    category, animal_type, search_query = filters
+    return {
         'animals': page_obj,
-        'total_count': total_count,
-        'dogs_count': dogs_count,
-        'cats_count': cats_count,
-        'other_count': other_count,
-        'free_count': free_count,
-        'paid_count': paid_count,
+        'total_count': facets.total,
+        'dogs_count': facets.dogs,
+        'cats_count': facets.cats,
+        'other_count': facets.by_type['other'],
+        'free_count': facets.free,
+        'paid_count': facets.paid,
+        'facets': facets,
         'current_category': category,
         'current_animal_type': animal_type,
         'search_query': search_query,
         'page_obj': page_obj,
+        'pagination_query': pagination_query(request),
     }
+
+
+@query_budget(4)
+@read_replica
+def animals_list_view(request):
+    """Barcha hayvonlar ro'yxati"""
+    animals, *filters = filter_animals(request)
+    
+    # Barcha hisoblagichlar bitta so'rovda
+    facets = count_facets(animals, extra_fields=EXTRA_FACET_FIELDS)
+    page_obj = animals_page(request, animals, facets.total)
+    
+    context = animals_list_context(request, filters, facets, page_obj)
     return render(request, 'main_app/animals/list.html', context)
 
 
+def _latest(queryset, field='updated_at'):
+    """Bog'liq obyektlarning eng oxirgi vaqti (subquery)"""
+    return Subquery(queryset.order_by(f'-{field}').values(field)[:1])
+
+
+def _count(queryset, field):
+    """Bog'liq obyektlar soni (subquery, bo'lmasa None)"""
+    return Subquery(queryset.values(field).annotate(count=Count('pk')).values('count'))
+
+
+def animal_page_state(request, pk):
+    """Hayvon sahifasi bog'liq bo'lgan ma'lumotlar (ETag uchun, bitta so'rov)"""
+    images = AnimalImage.objects.filter(animal=OuterRef('pk'))
+    requests = AdoptionRequest.objects.filter(animal=OuterRef('pk'))
+    row = BookAnimal.objects.filter(pk=pk).values('updated_at', 'user__username').annotate(
+        images_changed=_latest(images, 'created_at'),
+        images_count=_count(images, 'animal'),
+        pending_count=_count(PendingUpload.objects.filter(animal=OuterRef('pk')), 'animal'),
+        requests_changed=_latest(requests),
+        requests_count=_count(requests, 'animal'),
+    ).first()
+    if row is None:
+        return None
+    return PageState(
+        parts=sorted(row.items()),
+        # animal:* - "o'xshash hayvonlar" ro'yxati; animal:<pk> - rasm nusxalari tayyor bo'ldi
+        tags=['animal:*', f'animal:{pk}'],
+    )
+
+
+@query_budget(7)
+@read_replica
+@conditional_page(animal_page_state)
 def animal_detail_view(request, pk):
     """Hayvon tafsilotlari"""
-    animal = get_object_or_404(BookAnimal, pk=pk)
+    animal = get_object_or_404(BookAnimal.objects.select_related('user'), pk=pk)
     
-    additional_images = AnimalImage.objects.filter(animal=animal)
-    
-    similar_animals = BookAnimal.objects.filter(
-        animal_type=animal.animal_type,
-        status='available'
-    ).exclude(pk=pk).order_by('-created_at')[:4]
+    # Hali qayta ishlanayotgan rasmlar (o'rniga placeholder ko'rsatiladi)
+    pending_targets = list(animal.pending_uploads.values_list('target', flat=True))
     
     # Asrab olish so'rovlari (faqat hayvon egasi ko'rishi mumkin)
     adoption_requests = None
@@ -161,42 +226,61 @@ def animal_detail_view(request, pk):
             animal=animal
         ).order_by('-created_at')
     
-    context = {
+    context = animal_detail_context(
+        animal, AnimalImage.objects.filter(animal=animal), similar_animals(animal),
+        pending_targets, adoption_requests,
+    )
+    return render(request, 'main_app/animals/detail.html', context)
+
+
+def similar_animals(animal):
+    return BookAnimal.objects.filter(
+        animal_type=animal.animal_type,
+        status='available'
+    ).exclude(pk=animal.pk).order_by('-created_at')[:4]
+
+
+def animal_detail_context(animal, additional_images, similar, pending_targets, adoption_requests):
+    return {
         'animal': animal,
         'additional_images': additional_images,
-        'similar_animals': similar_animals,
+        'pending_main_image': 'main' in pending_targets,
+        'pending_gallery_images': range(pending_targets.count('gallery')),
+        'similar_animals': similar,
         'adoption_requests': adoption_requests,
     }
-    return render(request, 'main_app/animals/detail.html', context)
 
 
 @login_required
+@query_budget(2)
 def add_animal_view(request):
     """Yangi hayvon qo'shish"""
     if request.method == 'POST':
         try:
             # Asosiy ma'lumotlar
-            animal = BookAnimal.objects.create(
-                user=request.user,
-                name=request.POST.get('name'),
-                animal_type=request.POST.get('animal_type'),
-                breed=request.POST.get('breed', ''),
-                age=request.POST.get('age'),
-                gender=request.POST.get('gender'),
-                description=request.POST.get('description'),
-                location=request.POST.get('location'),
-                is_for_sale=request.POST.get('is_for_sale') == 'on',
-                price=request.POST.get('price') if request.POST.get('is_for_sale') == 'on' else None,
-                phone_number=request.POST.get('phone_number'),
-                vaccinated=request.POST.get('vaccinated') == 'true',
-                sterilized=request.POST.get('sterilized') == 'true',
-                image=request.FILES.get('image')
-            )
-            
-            # Qo'shimcha rasmlar
-            additional_images = request.FILES.getlist('additional_images')
-            for img in additional_images:
-                AnimalImage.objects.create(animal=animal, image=img)
+            with transaction.atomic():
+                animal = BookAnimal.objects.create(
+                    user=request.user,
+                    name=request.POST.get('name'),
+                    animal_type=request.POST.get('animal_type'),
+                    breed=request.POST.get('breed', ''),
+                    age=request.POST.get('age'),
+                    gender=request.POST.get('gender'),
+                    description=request.POST.get('description'),
+                    location=request.POST.get('location'),
+                    is_for_sale=request.POST.get('is_for_sale') == 'on',
+                    price=request.POST.get('price') if request.POST.get('is_for_sale') == 'on' else None,
+                    phone_number=request.POST.get('phone_number'),
+                    vaccinated=request.POST.get('vaccinated') == 'true',
+                    sterilized=request.POST.get('sterilized') == 'true',
+                )
+                
+                # Asosiy va qo'shimcha rasmlar fon worker'ida qayta ishlanadi
+                uploads.stage(
+                    animal,
+                    main=request.FILES.get('image'),
+                    gallery=request.FILES.getlist('additional_images'),
+                )
             
             messages.success(request, f"{animal.name} muvaffaqiyatli qo'shildi!")
             return redirect('animal_detail', pk=animal.pk)
@@ -208,6 +292,7 @@ def add_animal_view(request):
 
 
 @login_required
+@query_budget(4)
 def edit_animal_view(request, pk):
     """Hayvonni tahrirlash"""
     animal = get_object_or_404(BookAnimal, pk=pk)
@@ -234,16 +319,15 @@ def edit_animal_view(request, pk):
             animal.sterilized = request.POST.get('sterilized') == 'true'
             animal.status = request.POST.get('status', 'available')
             
-            # Asosiy rasm yangilash
-            if request.FILES.get('image'):
-                animal.image = request.FILES.get('image')
-            
-            animal.save()
-            
-            # Qo'shimcha rasmlar
-            additional_images = request.FILES.getlist('additional_images')
-            for img in additional_images:
-                AnimalImage.objects.create(animal=animal, image=img)
+            with transaction.atomic():
+                animal.save()
+                
+                # Yangi asosiy va qo'shimcha rasmlar fon worker'ida qayta ishlanadi
+                uploads.stage(
+                    animal,
+                    main=request.FILES.get('image'),
+                    gallery=request.FILES.getlist('additional_images'),
+                )
             
             messages.success(request, f"{animal.name} muvaffaqiyatli yangilandi!")
             return redirect('animal_detail', pk=animal.pk)
@@ -259,6 +343,7 @@ def edit_animal_view(request, pk):
 
 
 @login_required
+@query_budget(4)
 def delete_animal_view(request, pk):
     """Hayvonni o'chirish"""
     animal = get_object_or_404(BookAnimal, pk=pk)
@@ -281,23 +366,24 @@ def delete_animal_view(request, pk):
 
 
 @login_required
+@query_budget(3)
 def my_animals_view(request):
     """Foydalanuvchining hayvonlari"""
     animals = BookAnimal.objects.filter(user=request.user).order_by('-created_at')
     
-    # Pagination
-    paginator = Paginator(animals, 12)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
+    # Pagination (kursor bo'yicha)
+    page_obj = CursorPaginator(animals, 12).get_page(request.GET.get('cursor'))
     
     context = {
         'animals': page_obj,
         'page_obj': page_obj,
+        'pagination_query': pagination_query(request),
     }
     return render(request, 'main_app/animals/my_animals.html', context)
 
 
 @login_required
+@query_budget(5)
 def request_adoption_view(request, pk):
     """Asrab olish so'rovi yuborish"""
     animal = get_object_or_404(BookAnimal, pk=pk, status='available')
@@ -343,8 +429,8 @@ def request_adoption_view(request, pk):
 
 # ==================== BOSHPANALAR VIEW'LARI ====================
 
-def shelters_list_view(request):
-    """Barcha boshpanalar ro'yxati"""
+def filter_shelters(request):
+    """Boshpanalar filtrlari -> (queryset, shelter_type, search_query, near)"""
     shelters = Shelter.objects.filter(is_active=True).order_by('-rating')
     
     # Filtrlash
@@ -361,47 +447,113 @@ def shelters_list_view(request):
             Q(description__icontains=search_query)
         )
     
-    # Statistikalar
-    total_capacity = shelters.aggregate(total=models.Sum('capacity'))['total'] or 0
-    total_current = shelters.aggregate(total=models.Sum('current_animals'))['total'] or 0
-    total_available = total_capacity - total_current
+    # Yaqin atrofdagi boshpanalar: ?lat=&lon=&radius_km=
+    near = None
+    try:
+        lat = float(request.GET['lat'])
+        lon = float(request.GET['lon'])
+        radius_km = float(request.GET.get('radius_km') or 10)
+    except (KeyError, ValueError):
+        pass
+    else:
+        # float() "nan" va "inf" ni ham qabul qiladi
+        finite = all(map(math.isfinite, (lat, lon, radius_km)))
+        if finite and -90 <= lat <= 90 and -180 <= lon <= 180:
+            radius_km = min(max(radius_km, 0.1), geo.MAX_RADIUS_KM)
+            near = {'lat': lat, 'lon': lon, 'radius_km': radius_km}
     
-    context = {
+    return shelters, shelter_type, search_query, near
+
+
+def nearby_shelters(shelters, near):
+    """Indeks bo'yicha to'rtburchak, keyin aniq masofa; masofa bo'yicha saralangan"""
+    return geo.within_radius(shelters, near['lat'], near['lon'], near['radius_km'])
+
+
+def shelter_totals(shelters):
+    """(sig'im, hozirgi hayvonlar) - ro'yxat bo'yicha yoki bitta aggregate so'rov bilan"""
+    if isinstance(shelters, list):
+        return sum(s.capacity for s in shelters), sum(s.current_animals for s in shelters)
+    totals = shelters.aggregate(
+        capacity=models.Sum('capacity'),
+        current=models.Sum('current_animals'),
+    )
+    return totals['capacity'] or 0, totals['current'] or 0
+
+
+def shelters_list_context(shelters, shelter_type, search_query, near, totals):
+    total_capacity, total_current = totals
+    return {
         'shelters': shelters,
         'current_type': shelter_type,
         'search_query': search_query,
+        'near': near,
         'shelter_types': Shelter.SHELTER_TYPES,
         'total_capacity': total_capacity,
         'total_current': total_current,
-        'total_available': total_available,
+        'total_available': total_capacity - total_current,
     }
+
+
+@query_budget(4)
+@read_replica
+def shelters_list_view(request):
+    """Barcha boshpanalar ro'yxati"""
+    shelters, shelter_type, search_query, near = filter_shelters(request)
+    
+    if near:
+        shelters = nearby_shelters(shelters, near)
+    # Statistikalar
+    totals = shelter_totals(shelters)
+    
+    context = shelters_list_context(shelters, shelter_type, search_query, near, totals)
     return render(request, 'main_app/shelters/list.html', context)
 
 
+def shelter_page_state(request, pk):
+    """Boshpana sahifasi bog'liq bo'lgan ma'lumotlar (ETag uchun, bitta so'rov)"""
+    animals = BookAnimal.objects.filter(shelter=OuterRef('pk'), status='available')
+    reviews = Review.objects.filter(shelter=OuterRef('pk'))
+    donations = Donation.objects.filter(shelter=OuterRef('pk'))
+    row = Shelter.objects.filter(pk=pk, is_active=True).values('updated_at').annotate(
+        animals_changed=_latest(animals),
+        animals_count=_count(animals, 'shelter'),
+        reviews_changed=_latest(reviews),
+        donations_changed=_latest(donations),
+        donations_count_all=_count(donations, 'shelter'),
+    ).first()
+    if row is None:
+        return None
+    return PageState(
+        parts=sorted(row.items()),
+        # shelter:<pk> - update() bilan yangilanadigan hisoblagichlar va reyting
+        tags=[f'shelter:{pk}'],
+    )
+
+
+@query_budget(5)
+@read_replica
+@conditional_page(shelter_page_state)
 def shelter_detail_view(request, pk):
     """Boshpana tafsilotlari"""
     shelter = get_object_or_404(Shelter, pk=pk, is_active=True)
     
     # Boshpanadagi hayvonlar
     animals_in_shelter = BookAnimal.objects.filter(
-        Q(location__icontains=shelter.name) |
-        Q(user__username__icontains='shelter')
-    ).filter(status='available')[:6]
+        shelter=shelter, status='available'
+    ).order_by('-created_at')[:6]
     
     # Boshpana uchun sharhlar
     reviews = Review.objects.filter(shelter=shelter).order_by('-created_at')[:5]
     
     # Oxirgi xayriyalar
-    recent_donations = Donation.objects.filter(shelter=shelter).order_by('-created_at')[:10]
-    
-    # Xayriya statistikasi
-    donation_stats = Donation.objects.filter(
-        shelter=shelter,
-        status__in=['confirmed', 'delivered']
-    ).aggregate(
-        total_amount=Sum('amount'),
-        total_count=models.Count('id')
-    )
+    recent_donations = Donation.objects.filter(shelter=shelter).select_related('donor').order_by('-created_at')[:10]
+    
+    # Xayriya statistikasi (boshpana qatoridagi yig'indilar)
+    donation_stats = {
+        'total_amount': shelter.donations_total,
+        'total_count': shelter.donations_count,
+    }
     
     context = {
         'shelter': shelter,
@@ -416,6 +568,7 @@ def shelter_detail_view(request, pk):
 
 
 @login_required
+@query_budget(3)
 def donate_to_shelter_view(request, pk):
     """Boshpanaga xayriya qilish"""
     shelter = get_object_or_404(Shelter, pk=pk, is_active=True)
@@ -450,105 +603,138 @@ def donate_to_shelter_view(request, pk):
 
 # ==================== VETERINARIYALAR VIEW'LARI ====================
 
-def veterinarians_list_view(request):
-    """Barcha veterinariyalar ro'yxati"""
-    vets = Veterinarian.objects.all().order_by('-rating')
+def filter_veterinarians(request):
+    """Veterinariyalar filtrlari -> (queryset, filters). filters - kesh kaliti va shablon uchun"""
+    vets = Veterinarian.objects.all().order_by('-rating').prefetch_related('service_links')
     
     # Filtrlash
     clinic_type = request.GET.get('type', '')
     service = request.GET.get('service', '')
     search_query = request.GET.get('search', '')
     emergency = request.GET.get('emergency', '')
+    open_now = request.GET.get('open_now', '') == '1'
     
     if clinic_type:
         vets = vets.filter(clinic_type=clinic_type)
     
     if service:
-        vets = vets.filter(services__icontains=service)
+        # vet_service_lookup_idx indeksi bo'yicha
+        vets = vets.filter(service_links__service=service)
     
     if emergency == 'yes':
         vets = vets.filter(is_emergency=True)
     
+    # Hozir ochiq klinikalar (opening_interval_idx indeksi bo'yicha)
+    current_minute = schedule.minute_of_week() if open_now else ''
+    if open_now:
+        vets = vets.filter(
+            pk__in=OpeningInterval.objects.filter(
+                start_minute__lte=current_minute,
+                end_minute__gt=current_minute,
+            ).values('veterinarian_id')
+        )
+    
     if search_query:
+        # Qidiruv matniga mos xizmat kodlari (nomi yoki kodi bo'yicha)
+        lowered = search_query.lower()
+        matching_services = [
+            code for code, name in Veterinarian.SERVICES
+            if lowered in code or lowered in name.lower()
+        ]
         vets = vets.filter(
             Q(name__icontains=search_query) |
             Q(address__icontains=search_query) |
-            Q(services__icontains=search_query) |
+            Q(service_links__service__in=matching_services) |
             Q(description__icontains=search_query)
-        )
+        ).distinct()
     
-    # Xizmatlar ro'yxati (STATIC)
-    SERVICES_CHOICES = [
-        ('general', 'Umumiy veterinariya'),
-        ('surgery', 'Jarrohlik'),
-        ('dental', 'Stomatologiya'),
-        ('dermatology', 'Dermatologiya'),
-        ('ophthalmology', 'Oftalmologiya'),
-        ('emergency', 'Shoshilinch yordam'),
-        ('vaccination', 'Emlash'),
-        ('grooming', 'Grooming'),
-        ('radiology', 'Rentgenologiya'),
-        ('laboratory', 'Laboratoriya tekshiruvlari'),
-        ('boarding', 'Qarovxona'),
-        ('training', 'Mashq qilish'),
-    ]
-    
-    context = {
-        'veterinarians': vets,
-        'current_type': clinic_type,
-        'current_service': service,
+    filters = {
+        'clinic_type': clinic_type,
+        'service': service,
+        'emergency': emergency,
         'search_query': search_query,
+        'open_now': open_now,
+        'current_minute': current_minute,
+    }
+    return vets, filters
+
+
+def cached_veterinarians(vets, filters):
+    return caching.cached_queryset(
+        'veterinarians_list', ['veterinarian:*'], vets,
+        filters['clinic_type'], filters['service'], filters['emergency'],
+        filters['search_query'], filters['current_minute'],
+    )
+
+
+def veterinarians_list_context(vets, filters):
+    return {
+        'veterinarians': vets,
+        'current_type': filters['clinic_type'],
+        'current_service': filters['service'],
+        'search_query': filters['search_query'],
         'clinic_types': Veterinarian.CLINIC_TYPES,
-        'services': SERVICES_CHOICES,  # STATIC ro'yxat
-        'emergency_filter': emergency,
+        'services': Veterinarian.SERVICES,
+        'emergency_filter': filters['emergency'],
+        'open_now_filter': filters['open_now'],
+        'current_minute': filters['current_minute'],
     }
-    return render(request, 'main_app/veterinarians/list.html', context)
 
 
+@query_budget(4)
+@read_replica
+def veterinarians_list_view(request):
+    """Barcha veterinariyalar ro'yxati"""
+    vets, filters = filter_veterinarians(request)
+    vets = cached_veterinarians(vets, filters)
+    
+    return render(request, 'main_app/veterinarians/list.html', veterinarians_list_context(vets, filters))
+
+
+def veterinarian_page_state(request, pk):
+    """Veterinariya sahifasi bog'liq bo'lgan ma'lumotlar (ETag uchun, bitta so'rov)"""
+    minute = schedule.minute_of_week()
+    row = Veterinarian.objects.filter(pk=pk).values('updated_at').annotate(
+        reviews_changed=_latest(Review.objects.filter(veterinarian=OuterRef('pk'))),
+        # "Hozir ochiq" belgisi vaqt o'tishi bilan o'zgaradi
+        open_now=Exists(OpeningInterval.objects.filter(
+            veterinarian=OuterRef('pk'), start_minute__lte=minute, end_minute__gt=minute
+        )),
+    ).first()
+    if row is None:
+        return None
+    return PageState(
+        parts=sorted(row.items()),
+        # veterinarian:* - yaqin atrofdagi klinikalar; veterinarian:<pk> - reyting
+        tags=['veterinarian:*', f'veterinarian:{pk}'],
+    )
+
+
+@query_budget(8)
+@read_replica
+@conditional_page(veterinarian_page_state)
 def veterinarian_detail_view(request, pk):
     """Veterinariya tafsilotlari"""
     vet = get_object_or_404(Veterinarian, pk=pk)
     
     # Xizmatlar ro'yxati
-    services_list = []
-    SERVICE_CHOICES = [
-        ('general', 'Umumiy veterinariya'),
-        ('surgery', 'Jarrohlik'),
-        ('dental', 'Stomatologiya'),
-        ('dermatology', 'Dermatologiya'),
-        ('ophthalmology', 'Oftalmologiya'),
-        ('emergency', 'Shoshilinch yordam'),
-        ('vaccination', 'Emlash'),
-        ('grooming', 'Grooming'),
-        ('radiology', 'Rentgenologiya'),
-        ('laboratory', 'Laboratoriya tekshiruvlari'),
-        ('boarding', 'Qarovxona'),
-        ('training', 'Mashq qilish'),
-    ]
-    
-    if vet.services:
-        # Xizmatlarni ajratish
-        service_codes = [s.strip() for s in vet.services.split(',') if s.strip()]
-        for service_code in service_codes:
-            for code, name in SERVICE_CHOICES:
-                if code == service_code:
-                    services_list.append({
-                        'code': code,
-                        'name': name
-                    })
-                    break
+    services_list = vet.get_services_display()
     
     # Sharhlar
     reviews = Review.objects.filter(veterinarian=vet).order_by('-created_at')
     
-    # O'rtacha reyting
-    avg_rating = reviews.aggregate(avg=models.Avg('rating'))['avg'] or 0
+    # O'rtacha reyting (rating_sum / review_count dan saqlangan)
+    avg_rating = vet.rating
     
-    # Yaqin atrofdagi veterinariyalar (tasodifiy 4ta)
-    nearby_vets = Veterinarian.objects.exclude(pk=pk).order_by('?')[:4]
+    # Yaqin atrofdagi veterinariyalar (eng yaqin 4ta)
+    if vet.latitude is not None and vet.longitude is not None:
+        nearby_vets = geo.veterinarians_index.nearest(vet.latitude, vet.longitude, k=4, exclude={vet.pk})
+    else:
+        # Koordinatasiz klinika uchun - reytingi yuqorilar
+        nearby_vets = Veterinarian.objects.exclude(pk=pk).order_by('-rating')[:4]
     
     # Ish vaqtini tekshirish
-    is_open = True  # Hozircha har doim ochiq deb olaylik
+    is_open = vet.is_open_now()
     
     context = {
         'vet': vet,
@@ -563,9 +749,11 @@ def veterinarian_detail_view(request, pk):
 
 # ==================== XAYRIYALAR VIEW'LARI ====================
 
+@query_budget(6)
+@read_replica
 def donations_list_view(request):
     """Barcha xayriyalar ro'yxati"""
-    donations = Donation.objects.all().order_by('-created_at')
+    donations = Donation.objects.select_related('donor', 'shelter').order_by('-created_at')
     
     # Filtrlash
     donation_type = request.GET.get('type', '')
@@ -584,18 +772,21 @@ def donations_list_view(request):
     # Foydalanuvchining xayriyalari
     user_donations = None
     if request.user.is_authenticated:
-        user_donations = Donation.objects.filter(donor=request.user).order_by('-created_at')
+        user_donations = (
+            Donation.objects.filter(donor=request.user)
+            .select_related('shelter')
+            .order_by('-created_at')
+        )
     
     # Boshpanalar ro'yxati
     shelters = Shelter.objects.filter(is_active=True)
     
-    # Umumiy statistika
-    total_stats = Donation.objects.filter(
-        status__in=['confirmed', 'delivered']
-    ).aggregate(
-        total_amount=Sum('amount'),
-        total_count=models.Count('id')
-    )
+    # Umumiy statistika (SiteStats qatoridan)
+    site_stats = SiteStats.load()
+    total_stats = {
+        'total_amount': site_stats.donations_amount,
+        'total_count': site_stats.confirmed_donations,
+    }
     
     context = {
         'donations': donations[:50],
@@ -612,6 +803,7 @@ def donations_list_view(request):
 
 
 @login_required
+@query_budget(3)
 def create_donation_view(request):
     """Yangi xayriya yaratish"""
     shelters = Shelter.objects.filter(is_active=True)
@@ -644,9 +836,30 @@ def create_donation_view(request):
     return render(request, 'main_app/donations/create.html', context)
 
 
+def donation_page_state(request, pk):
+    """Xayriya sahifasi bog'liq bo'lgan ma'lumotlar (ETag uchun, bitta so'rov)"""
+    row = Donation.objects.filter(pk=pk).values(
+        'updated_at', 'donor_id', 'is_anonymous', 'shelter__updated_at'
+    ).first()
+    if row is None:
+        return None
+    user = request.user
+    if not (user.is_superuser or row['is_anonymous']
+            or (user.is_authenticated and row['donor_id'] == user.pk)):
+        # Ruxsat yo'q - view o'zi yo'naltiradi
+        return None
+    return PageState(
+        parts=sorted(row.items()),
+        tags=[f'donation:{pk}'],
+    )
+
+
+@query_budget(4)
+@read_replica
+@conditional_page(donation_page_state)
 def donation_detail_view(request, pk):
     """Xayriya tafsilotlari"""
-    donation = get_object_or_404(Donation, pk=pk)
+    donation = get_object_or_404(Donation.objects.select_related('donor', 'shelter'), pk=pk)
     
     # Faqat donor yoki admin ko'ra olishi
     if not request.user.is_superuser and donation.donor != request.user and not donation.is_anonymous:
@@ -661,18 +874,11 @@ def donation_detail_view(request, pk):
 
 # ==================== STATIK SAHIFALAR VIEW'LARI ====================
 
+@query_budget(3)
 def about_view(request):
     """Biz haqimizda sahifasi"""
-    # Statistikalar
-    total_animals = BookAnimal.objects.filter(status='available').count()
-    total_shelters = Shelter.objects.filter(is_active=True).count()
-    total_veterinarians = Veterinarian.objects.count()
-    total_donations = Donation.objects.filter(status__in=['confirmed', 'delivered']).count()
-    
-    # Xayriya summasi
-    total_donation_amount = Donation.objects.filter(
-        status__in=['confirmed', 'delivered']
-    ).aggregate(total=models.Sum('amount'))['total'] or 0
+    # Statistikalar (bitta qatordan)
+    stats = SiteStats.load()
     
     # Jamoa a'zolari (bu yerda real ma'lumotlar bo'lishi kerak)
     team_members = [
@@ -683,16 +889,17 @@ def about_view(request):
     ]
     
     context = {
-        'total_animals': total_animals,
-        'total_shelters': total_shelters,
-        'total_veterinarians': total_veterinarians,
-        'total_donations': total_donations,
-        'total_donation_amount': total_donation_amount,
+        'total_animals': stats.available_animals,
+        'total_shelters': stats.active_shelters,
+        'total_veterinarians': stats.veterinarians_count,
+        'total_donations': stats.confirmed_donations,
+        'total_donation_amount': stats.donations_amount,
         'team_members': team_members,
     }
     return render(request, 'main_app/about.html', context)
 
 
+@query_budget(2)
 def contact_view(request):
     """Aloqa sahifasi"""
     if request.method == 'POST':
@@ -714,6 +921,7 @@ def contact_view(request):
     return render(request, 'main_app/contact.html')
 
 
+@query_budget(2)
 def faq_view(request):
     """Tez-tez so'raladigan savollar"""
     # FAQ ma'lumotlari
@@ -760,11 +968,13 @@ def faq_view(request):
     return render(request, 'main_app/faq.html', context)
 
 
+@query_budget(2)
 def terms_view(request):
     """Foydalanish shartlari"""
     return render(request, 'main_app/terms.html')
 
 
+@query_budget(2)
 def privacy_view(request):
     """Maxfiylik siyosati"""
     return render(request, 'main_app/privacy.html')
@@ -773,6 +983,7 @@ def privacy_view(request):
 # ==================== PROFIL VIEW'LARI ====================
 
 @login_required
+@query_budget(8)
 def profile_view(request):
     """Foydalanuvchi profili"""
     user = request.user
@@ -798,8 +1009,8 @@ def profile_view(request):
     
     # Foydalanuvchi ma'lumotlari
     user_animals = BookAnimal.objects.filter(user=user).order_by('-created_at')[:5]
-    user_donations = Donation.objects.filter(donor=user).order_by('-created_at')[:5]
-    adoption_requests = AdoptionRequest.objects.filter(user=user).order_by('-created_at')[:5]
+    user_donations = Donation.objects.filter(donor=user).select_related('shelter').order_by('-created_at')[:5]
+    adoption_requests = AdoptionRequest.objects.filter(user=user).select_related('animal').order_by('-created_at')[:5]
     
     # Statistikalar
     animals_count = BookAnimal.objects.filter(user=user).count()
@@ -820,6 +1031,7 @@ def profile_view(request):
 # ==================== QO'SHIMCHA VIEW'LAR ====================
 
 @login_required
+@query_budget(4)
 def add_review_view(request, model_type, pk):
     """Sharh qo'shish (veterinariya yoki boshpana uchun)"""
     if model_type == 'veterinarian':
@@ -842,22 +1054,15 @@ def add_review_view(request, model_type, pk):
     
     if request.method == 'POST':
         try:
-            review = Review.objects.create(
-                user=request.user,
-                rating=request.POST.get('rating'),
-                comment=request.POST.get('comment'),
-                **{f'{model_type}': obj}
-            )
-            
-            # Obyektning reytingini yangilash
-            if model_type == 'veterinarian':
-                avg_rating = Review.objects.filter(veterinarian=obj).aggregate(avg=models.Avg('rating'))['avg'] or 0
-                obj.rating = avg_rating
-                obj.save()
-            elif model_type == 'shelter':
-                avg_rating = Review.objects.filter(shelter=obj).aggregate(avg=models.Avg('rating'))['avg'] or 0
-                obj.rating = avg_rating
-                obj.save()
+            # Reyting (review_count, rating_sum, rating) signal orqali F() bilan
+            # shu tranzaksiyaning o'zida yangilanadi (animals/stats.py)
+            with transaction.atomic():
+                review = Review.objects.create(
+                    user=request.user,
+                    rating=request.POST.get('rating'),
+                    comment=request.POST.get('comment'),
+                    **{f'{model_type}': obj}
+                )
             
             messages.success(request, "Sharh muvaffaqiyatli qo'shildi!")
             return redirect(f'{model_type}_detail', pk=pk)
@@ -868,14 +1073,16 @@ def add_review_view(request, model_type, pk):
     context = {
         'obj': obj,
         'model_type': model_type,
+        'rating_choices': Review.RATING_CHOICES,
     }
     return render(request, 'main_app/add_review.html', context)
 
 
 @login_required
+@query_budget(5)
 def manage_adoption_request_view(request, pk, action):
     """Asrab olish so'rovini boshqarish"""
-    adoption_request = get_object_or_404(AdoptionRequest, pk=pk)
+    adoption_request = get_object_or_404(AdoptionRequest.objects.select_related('animal'), pk=pk)
     
     # Faqat hayvon egasi boshqarishi mumkin
     if adoption_request.animal.user != request.user:
@@ -917,6 +1124,7 @@ def is_staff_user(user):
 
 @login_required
 @user_passes_test(is_staff_user)
+@query_budget(3)
 def shelter_create_view(request):
     """Yangi boshpana qo'shish"""
     if request.method == 'POST':
@@ -938,12 +1146,17 @@ def shelter_create_view(request):
     else:
         form = ShelterForm()
     
-    # Statistika ma'lumotlari
+    # Statistika ma'lumotlari (bitta so'rovda)
+    totals = Shelter.objects.filter(is_active=True).aggregate(
+        count=models.Count('id'),
+        animals=models.Sum('current_animals'),
+        capacity=models.Sum('capacity'),
+    )
     context = {
         'form': form,
-        'active_shelters': Shelter.objects.filter(is_active=True).count(),
-        'total_animals': sum(s.animal_count for s in Shelter.objects.filter(is_active=True)),
-        'available_capacity': sum(s.max_capacity - s.current_capacity for s in Shelter.objects.filter(is_active=True)),
+        'active_shelters': totals['count'],
+        'total_animals': totals['animals'] or 0,
+        'available_capacity': (totals['capacity'] or 0) - (totals['animals'] or 0),
     }
     
     return render(request, 'main_app/shelters/create.html', context)
\ No newline at end of file
@@ -3,6 +3,15 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+O'qish sahifalari (bosh sahifa, hayvonlar, boshpanalar va veterinariyalar
+ro'yxatlari, hayvon sahifasi) bu yerda async versiyada ishlaydi
+(animals/async_views.py) - sekin so'rov butun worker thread'ini band qilmaydi:
+
+    uvicorn config.asgi:application --workers 4
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker -w 4
+
+WSGI bilan solishtirish: `manage.py bench_asgi`.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
@@ -12,5 +21,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('DJANGO_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
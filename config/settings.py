@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -23,7 +26,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-okb9&1ctv4h@mykd2_o)9+==o6ztrynh7icupe1&5f5mcm4rw7'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DJANGO_DEBUG', '1') == '1'
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -34,6 +37,11 @@ ALLOWED_HOSTS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Media fayllarni front proxy yuborsin (animals/media.py):
+# nginx - internal location prefiksi, masalan '/protected-media/'; Apache/lighttpd - X-Sendfile
+MEDIA_X_ACCEL_REDIRECT = os.environ.get('MEDIA_X_ACCEL_REDIRECT') or None
+MEDIA_X_SENDFILE = os.environ.get('MEDIA_X_SENDFILE') == '1'
+
 
 
 # Application definition
@@ -50,7 +58,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Boshida turadi: sessiya va autentifikatsiya so'rovlari ham sanaladi
+    'animals.query_budget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Yozish so'rovlaridan keyin o'qishni asosiy bazaga bog'laydi (replika bo'lsa)
+    'animals.routers.PrimaryPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -84,13 +96,94 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# Bir nechta gunicorn worker bir vaqtda yozadi: WAL (o'quvchilar yozuvchini
+# kutmaydi), BEGIN IMMEDIATE + busy_timeout va band bo'lsa qayta urinish
+# (animals/sqlite/base.py). Tezlikni `manage.py bench_sqlite_writes` o'lchaydi.
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    # WAL bilan NORMAL xavfsiz: elektr uzilsa faqat oxirgi commit'lar yo'qolishi mumkin
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA mmap_size=134217728',   # 128 MB
+    'PRAGMA cache_size=-20000',     # ~20 MB
+    'PRAGMA temp_store=MEMORY',
+]
+
+# O'qish sahifalarining async versiyalari (animals/async_views.py).
+# config/asgi.py buni avtomatik yoqadi, WSGI da sync view'lar ishlaydi.
+ASYNC_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS') == '1'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'animals.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': '; '.join(SQLITE_PRAGMAS),
+            'busy_retries': 5,
+            'busy_backoff': 0.05,
+        },
+        # Worker ulanishni so'rovlar orasida saqlaydi (pragmalar qayta bajarilmaydi).
+        # ASGI da har bir so'rov o'z thread'ida - doimiy ulanishlar o'chiriladi
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 0 if DEBUG or ASYNC_VIEWS else 600)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# O'qish replikasi (animals/routers.py): ro'yxat va detail sahifalarining GET
+# so'rovlari shu yerdan o'qiydi. Lokal SQLite replika `manage.py sync_replica
+# --interval 2` bilan yangilanadi; testlarda 'default' ning o'zi ishlatiladi.
+if os.environ.get('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DB_REPLICA_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['animals.routers.ReplicaRouter']
+
+# Yozishdan keyin brauzer shuncha soniya asosiy bazadan o'qiydi (replika kechikishidan katta)
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 10))
+
+
+# Cache
+# REDIS_URL berilsa umumiy (bir nechta worker uchun) kesh, aks holda lokal xotira.
+# Lokal xotira faqat DEBUG da: animals.caching teglari bekor qilinganini boshqa
+# worker jarayonlari ko'rmaydi va TAGGED_CACHE_TIMEOUT gacha eski sahifa beradi.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+elif not DEBUG:
+    raise ImproperlyConfigured(
+        "DJANGO_DEBUG=0 da REDIS_URL majburiy: lokal xotira keshi worker'lar orasida "
+        "umumiy emas va eskirgan ma'lumot beradi"
+    )
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'animal-book',
+        }
+    }
+
+# animals.caching: teglar bilan keshlash
+TAGGED_CACHE_ALIAS = 'default'
+TAGGED_CACHE_TIMEOUT = 300
+
+# animals.geo: yaqin klinikalar indeksi teg o'zgarmasa ham shuncha soniyada qayta quriladi
+GEO_INDEX_MAX_AGE = 60
+
+# animals.renditions: "nusxalar bor/yo'q" natijasi keshda shuncha soniya saqlanadi
+RENDITIONS_READY_TIMEOUT = 60
+
+# View so'rovlar byudjeti (animals/query_budget.py): DEBUG da oshib ketsa log yoki xato
+QUERY_BUDGET_RAISE = os.environ.get('QUERY_BUDGET_RAISE') == '1'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -122,8 +215,28 @@ USE_I18N = True
 
 USE_TZ = True
 
+# Klinikalar ish vaqti shu zonada talqin qilinadi (animals/schedule.py)
+WORKING_HOURS_TIME_ZONE = 'Asia/Tashkent'
+
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = 'static/'
+STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Productionda `manage.py build_static` (collectstatic) CSS/JS ni minify qiladi,
+# nomiga kontent xeshini qo'shadi (base.3f2a1c.css) va .gz/.br nusxalarini yozadi.
+# DEBUG da fayllar static/ dan to'g'ridan-to'g'ri beriladi.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'animals.staticfiles.MinifiedManifestStaticFilesStorage'
+        ),
+    },
+}
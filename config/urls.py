@@ -14,10 +14,13 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+
+from animals.media import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -25,5 +28,8 @@ urlpatterns = [
     path('', include('animals.urls')),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Media DEBUG da ham, productionda ham shu view orqali (X-Accel-Redirect / sendfile)
+if settings.MEDIA_URL.startswith('/') and not settings.MEDIA_URL.startswith('//'):
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media, name='media'),
+    ]
@@ -0,0 +1,150 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Maydon id lari shablondan data- atributlari orqali keladi
+    const form = document.getElementById('animal-add-form');
+    if (!form) return;
+
+    // Narx maydonini holatga qarab sozlash
+    const statusField = document.getElementById(form.dataset.statusField);
+    const priceFieldContainer = document.getElementById('price-field');
+    
+    function togglePriceField() {
+        if (statusField.value === 'sale') {
+            priceFieldContainer.style.display = 'block';
+        } else {
+            priceFieldContainer.style.display = 'none';
+        }
+    }
+    
+    // Boshlang'ich holat
+    togglePriceField();
+    
+    // Holat o'zgarganda
+    statusField.addEventListener('change', togglePriceField);
+    
+    // URL dan status parametrini olish
+    const urlParams = new URLSearchParams(window.location.search);
+    const urlStatus = urlParams.get('status');
+    if (urlStatus && statusField) {
+        statusField.value = urlStatus;
+        togglePriceField();
+    }
+    
+    // Rasm oldindan ko'rish
+    const mainImageInput = document.getElementById(form.dataset.imageField);
+    const additionalImagesInput = document.getElementById(form.dataset.additionalImagesField);
+    const mainImagePreview = document.getElementById('main-image-preview');
+    const additionalImagesPreview = document.getElementById('additional-images-preview');
+    const imagePreviewContainer = document.getElementById('image-preview');
+    
+    mainImageInput.addEventListener('change', function(event) {
+        const file = event.target.files[0];
+        if (file) {
+            const reader = new FileReader();
+            reader.onload = function(e) {
+                mainImagePreview.src = e.target.result;
+                imagePreviewContainer.style.display = 'flex';
+            };
+            reader.readAsDataURL(file);
+        }
+    });
+    
+    additionalImagesInput.addEventListener('change', function(event) {
+        additionalImagesPreview.innerHTML = '';
+        const files = event.target.files;
+        
+        for (let i = 0; i < Math.min(files.length, 4); i++) {
+            const file = files[i];
+            const reader = new FileReader();
+            
+            reader.onload = function(e) {
+                const img = document.createElement('img');
+                img.src = e.target.result;
+                img.className = 'img-thumbnail';
+                img.style.width = '80px';
+                img.style.height = '80px';
+                img.style.objectFit = 'cover';
+                additionalImagesPreview.appendChild(img);
+            };
+            
+            reader.readAsDataURL(file);
+        }
+        
+        if (files.length > 0) {
+            imagePreviewContainer.style.display = 'flex';
+        }
+    });
+    
+    // Formani yuborishda yuklash indikatori
+    const submitButtons = form.querySelectorAll('button[type="submit"]');
+    
+    submitButtons.forEach(button => {
+        button.addEventListener('click', function() {
+            // Faqat bosilgan tugma uchun qiymatni o'rnatish
+            submitButtons.forEach(btn => {
+                btn.disabled = true;
+                btn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Yuklanmoqda...';
+            });
+            
+            // Bosilgan tugma uchun maxsus belgi qo'shish
+            this.disabled = false;
+            this.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Yuklanmoqda...';
+        });
+    });
+    
+    // Validatsiya
+    form.addEventListener('submit', function(event) {
+        let isValid = true;
+        
+        // Majburiy maydonlarni tekshirish
+        const requiredFields = form.querySelectorAll('[required]');
+        requiredFields.forEach(field => {
+            if (!field.value.trim()) {
+                isValid = false;
+                field.classList.add('is-invalid');
+                
+                // Xabar yaratish
+                let errorDiv = field.nextElementSibling;
+                if (!errorDiv || !errorDiv.classList.contains('invalid-feedback')) {
+                    errorDiv = document.createElement('div');
+                    errorDiv.className = 'invalid-feedback d-block';
+                    field.parentNode.insertBefore(errorDiv, field.nextSibling);
+                }
+                errorDiv.textContent = 'Bu maydon majburiy';
+            } else {
+                field.classList.remove('is-invalid');
+            }
+        });
+        
+        // Agar validatsiyadan o'tmasa, submit ni to'xtatish
+        if (!isValid) {
+            event.preventDefault();
+            event.stopPropagation();
+            
+            // Yuklash belgilarini olib tashlash
+            submitButtons.forEach(btn => {
+                btn.disabled = false;
+                if (btn.name === 'save_draft') {
+                    btn.innerHTML = '<i class="fas fa-save me-2"></i>Qoralamada saqlash';
+                } else {
+                    btn.innerHTML = '<i class="fas fa-paper-plane me-2"></i>E\'lon qilish';
+                }
+            });
+            
+            // Xabarni ko'rsatish
+            alert('Iltimos, barcha majburiy maydonlarni to\'ldiring!');
+        }
+    });
+    
+    // Xatoliklarni ko'rsatish
+    if (form.dataset.hasErrors) {
+        setTimeout(function() {
+            const firstErrorField = document.querySelector('.is-invalid');
+            if (firstErrorField) {
+                firstErrorField.scrollIntoView({
+                    behavior: 'smooth',
+                    block: 'center'
+                });
+            }
+        }, 100);
+    }
+});
@@ -0,0 +1,37 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Rasm hover effekti
+    const animalImage = document.querySelector('.animal-image');
+    if (animalImage) {
+        animalImage.parentElement.addEventListener('mouseenter', function() {
+            animalImage.style.transform = 'scale(1.05)';
+        });
+
+        animalImage.parentElement.addEventListener('mouseleave', function() {
+            animalImage.style.transform = 'scale(1)';
+        });
+    }
+
+    // Info item hover effekti
+    const infoItems = document.querySelectorAll('.info-item');
+    infoItems.forEach(item => {
+        item.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-3px)';
+        });
+
+        item.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+
+    // Similar card hover effekti
+    const similarCards = document.querySelectorAll('.similar-card');
+    similarCards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-8px)';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+});
@@ -0,0 +1,11 @@
+function togglePriceField() {
+    const priceField = document.getElementById('price_field');
+    const isForSale = document.getElementById('is_for_sale').checked;
+
+    if (isForSale) {
+        priceField.style.display = 'block';
+    } else {
+        priceField.style.display = 'none';
+        document.getElementById('price').value = '';
+    }
+}
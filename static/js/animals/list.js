@@ -0,0 +1,97 @@
+// Filtrlash funksiyasi
+document.addEventListener('DOMContentLoaded', function() {
+    // Filter elementlari
+    const typeSelect = document.getElementById('type');
+    const serviceSelect = document.getElementById('service');
+    const searchInput = document.getElementById('search');
+    const emergencyCheckbox = document.getElementById('emergency');
+    const filterForm = document.querySelector('.filter-form');
+
+    // URL parametrlarini o'qish
+    const urlParams = new URLSearchParams(window.location.search);
+
+    // Filtrlarni to'ldirish
+    if (urlParams.get('type')) {
+        typeSelect.value = urlParams.get('type');
+    }
+
+    if (urlParams.get('service')) {
+        serviceSelect.value = urlParams.get('service');
+    }
+
+    if (urlParams.get('search')) {
+        searchInput.value = urlParams.get('search');
+    }
+
+    if (urlParams.get('emergency') === 'yes') {
+        emergencyCheckbox.checked = true;
+    }
+
+    // Checkbox stilini o'rnatish
+    emergencyCheckbox.addEventListener('change', function() {
+        const label = this.closest('.checkbox-label');
+        if (this.checked) {
+            label.classList.add('checked');
+        } else {
+            label.classList.remove('checked');
+        }
+    });
+
+    // Boshlang'ich holatni o'rnatish
+    emergencyCheckbox.dispatchEvent(new Event('change'));
+
+    // Filtrlashni qayta ishlash
+    typeSelect.addEventListener('change', function() {
+        filterForm.submit();
+    });
+
+    serviceSelect.addEventListener('change', function() {
+        filterForm.submit();
+    });
+
+    searchInput.addEventListener('keypress', function(e) {
+        if (e.key === 'Enter') {
+            filterForm.submit();
+        }
+    });
+
+    // Veterinariya kartalariga animatsiya
+    const vetCards = document.querySelectorAll('.vet-card');
+    vetCards.forEach((card, index) => {
+        card.style.opacity = '0';
+        card.style.transform = 'translateY(20px)';
+        card.style.transition = 'opacity 0.5s ease, transform 0.5s ease';
+
+        setTimeout(() => {
+            card.style.opacity = '1';
+            card.style.transform = 'translateY(0)';
+        }, index * 100);
+    });
+
+    // Telefon raqamini formatlash
+    document.querySelectorAll('.phone-number').forEach(phone => {
+        const number = phone.textContent.trim();
+        if (number) {
+            // Telefon raqamini chiroyli formatda ko'rsatish
+            const formatted = number.replace(/(\d{3})(\d{2})(\d{3})(\d{2})(\d{2})/, '+$1 $2 $3 $4 $5');
+            phone.textContent = formatted;
+        }
+    });
+});
+
+// Xarita funktsiyasi (kelajakda to'ldiriladi)
+function initMap() {
+    // Google Maps yoki boshqa xarita xizmatini ishga tushirish uchun
+    console.log('Veterinariyalar xaritasi funksiyasi');
+
+    // Xarita plaseholder animatsiyasi
+    const mapElement = document.getElementById('map');
+    if (mapElement) {
+        mapElement.addEventListener('click', function() {
+            alert("Xarita funksiyasi tez orada qo'shiladi. Keyinroq qayta urinib ko'ring.");
+        });
+    }
+}
+
+// Sahifa yuklanganda xaritani ishga tushirish
+window.addEventListener('load', initMap);
@@ -0,0 +1,72 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Form elementlariga focus effekt
+    const formInputs = document.querySelectorAll('.form-control');
+    formInputs.forEach(input => {
+        input.addEventListener('focus', function() {
+            this.parentElement.classList.add('focused');
+        });
+        input.addEventListener('blur', function() {
+            this.parentElement.classList.remove('focused');
+        });
+    });
+
+    // So'rov yuborish tugmasi uchun loading effekt
+    const submitBtn = document.querySelector('button[type="submit"]');
+    if (submitBtn) {
+        submitBtn.addEventListener('click', function(e) {
+            const form = this.closest('form');
+            if (form.checkValidity()) {
+                this.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Yuborilmoqda...';
+                this.disabled = true;
+            }
+        });
+    }
+
+    // Animatsiyalar
+    const animateElements = document.querySelectorAll('.animate-fadeInUp');
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                entry.target.style.opacity = '1';
+                entry.target.style.transform = 'translateY(0)';
+            }
+        });
+    }, { threshold: 0.1 });
+
+    animateElements.forEach(el => {
+        el.style.opacity = '0';
+        el.style.transform = 'translateY(30px)';
+        el.style.transition = 'opacity 0.6s ease, transform 0.6s ease';
+        observer.observe(el);
+    });
+
+    // Telefon raqam formati
+    const phoneInput = document.getElementById('phone_number');
+    if (phoneInput) {
+        phoneInput.addEventListener('input', function(e) {
+            let value = this.value.replace(/\D/g, '');
+            if (value.startsWith('998')) {
+                value = '+998 ' + value.substring(3);
+            } else if (value.startsWith('8')) {
+                value = '+998 ' + value.substring(1);
+            } else if (value.length > 0) {
+                value = '+998 ' + value;
+            }
+
+            if (value.length > 4) {
+                value = value.substring(0, 4) + ' ' + value.substring(4);
+            }
+            if (value.length > 8) {
+                value = value.substring(0, 8) + ' ' + value.substring(8);
+            }
+            if (value.length > 11) {
+                value = value.substring(0, 11) + ' ' + value.substring(11);
+            }
+            if (value.length > 14) {
+                value = value.substring(0, 14);
+            }
+
+            this.value = value;
+        });
+    }
+});
@@ -0,0 +1,33 @@
+// Form avtomatik ravishda submit qilish
+document.addEventListener('DOMContentLoaded', function() {
+    const filterSelects = document.querySelectorAll('#type, #service, #emergency');
+    const searchInput = document.querySelector('#search');
+
+    // Filtrlarni o'zgartirganda formni yuborish
+    filterSelects.forEach(select => {
+        select.addEventListener('change', function() {
+            this.closest('form').submit();
+        });
+    });
+
+    // Qidiruv so'zi kiritilganda
+    let searchTimeout;
+    searchInput.addEventListener('input', function() {
+        clearTimeout(searchTimeout);
+        searchTimeout = setTimeout(() => {
+            this.closest('form').submit();
+        }, 500);
+    });
+
+    // Kartalarga hover effekti
+    const vetCards = document.querySelectorAll('.vet-card');
+    vetCards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-10px)';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+});
@@ -0,0 +1,66 @@
+// Mobil menyuni ochish/yopish
+document.getElementById('mobileMenuBtn').addEventListener('click', function() {
+    document.getElementById('navLinks').classList.toggle('active');
+    const icon = this.querySelector('i');
+    if (icon.classList.contains('fa-bars')) {
+        icon.classList.remove('fa-bars');
+        icon.classList.add('fa-times');
+    } else {
+        icon.classList.remove('fa-times');
+        icon.classList.add('fa-bars');
+    }
+});
+
+// Foydalanuvchi profil menyusi (desktop va mobil)
+document.querySelectorAll('.user-profile[data-href]').forEach(function(profile) {
+    profile.addEventListener('click', function() {
+        window.location.href = this.dataset.href;
+    });
+});
+
+// Xabarlarni avtomatik yopish
+setTimeout(function() {
+    const messages = document.querySelectorAll('.message');
+    messages.forEach(message => {
+        message.style.opacity = '0';
+        setTimeout(() => {
+            message.style.display = 'none';
+        }, 300);
+    });
+}, 5000);
+
+// Aktiv menyuni belgilash
+document.addEventListener('DOMContentLoaded', function() {
+    const currentPath = window.location.pathname;
+    const navLinks = document.querySelectorAll('.nav-links a');
+
+    navLinks.forEach(link => {
+        const linkPath = link.getAttribute('href');
+        if (linkPath === currentPath) {
+            link.classList.add('active');
+        } else if (linkPath !== '/' && currentPath.includes(linkPath.replace('/', ''))) {
+            link.classList.add('active');
+        }
+    });
+});
+
+// Footer yilini yangilash
+document.addEventListener('DOMContentLoaded', function() {
+    const yearElement = document.querySelector('.footer-bottom p:first-child');
+    if (yearElement) {
+        const currentYear = new Date().getFullYear();
+        yearElement.textContent = yearElement.textContent.replace('2023', currentYear);
+    }
+});
+
+// Floating tugma uchun hover effekt
+const telegramBtn = document.querySelector('.telegram-floating-btn');
+if (telegramBtn) {
+    telegramBtn.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-5px) scale(1.05)';
+    });
+
+    telegramBtn.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0) scale(1)';
+    });
+}
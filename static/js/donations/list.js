@@ -0,0 +1,71 @@
+// Donation statusini o'zgartirish
+function updateDonationStatus(donationId, newStatus) {
+    if (confirm('Xayriya holatini o\'zgartirishni tasdiqlaysizmi?')) {
+        fetch(`/donations/${donationId}/update-status/`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCookie('csrftoken')
+            },
+            body: JSON.stringify({
+                status: newStatus
+            })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                location.reload();
+            } else {
+                alert('Xatolik yuz berdi: ' + data.error);
+            }
+        })
+        .catch(error => {
+            alert('Xatolik yuz berdi: ' + error);
+        });
+    }
+}
+
+// CSRF token olish
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// Filtrlashni qo'shimcha funksiyalar
+document.addEventListener('DOMContentLoaded', function() {
+    // Filter select'larni o'zgartirganda avtomatik filtrlash
+    document.getElementById('type').addEventListener('change', function() {
+        this.form.submit();
+    });
+
+    document.getElementById('status').addEventListener('change', function() {
+        this.form.submit();
+    });
+
+    document.getElementById('shelter').addEventListener('change', function() {
+        this.form.submit();
+    });
+
+    // Kartalarga animatsiya
+    const cards = document.querySelectorAll('.donation-card');
+    cards.forEach((card, index) => {
+        card.style.opacity = '0';
+        card.style.transform = 'translateY(20px)';
+        card.style.transition = 'opacity 0.5s ease, transform 0.5s ease';
+
+        setTimeout(() => {
+            card.style.opacity = '1';
+            card.style.transform = 'translateY(0)';
+        }, index * 100);
+    });
+});
@@ -0,0 +1,39 @@
+// Filtrlarni tozalash
+function resetFilters() {
+    document.getElementById('category').value = '';
+    document.getElementById('animal_type').value = '';
+    document.getElementById('search').value = '';
+    document.getElementById('filterForm').submit();
+}
+
+// URL parametrlarini o'qish va formani to'ldirish
+document.addEventListener('DOMContentLoaded', function() {
+    // Agar URL da parametrlar bo'lsa, ularni ko'rsatish
+    const urlParams = new URLSearchParams(window.location.search);
+
+    // Agar faqat bir marta filtr qo'llash kerak bo'lsa
+    if (urlParams.toString()) {
+        // Form elementlarini avtomatik to'ldirish
+        const category = urlParams.get('category') || '';
+        const animalType = urlParams.get('animal_type') || '';
+        const search = urlParams.get('search') || '';
+
+        // Form qiymatlarini o'rnatish (DOMContentLoaded da DOM tayyor)
+        setTimeout(() => {
+            if (category) document.getElementById('category').value = category;
+            if (animalType) document.getElementById('animal_type').value = animalType;
+            if (search) document.getElementById('search').value = search;
+        }, 100);
+    }
+});
+
+// Kategoriya kartalariga bosilganda URL ni yangilash
+document.querySelectorAll('.category-card').forEach(card => {
+    card.addEventListener('click', function(e) {
+        // Agar aktiv kategoriyaga bosilsa, filtrlarni tozalash
+        if (this.classList.contains('active')) {
+            e.preventDefault();
+            resetFilters();
+        }
+    });
+});
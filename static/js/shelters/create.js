@@ -0,0 +1,362 @@
+// Form elementlarini olish
+const form = document.getElementById('shelterForm');
+const descriptionTextarea = document.getElementById('id_description');
+const charCounter = document.getElementById('charCounter');
+const getLocationBtn = document.getElementById('getLocationBtn');
+const locationInput = document.getElementById('id_location');
+const imageInput = document.getElementById('id_image');
+const imagePreview = document.getElementById('imagePreview');
+const multiImageInput = document.getElementById('id_additional_images');
+const multiImagePreview = document.getElementById('multiImagePreview');
+const selectedFilesDiv = document.getElementById('selectedFiles');
+const previewBtn = document.getElementById('previewBtn');
+const previewModal = document.getElementById('previewModal');
+const closeModal = document.getElementById('closeModal');
+const editFormBtn = document.getElementById('editForm');
+const confirmSubmitBtn = document.getElementById('confirmSubmit');
+const previewContent = document.getElementById('previewContent');
+
+// Tavsif matni uzunligini hisoblash
+if (descriptionTextarea) {
+    descriptionTextarea.addEventListener('input', function() {
+        const length = this.value.length;
+        charCounter.textContent = `${length}/2000`;
+
+        if (length > 2000) {
+            charCounter.style.color = '#F44336';
+        } else if (length > 1800) {
+            charCounter.style.color = '#FF9800';
+        } else {
+            charCounter.style.color = '#4CAF50';
+        }
+    });
+
+    // Boshlang'ich holatni o'rnatish
+    descriptionTextarea.dispatchEvent(new Event('input'));
+}
+
+// Geolokatsiyani olish
+if (getLocationBtn && locationInput) {
+    getLocationBtn.addEventListener('click', function() {
+        if (navigator.geolocation) {
+            getLocationBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Aniqlanmoqda...';
+            getLocationBtn.disabled = true;
+
+            navigator.geolocation.getCurrentPosition(
+                function(position) {
+                    const lat = position.coords.latitude;
+                    const lng = position.coords.longitude;
+                    locationInput.value = `${lat.toFixed(6)}, ${lng.toFixed(6)}`;
+
+                    getLocationBtn.innerHTML = '<i class="fas fa-check-circle"></i> Joy aniqlandi!';
+                    getLocationBtn.style.background = '#4CAF50';
+
+                    setTimeout(() => {
+                        getLocationBtn.innerHTML = '<i class="fas fa-location-crosshairs"></i> Joriy joyni aniqlash';
+                        getLocationBtn.style.background = '';
+                        getLocationBtn.disabled = false;
+                    }, 2000);
+                },
+                function(error) {
+                    let errorMessage = 'Joyni aniqlashda xatolik: ';
+                    switch(error.code) {
+                        case error.PERMISSION_DENIED:
+                            errorMessage += "Foydalanuvchi joylashuvga ruxsat bermadi";
+                            break;
+                        case error.POSITION_UNAVAILABLE:
+                            errorMessage += "Joylashuv ma'lumoti mavjud emas";
+                            break;
+                        case error.TIMEOUT:
+                            errorMessage += "Joylashuvni olish vaqti tugadi";
+                            break;
+                        default:
+                            errorMessage += "Noma'lum xatolik";
+                    }
+
+                    alert(errorMessage);
+                    getLocationBtn.innerHTML = '<i class="fas fa-location-crosshairs"></i> Joriy joyni aniqlash';
+                    getLocationBtn.disabled = false;
+                },
+                {
+                    enableHighAccuracy: true,
+                    timeout: 10000,
+                    maximumAge: 0
+                }
+            );
+        } else {
+            alert("Brauzeringiz geolokatsiyani qo'llab-quvvatlamaydi");
+        }
+    });
+}
+
+// Asosiy rasmni ko'rsatish
+if (imageInput && imagePreview) {
+    imageInput.addEventListener('change', function() {
+        const file = this.files[0];
+        if (file) {
+            if (file.size > 5 * 1024 * 1024) {
+                alert("Rasm hajmi 5MB dan oshmasligi kerak");
+                this.value = '';
+                return;
+            }
+
+            const reader = new FileReader();
+            reader.onload = function(e) {
+                imagePreview.innerHTML = `
+                    <img src="${e.target.result}" alt="Yuklangan rasm" style="width: 100%; height: 150px; object-fit: cover; border-radius: 8px;">
+                    <p style="margin-top: 10px;">${file.name}</p>
+                    <small>${(file.size / 1024 / 1024).toFixed(2)} MB</small>
+                `;
+            };
+            reader.readAsDataURL(file);
+        }
+    });
+
+    // Drag and drop
+    imagePreview.addEventListener('dragover', function(e) {
+        e.preventDefault();
+        this.style.borderColor = '#4CAF50';
+        this.style.background = '#E8F5E9';
+    });
+
+    imagePreview.addEventListener('dragleave', function(e) {
+        e.preventDefault();
+        this.style.borderColor = '#BDBDBD';
+        this.style.background = '#FAFAFA';
+    });
+
+    imagePreview.addEventListener('drop', function(e) {
+        e.preventDefault();
+        this.style.borderColor = '#BDBDBD';
+        this.style.background = '#FAFAFA';
+
+        const file = e.dataTransfer.files[0];
+        if (file && file.type.startsWith('image/')) {
+            imageInput.files = e.dataTransfer.files;
+            imageInput.dispatchEvent(new Event('change'));
+        }
+    });
+}
+
+// Ko'p rasmlarni yuklash
+if (multiImageInput && multiImagePreview) {
+    multiImageInput.addEventListener('change', function() {
+        selectedFilesDiv.innerHTML = '';
+        const files = Array.from(this.files);
+
+        files.forEach((file, index) => {
+            if (file.size > 5 * 1024 * 1024) {
+                alert(`${file.name} fayli 5MB dan katta!`);
+                return;
+            }
+
+            const fileItem = document.createElement('div');
+            fileItem.className = 'file-item';
+            fileItem.innerHTML = `
+                <i class="fas fa-image"></i>
+                <span>${file.name} (${(file.size / 1024 / 1024).toFixed(2)} MB)</span>
+                <button type="button" onclick="removeFile(${index})" style="margin-left: 10px; background: none; border: none; color: #F44336; cursor: pointer;">
+                    <i class="fas fa-times"></i>
+                </button>
+            `;
+            selectedFilesDiv.appendChild(fileItem);
+        });
+    });
+
+    // Drag and drop
+    multiImagePreview.addEventListener('dragover', function(e) {
+        e.preventDefault();
+        this.style.borderColor = '#4CAF50';
+        this.style.background = '#E8F5E9';
+    });
+
+    multiImagePreview.addEventListener('dragleave', function(e) {
+        e.preventDefault();
+        this.style.borderColor = '#BDBDBD';
+        this.style.background = '#FAFAFA';
+    });
+
+    multiImagePreview.addEventListener('drop', function(e) {
+        e.preventDefault();
+        this.style.borderColor = '#BDBDBD';
+        this.style.background = '#FAFAFA';
+
+        const files = Array.from(e.dataTransfer.files).filter(file => 
+            file.type.startsWith('image/')
+        );
+
+        if (files.length > 0) {
+            const dataTransfer = new DataTransfer();
+            files.forEach(file => dataTransfer.items.add(file));
+            multiImageInput.files = dataTransfer.files;
+            multiImageInput.dispatchEvent(new Event('change'));
+        }
+    });
+}
+
+// Faylni o'chirish
+window.removeFile = function(index) {
+    const files = Array.from(multiImageInput.files);
+    files.splice(index, 1);
+
+    const dataTransfer = new DataTransfer();
+    files.forEach(file => dataTransfer.items.add(file));
+    multiImageInput.files = dataTransfer.files;
+    multiImageInput.dispatchEvent(new Event('change'));
+};
+
+// Ko'rib chiqish
+if (previewBtn && previewModal) {
+    previewBtn.addEventListener('click', function() {
+        // Form ma'lumotlarini yig'ish
+        const formData = new FormData(form);
+        const previewData = {};
+
+        for (let [key, value] of formData.entries()) {
+            previewData[key] = value;
+        }
+
+        // HTML generatsiya
+        let html = '';
+
+        // Asosiy ma'lumotlar
+        html += `
+            <div class="preview-item">
+                <h4>Boshpana nomi</h4>
+                <p>${previewData.name || 'Kiritilmagan'}</p>
+            </div>
+
+            <div class="preview-item">
+                <h4>Aloqa ma'lumotlari</h4>
+                <p><strong>Telefon:</strong> ${previewData.phone_number || 'Kiritilmagan'}</p>
+                <p><strong>Email:</strong> ${previewData.email || 'Kiritilmagan'}</p>
+            </div>
+
+            <div class="preview-item">
+                <h4>Manzil</h4>
+                <p><strong>Tuman:</strong> ${previewData.district || 'Kiritilmagan'}</p>
+                <p><strong>Aniq manzil:</strong> ${previewData.address || 'Kiritilmagan'}</p>
+                <p><strong>Geolokatsiya:</strong> ${previewData.location || 'Kiritilmagan'}</p>
+            </div>
+
+            <div class="preview-item">
+                <h4>Tavsif</h4>
+                <p>${previewData.description ? 
+                    (previewData.description.length > 300 ? 
+                        previewData.description.substring(0, 300) + '...' : 
+                        previewData.description) : 
+                    'Kiritilmagan'}</p>
+            </div>
+
+            <div class="preview-item">
+                <h4>Sig'im</h4>
+                <p><strong>Maksimal:</strong> ${previewData.max_capacity || '0'} ta</p>
+                <p><strong>Joriy:</strong> ${previewData.current_capacity || '0'} ta</p>
+                <p><strong>Hayvonlar soni:</strong> ${previewData.animal_count || '0'} ta</p>
+            </div>
+
+            <div class="preview-item">
+                <h4>Qo'shimcha</h4>
+                <p><strong>Veb-sayt:</strong> ${previewData.website || 'Kiritilmagan'}</p>
+                <p><strong>Xayriya:</strong> ${previewData.accepts_donations === 'on' ? 'Qabul qiladi' : 'Qabul qilmaydi'}</p>
+                <p><strong>Ko'ngillilar:</strong> ${previewData.accepts_volunteers === 'on' ? 'Qabul qiladi' : 'Qabul qilmaydi'}</p>
+            </div>
+        `;
+
+        previewContent.innerHTML = html;
+        previewModal.style.display = 'flex';
+    });
+}
+
+// Modalni yopish
+if (closeModal) {
+    closeModal.addEventListener('click', function() {
+        previewModal.style.display = 'none';
+    });
+}
+
+// Tahrirlash
+if (editFormBtn) {
+    editFormBtn.addEventListener('click', function() {
+        previewModal.style.display = 'none';
+        form.scrollIntoView({ behavior: 'smooth' });
+    });
+}
+
+// Tasdiqlash va yuborish
+if (confirmSubmitBtn) {
+    confirmSubmitBtn.addEventListener('click', function() {
+        previewModal.style.display = 'none';
+        form.submit();
+    });
+}
+
+// Modal tashqarisini bosganda yopish
+previewModal.addEventListener('click', function(e) {
+    if (e.target === this) {
+        this.style.display = 'none';
+    }
+});
+
+// Formani yuborishdan oldin tekshirish
+form.addEventListener('submit', function(e) {
+    // Majburiy maydonlarni tekshirish
+    const requiredFields = [
+        'name', 'phone_number', 'district', 'address',
+        'description', 'max_capacity', 'current_capacity', 'animal_count'
+    ];
+
+    let missingFields = [];
+
+    requiredFields.forEach(field => {
+        const element = document.getElementById(`id_${field}`);
+        if (element && !element.value.trim()) {
+            missingFields.push(element.previousElementSibling?.textContent || field);
+        }
+    });
+
+    if (missingFields.length > 0) {
+        e.preventDefault();
+        alert(`Quyidagi maydonlarni to'ldirishingiz kerak:\n\n${missingFields.join('\n')}`);
+        return false;
+    }
+
+    // Sig'im tekshiruvi
+    const maxCapacity = parseInt(document.getElementById('id_max_capacity').value);
+    const currentCapacity = parseInt(document.getElementById('id_current_capacity').value);
+
+    if (currentCapacity > maxCapacity) {
+        e.preventDefault();
+        alert("Joriy sig'im maksimal sig'imdan katta bo'lishi mumkin emas!");
+        return false;
+    }
+
+    // Rasm hajmi tekshiruvi
+    const imageFile = imageInput?.files[0];
+    if (imageFile && imageFile.size > 5 * 1024 * 1024) {
+        e.preventDefault();
+        alert("Asosiy rasm hajmi 5MB dan oshmasligi kerak!");
+        return false;
+    }
+
+    return true;
+});
+
+// Sahifa yuklanganda form elementlarini o'rnatish
+document.addEventListener('DOMContentLoaded', function() {
+    // Checkboxlarni o'rnatish
+    document.querySelectorAll('.checkbox-label input[type="checkbox"]').forEach(checkbox => {
+        const label = checkbox.closest('.checkbox-label');
+        if (checkbox.checked) {
+            label.classList.add('checked');
+        }
+
+        checkbox.addEventListener('change', function() {
+            if (this.checked) {
+                label.classList.add('checked');
+            } else {
+                label.classList.remove('checked');
+            }
+        });
+    });
+});
@@ -0,0 +1,33 @@
+// Dinamik summa ko'rsatish
+document.getElementById('amount').addEventListener('input', function(e) {
+    const value = parseInt(e.target.value);
+    const amountDisplay = document.getElementById('amount-display');
+
+    if (amountDisplay) {
+        amountDisplay.textContent = value.toLocaleString() + ' so\'m';
+    }
+});
+
+// To'lov usulini tanlash
+document.querySelectorAll('.payment-method').forEach(method => {
+    method.addEventListener('click', function() {
+        document.querySelectorAll('.payment-method').forEach(m => {
+            m.style.borderColor = '';
+            m.style.boxShadow = '';
+        });
+
+        this.style.borderColor = '#28a745';
+        this.style.boxShadow = '0 0 0 3px rgba(40, 167, 69, 0.1)';
+    });
+});
+
+// Formani yuborishdan oldin tekshirish
+document.querySelector('form').addEventListener('submit', function(e) {
+    const amount = document.getElementById('amount').value;
+    if (amount < 1000) {
+        e.preventDefault();
+        alert('Iltimos, minimal summa 1,000 so\'m kiriting!');
+        return false;
+    }
+    return true;
+});
@@ -0,0 +1,91 @@
+// Filtrlash funktsiyasi
+function applyFilters() {
+    const searchTerm = document.getElementById('shelterSearch').value.toLowerCase();
+    const districtFilter = document.getElementById('districtFilter').value;
+    const capacityFilter = document.getElementById('capacityFilter').value;
+
+    const shelterCards = document.querySelectorAll('.shelter-card');
+
+    shelterCards.forEach(card => {
+        const name = card.querySelector('.shelter-name').textContent.toLowerCase();
+        const district = card.dataset.district;
+        const capacity = parseInt(card.dataset.capacity);
+
+        let show = true;
+
+        // Qidiruv bo'yicha filtrlash
+        if (searchTerm && !name.includes(searchTerm)) {
+            show = false;
+        }
+
+        // Tumon bo'yicha filtrlash
+        if (districtFilter && district !== districtFilter) {
+            show = false;
+        }
+
+        // Sig'im bo'yicha filtrlash
+        if (capacityFilter) {
+            if (capacityFilter === 'low' && capacity > 50) show = false;
+            if (capacityFilter === 'medium' && (capacity <= 50 || capacity > 150)) show = false;
+            if (capacityFilter === 'high' && capacity <= 150) show = false;
+        }
+
+        // Elementni ko'rsatish/yashirish
+        if (show) {
+            card.style.display = 'block';
+            setTimeout(() => {
+                card.style.opacity = '1';
+                card.style.transform = 'translateY(0)';
+            }, 10);
+        } else {
+            card.style.opacity = '0';
+            card.style.transform = 'translateY(20px)';
+            setTimeout(() => {
+                card.style.display = 'none';
+            }, 300);
+        }
+    });
+}
+
+// Filtrlarni tozalash
+function resetFilters() {
+    document.getElementById('shelterSearch').value = '';
+    document.getElementById('districtFilter').value = '';
+    document.getElementById('capacityFilter').value = '';
+
+    const shelterCards = document.querySelectorAll('.shelter-card');
+
+    shelterCards.forEach(card => {
+        card.style.display = 'block';
+        setTimeout(() => {
+            card.style.opacity = '1';
+            card.style.transform = 'translateY(0)';
+        }, 10);
+    });
+}
+
+// Enter tugmasi bilan qidirish
+document.getElementById('shelterSearch').addEventListener('keypress', function(e) {
+    if (e.key === 'Enter') {
+        applyFilters();
+    }
+});
+
+// Avtomatik filtrlash
+document.getElementById('districtFilter').addEventListener('change', applyFilters);
+document.getElementById('capacityFilter').addEventListener('change', applyFilters);
+
+// Sahifa yuklanganda animatsiya
+document.addEventListener('DOMContentLoaded', function() {
+    const cards = document.querySelectorAll('.shelter-card');
+    cards.forEach((card, index) => {
+        card.style.opacity = '0';
+        card.style.transform = 'translateY(20px)';
+        card.style.transition = 'opacity 0.5s ease, transform 0.5s ease';
+
+        setTimeout(() => {
+            card.style.opacity = '1';
+            card.style.transform = 'translateY(0)';
+        }, index * 100);
+    });
+});
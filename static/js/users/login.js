@@ -0,0 +1,13 @@
+// Social login tugmalari uchun funktsiya
+document.querySelectorAll('.social-btn').forEach(btn => {
+    btn.addEventListener('click', function() {
+        const provider = this.classList.contains('google') ? 'Google' : 'Facebook';
+        alert(`${provider} orqali tizimga kirish funktsiyasi ishga tushirildi.`);
+    });
+});
+
+// Parolni tiklash uchun funktsiya
+document.querySelector('.forgot-password').addEventListener('click', function(e) {
+    e.preventDefault();
+    alert('Parolni tiklash funktsiyasi ishga tushirildi. Elektron pochtangizni tekshiring.');
+});
@@ -0,0 +1,25 @@
+// Parolni tekshirish
+document.querySelector('form').addEventListener('submit', function(e) {
+    const password = document.getElementById('password').value;
+    const confirmPassword = document.getElementById('confirm_password').value;
+
+    if (password !== confirmPassword) {
+        e.preventDefault();
+        alert('Parollar mos kelmadi. Iltimos, tekshirib qayta kiriting.');
+        return;
+    }
+
+    if (password.length < 8) {
+        e.preventDefault();
+        alert('Parol kamida 8 ta belgidan iborat bo\'lishi kerak.');
+        return;
+    }
+});
+
+// Social login tugmalari uchun funktsiya
+document.querySelectorAll('.social-btn').forEach(btn => {
+    btn.addEventListener('click', function() {
+        const provider = this.classList.contains('google') ? 'Google' : 'Facebook';
+        alert(`${provider} orqali ro'yxatdan o'tish funktsiyasi ishga tushirildi.`);
+    });
+});
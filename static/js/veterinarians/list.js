@@ -0,0 +1,68 @@
+// Xizmatlar filtri uchun JavaScript
+document.addEventListener('DOMContentLoaded', function() {
+    // Filtrlarni qayta yuklashda saqlash
+    const typeSelect = document.getElementById('type');
+    const serviceSelect = document.getElementById('service');
+    const searchInput = document.getElementById('search');
+    const emergencyCheckbox = document.getElementById('emergency');
+
+    // Agar URL da parametrlar bo'lsa, ularni formaga to'ldirish
+    const urlParams = new URLSearchParams(window.location.search);
+
+    if (urlParams.get('type')) {
+        typeSelect.value = urlParams.get('type');
+    }
+
+    if (urlParams.get('service')) {
+        serviceSelect.value = urlParams.get('service');
+    }
+
+    if (urlParams.get('search')) {
+        searchInput.value = urlParams.get('search');
+    }
+
+    if (urlParams.get('emergency') === 'yes') {
+        emergencyCheckbox.checked = true;
+    }
+
+    // Karta funksiyasi
+    function initMap() {
+        // Bu yerda Google Maps yoki boshqa xarita xizmatini ishga tushirish mumkin
+        console.log('Xarita funksiyasi ishga tushirildi');
+
+        // Mock map functionality - real implementation would go here
+        const mapElement = document.getElementById('map');
+        if (mapElement) {
+            // Add interactive placeholder
+            mapElement.addEventListener('click', function() {
+                alert('Xarita funksiyasi tez orada ishga tushadi!');
+            });
+
+            mapElement.style.cursor = 'pointer';
+            mapElement.title = "Xarita funksiyasini ko'rish uchun bosing";
+        }
+    }
+
+    // Xarita funktsiyasini ishga tushirish
+    initMap();
+
+    // Add smooth hover effects to cards
+    const cards = document.querySelectorAll('.vet-card');
+    cards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.zIndex = '10';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.zIndex = '1';
+        });
+    });
+
+    // Add animation to stats cards
+    const statsCards = document.querySelectorAll('.stats-card');
+    statsCards.forEach((card, index) => {
+        card.style.animationDelay = `${index * 0.1}s`;
+        card.style.opacity = '0';
+        card.style.animation = 'fadeInUp 0.5s ease forwards';
+    });
+});
@@ -1,7 +1,9 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
+from animals.query_budget import query_budget
 from .models import CustomUser
 
+@query_budget(2)
 def login_view(request):
     if request.method == 'POST':
         username = request.POST.get('username')
@@ -18,6 +20,7 @@ def login_view(request):
     return render(request, 'main_app/users/login.html')
 
 
+@query_budget(2)
 def register_view(request):
     if request.method == 'POST':
         username = request.POST.get('username')
@@ -36,6 +39,7 @@ def register_view(request):
     return render(request, 'main_app/users/register.html')
 
 
+@query_budget(4)
 def logout_view(request):
     logout(request)
     return redirect('login')
\ No newline at end of file